@@ -0,0 +1,113 @@
+"""Standalone event bus worker process.
+
+Runs one stage of the pipeline outside the FastAPI gateway, connected to the
+other processes through the Unix socket event transport:
+
+    ingest  - venue connectors; publishes cex.bookUpdate / dex.poolUpdate
+    signal  - SignalEngine; consumes market data, publishes signal.opportunity
+              and persists trading windows
+
+Example three-process layout (run each from backend/):
+
+    # Gateway: API, execution, persistence; completed trades are counted in
+    # the signal worker's windows
+    EVENT_TRANSPORT=unix EVENT_TRANSPORT_LISTEN=/tmp/arb-gateway.sock \\
+        EVENT_TRANSPORT_PEERS=/tmp/arb-signal.sock \\
+        EVENT_TRANSPORT_TOPICS=trade.completed RUN_CONNECTORS=false python server.py
+
+    # Signal evaluation, forwarding opportunities to the gateway
+    EVENT_TRANSPORT=unix EVENT_TRANSPORT_LISTEN=/tmp/arb-signal.sock \\
+        EVENT_TRANSPORT_PEERS=/tmp/arb-gateway.sock \\
+        EVENT_TRANSPORT_TOPICS=signal.opportunity python bus_worker.py signal
+
+    # Market data ingestion, forwarding books and pools to the signal worker
+    EVENT_TRANSPORT=unix EVENT_TRANSPORT_PEERS=/tmp/arb-signal.sock \\
+        EVENT_TRANSPORT_TOPICS=cex.bookUpdate,dex.poolUpdate python bus_worker.py ingest
+"""
+import argparse
+import asyncio
+import logging
+from operator import attrgetter
+
+from config import settings
+from shared.events import event_bus, BackpressurePolicy
+from shared.transport import build_transport
+from observability.logging_setup import configure_logging
+
+configure_logging()
+logger = logging.getLogger(__name__)
+
+
+async def run_ingest():
+    """Run the venue connectors."""
+    from connectors.gemini_connector import gemini_connector
+    from connectors.coinbase_connector import init_coinbase_connector
+    from connectors.solana_connector import solana_connector
+
+    tasks = [
+        asyncio.create_task(gemini_connector.connect_public_ws(["solusd", "btcusd", "ethusd"])),
+        asyncio.create_task(solana_connector.subscribe_pool_updates(solana_connector.registry.addresses("whirlpool"))),
+    ]
+
+    coinbase_connector = init_coinbase_connector()
+    if coinbase_connector:
+        tasks.append(asyncio.create_task(coinbase_connector.run(["SOL-USD", "BTC-USD", "ETH-USD"])))
+
+    await asyncio.gather(*tasks)
+
+
+async def run_signal():
+    """Run the signal engine and its window scheduler until cancelled."""
+    import repositories.db as db_module
+    from engines.signal_engine import signal_engine  # Subscribes on import
+
+    event_bus.configure_topic("cex.bookUpdate", BackpressurePolicy.CONFLATE, key=attrgetter("venue", "pair"))
+    event_bus.configure_topic("dex.poolUpdate", BackpressurePolicy.CONFLATE, key=attrgetter("pool"))
+
+    # Windows are built from this process's opportunities, so they are
+    # closed and persisted here rather than in the gateway
+    await db_module.init_repositories()
+    window_manager = signal_engine.window_manager
+    try:
+        await window_manager.run(db_module.window_repo)
+    finally:
+        try:
+            await window_manager.flush(db_module.window_repo)
+        except Exception as e:
+            logger.error(f"Final window flush failed: {e}")
+        await db_module.db_manager.close()
+
+
+ROLES = {
+    "ingest": run_ingest,
+    "signal": run_signal,
+}
+
+
+async def main(role: str):
+    """Start the transport and run the selected role."""
+    if settings.event_transport == "inprocess":
+        logger.warning("EVENT_TRANSPORT=inprocess: this worker's events will not reach other processes")
+
+    event_bus.configure_instrumentation(settings.event_handler_slow_ms, settings.event_handler_sample_every)
+    transport = build_transport(
+        settings.event_transport,
+        settings.event_transport_listen,
+        settings.transport_peers
+    )
+    event_bus.set_transport(transport, settings.transport_topics)
+    await transport.start(event_bus)
+    logger.info(f"bus_worker role={role} transport={transport.name} topics={settings.transport_topics}")
+
+    try:
+        await ROLES[role]()
+    finally:
+        await transport.stop()
+        await event_bus.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run one pipeline stage as a separate process")
+    parser.add_argument("role", choices=sorted(ROLES))
+    args = parser.parse_args()
+    asyncio.run(main(args.role))
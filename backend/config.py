@@ -1,6 +1,6 @@
 """Configuration management for arbitrage system."""
 import os
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -20,6 +20,7 @@ class Settings(BaseSettings):
     orca_sol_usdc_pool: Optional[str] = None
     raydium_sol_usdc_pool: Optional[str] = None
     whirlpool_program: Optional[str] = None
+    pool_registry_file: Optional[str] = None  # JSON list of pools; default is the SOL/USDC Whirlpool
     
     # Gemini
     gemini_enabled: bool = True
@@ -46,6 +47,31 @@ class Settings(BaseSettings):
     # Observability
     prometheus_port: int = 9090
     log_level: str = "INFO"
+    log_format: str = "text"  # "text" or "json"
+    log_queue: bool = True  # Format and write log records on a background thread
+    log_rate_limit_per_sec: float = 10.0  # Per call site, INFO/DEBUG only; 0 disables
+    log_rate_limit_burst: int = 20
+    
+    # Event Bus
+    event_queue_maxsize: int = 1000
+    event_handler_slow_ms: float = 50.0
+    event_handler_sample_every: int = 1
+    event_transport: str = "inprocess"  # "inprocess" or "unix"
+    event_transport_listen: Optional[str] = None
+    event_transport_peers: str = ""
+    event_transport_topics: str = "cex.bookUpdate,dex.poolUpdate,signal.opportunity,trade.completed"
+    run_connectors: bool = True
+    event_journal_enabled: bool = False
+    event_journal_dir: str = "journal"
+    event_journal_segment_mb: int = 64
+    
+    # Market data number representation: integer prices/sizes at per-instrument scales
+    fixed_point: bool = False
+    ws_json_decoder: str = "auto"  # "auto", "orjson" or "stdlib"
+    
+    # Signal evaluation
+    cex_taker_fees: str = "gemini:0.35,coinbase:0.60"  # venue:percent
+    spread_matrix_enabled: bool = False  # Venue x pool spread screen on every update
     
     # Risk Controls
     observe_only_mode: bool = False
@@ -62,6 +88,26 @@ class Settings(BaseSettings):
         """Parse asset list."""
         return [a.strip() for a in self.asset_list.split(",")]
     
+    @property
+    def cex_fees_pct(self) -> Dict[str, float]:
+        """Parse per-venue CEX taker fees, in percent."""
+        fees = {}
+        for entry in self.cex_taker_fees.split(","):
+            if entry.strip():
+                venue, pct = entry.split(":")
+                fees[venue.strip()] = float(pct)
+        return fees
+    
+    @property
+    def transport_peers(self) -> List[str]:
+        """Parse event transport peer socket paths."""
+        return [p.strip() for p in self.event_transport_peers.split(",") if p.strip()]
+    
+    @property
+    def transport_topics(self) -> List[str]:
+        """Parse topics forwarded over the event transport."""
+        return [t.strip() for t in self.event_transport_topics.split(",") if t.strip()]
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
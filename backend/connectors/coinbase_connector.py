@@ -3,6 +3,7 @@ Coinbase Advanced Trade connector with CDP JWT authentication.
 Supports WebSocket L2 orderbook + REST IOC orders for arbitrage.
 """
 import asyncio
+import random
 import time
 import json
 import hmac
@@ -17,8 +18,13 @@ import websockets
 import jwt
 from cryptography.hazmat.primitives import serialization
 
-from shared.types import Side, BookUpdate
+from shared.types import Side
 from shared.events import event_bus
+from shared.orderbook import OrderBook
+from shared.book_sync import BookSync
+from shared.fixedpoint import scale_for
+from shared.wsjson import get_decoder, decoder_name
+from observability.metrics import ws_reconnects_total, ws_time_to_first_update_seconds
 
 logger = logging.getLogger(__name__)
 
@@ -90,14 +96,22 @@ class CoinbaseConnector:
         private_key: str,
         base_url: str = "https://api.coinbase.com",
         ws_url: str = "wss://advanced-trade-ws.coinbase.com",
+        fixed_point: bool = False,
+        json_decoder: str = "auto",
+        reconnect_base_delay: float = 0.5,
+        reconnect_max_delay: float = 30.0,
     ):
         self.authenticator = CoinbaseAuthenticator(key_name, private_key)
         self.base_url = base_url
         self.ws_url = ws_url
         self.http_client = httpx.AsyncClient(timeout=10.0)
         
-        # Order book storage: product_id -> {bids: [], asks: []}
-        self.books: Dict[str, Dict] = {}
+        # Full-depth order books by product_id
+        self.books: Dict[str, OrderBook] = {}
+        self.fixed_point = fixed_point
+        self.decode = get_decoder(json_decoder)
+        self.sync = BookSync("coinbase")
+        self.last_sequence: Optional[int] = None  # Per-connection, across all channels
         self.last_update: Dict[str, datetime] = {}
         self.connected = False
         
@@ -105,9 +119,24 @@ class CoinbaseConnector:
         self.ws_task = None
         self.subscribed_products: List[str] = []
         
+        # Reconnect supervision (see run())
+        self.reconnect_base_delay = reconnect_base_delay
+        self.reconnect_max_delay = reconnect_max_delay
+        self.rng = random.Random()
+        self.reconnects = 0
+        self.updates_since_connect = 0
+        self._disconnected_at: Optional[float] = None  # monotonic
+        
         logger.info(f"CoinbaseConnector initialized: {base_url}")
     
     async def connect_public_ws(self):
+        """Connect once and start the message handler (no reconnect; see run())."""
+        await self._open_ws()
+        
+        # Start message handler
+        self.ws_task = asyncio.create_task(self._handle_ws_messages())
+    
+    async def _open_ws(self):
         """Connect to Coinbase Advanced Trade WebSocket (public market data)."""
         try:
             # Increase max_size to handle large orderbook snapshots (10MB limit)
@@ -116,16 +145,66 @@ class CoinbaseConnector:
                 max_size=10 * 1024 * 1024  # 10MB (Coinbase can send 1MB+ snapshots)
             )
             self.connected = True  # Mark as connected
-            logger.info(f"Connected to Coinbase WS: {self.ws_url}")
-            
-            # Start message handler
-            self.ws_task = asyncio.create_task(self._handle_ws_messages())
+            self.last_sequence = None  # Sequence numbers restart per connection
+            self.updates_since_connect = 0
+            logger.info(f"Connected to Coinbase WS: {self.ws_url} (json decoder: {decoder_name(self.decode)})")
             
         except Exception as e:
             self.connected = False
             logger.error(f"Failed to connect to Coinbase WS: {e}")
             raise
     
+    async def run(self, product_ids: List[str]):
+        """Stream level2 for `product_ids`, reconnecting until cancelled.
+        
+        Each (re)connection subscribes all products in one message; books
+        are rebuilt from the snapshots that follow. Failed or dropped
+        connections are retried with jittered exponential backoff, reset
+        once a connection has delivered book updates.
+        """
+        for product_id in product_ids:
+            if product_id not in self.subscribed_products:
+                self.subscribed_products.append(product_id)
+                self.books[product_id] = self._new_book(product_id)
+        
+        attempt = 0
+        ever_connected = False
+        while True:
+            self.updates_since_connect = 0
+            try:
+                await self._open_ws()
+                ever_connected = True
+                await self._send_level2("subscribe", self.subscribed_products)
+                logger.info(f"✅ Subscribed to {', '.join(self.subscribed_products)} L2 orderbooks")
+                await self._handle_ws_messages()
+            except Exception as e:
+                logger.error(f"Coinbase WS connection failed: {e}")
+            finally:
+                self.connected = False
+                if self.ws:
+                    await self.ws.close()
+                    self.ws = None
+            
+            if self.updates_since_connect:
+                attempt = 0  # This connection was healthy; start backoff over
+            
+            # Until a first connection succeeds these are retries, not reconnects
+            if ever_connected:
+                if self._disconnected_at is None:
+                    self._disconnected_at = time.monotonic()
+                self.reconnects += 1
+                ws_reconnects_total.labels(venue="coinbase").inc()
+            
+            delay = self._backoff_delay(attempt)
+            attempt += 1
+            logger.warning(f"Coinbase WS reconnecting in {delay:.2f}s (attempt {attempt})")
+            await asyncio.sleep(delay)
+    
+    def _backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff: uniform in [0, min(max, base * 2**attempt)]."""
+        ceiling = min(self.reconnect_max_delay, self.reconnect_base_delay * (2 ** attempt))
+        return self.rng.uniform(0, ceiling)
+    
     async def subscribe_orderbook(self, product_id: str):
         """Subscribe to L2 orderbook for a product."""
         if not self.ws:
@@ -134,20 +213,47 @@ class CoinbaseConnector:
         # ✅ CRITICAL FIX: Level2 is PUBLIC data - NO JWT needed!
         # Only user-specific channels need JWT on wss://advanced-trade-ws-user.coinbase.com
         # Market data endpoint (wss://advanced-trade-ws.coinbase.com) is public
-        subscribe_msg = {
-            "type": "subscribe",
-            "product_ids": [product_id],
-            "channel": "level2"  # Singular "channel" for public endpoint
-        }
-        
         logger.info(f"Sending PUBLIC subscription for {product_id} (no auth required)")
-        logger.debug(f"Subscription message: {json.dumps(subscribe_msg, indent=2)}")
-        await self.ws.send(json.dumps(subscribe_msg))
+        await self._send_level2("subscribe", [product_id])
         self.subscribed_products.append(product_id)
-        self.books[product_id] = {"bids": [], "asks": []}
+        self.books[product_id] = self._new_book(product_id)
         
         logger.info(f"✅ Subscribed to {product_id} L2 orderbook")
     
+    async def _send_level2(self, msg_type: str, product_ids: List[str]):
+        """Send a level2 subscribe/unsubscribe message."""
+        msg = {
+            "type": msg_type,
+            "product_ids": product_ids,
+            "channel": "level2"  # Singular "channel" for public endpoint
+        }
+        payload = json.dumps(msg)
+        logger.debug("Level2 message: %s", payload)
+        await self.ws.send(payload)
+    
+    async def _resync(self, product_ids: List[str], reason: str):
+        """Invalidate books and resubscribe so Coinbase sends fresh snapshots."""
+        for product_id in product_ids:
+            self.sync.invalidate(product_id, reason)
+            book = self.books.get(product_id)
+            if book is not None:
+                book.clear()
+                # Empty book replaces (and conflates with) any queued pre-gap update
+                await event_bus.publish("cex.bookUpdate", book.view(10))
+        
+        if self.ws and self.connected:
+            await self._send_level2("unsubscribe", product_ids)
+            await self._send_level2("subscribe", product_ids)
+    
+    def _check_sequence(self, sequence_num: int) -> bool:
+        """Track the connection sequence; False if messages were missed."""
+        expected = None if self.last_sequence is None else self.last_sequence + 1
+        self.last_sequence = sequence_num
+        if expected is None or sequence_num == expected:
+            return True
+        logger.warning(f"Coinbase sequence gap: expected {expected}, got {sequence_num}")
+        return False
+    
     async def _handle_ws_messages(self):
         """Process incoming WebSocket messages."""
         try:
@@ -155,18 +261,27 @@ class CoinbaseConnector:
             message_count = 0
             
             async for message in self.ws:
+                received = time.monotonic_ns()
                 try:
-                    data = json.loads(message)
+                    # Heartbeats are not skipped unparsed: their sequence_num
+                    # is part of the connection sequence checked below
+                    data = self.decode(message)
+                    stamps = {"frame_received": received, "decoded": time.monotonic_ns()}
                     message_count += 1
                     
-                    # Log first 5 messages for debugging
+                    # Log first 5 messages for debugging (raw frame, no re-serialization)
                     if message_count <= 5:
-                        logger.info(f"Coinbase WS received: {json.dumps(data)[:200]}")
+                        logger.info(f"Coinbase WS received: {message[:200]}")
                     
                     # NEW FORMAT: Messages have channel and events array
                     channel = data.get("channel")
                     sequence_num = data.get("sequence_num", 0)  # Extract sequence
                     
+                    # Sequence is shared by every channel on the connection, so a
+                    # gap may have dropped l2 events for any product
+                    if "sequence_num" in data and not self._check_sequence(sequence_num):
+                        await self._resync(list(self.books), "gap")
+                    
                     if channel == "l2_data":
                         # Process l2_data events
                         events = data.get("events", [])
@@ -174,9 +289,9 @@ class CoinbaseConnector:
                             event_type = event.get("type")
                             
                             if event_type == "snapshot":
-                                await self._handle_l2_snapshot(event, sequence_num)
+                                await self._handle_l2_snapshot(event, sequence_num, stamps)
                             elif event_type == "update":
-                                await self._handle_l2_update(event, sequence_num)
+                                await self._handle_l2_update(event, sequence_num, stamps)
                     
                     elif channel == "subscriptions":
                         logger.info(f"✅ Coinbase subscription confirmed: {data}")
@@ -187,7 +302,7 @@ class CoinbaseConnector:
                     
                     # Log every 100 messages
                     if message_count % 100 == 0:
-                        logger.info(f"📊 Processed {message_count} Coinbase messages")
+                        logger.debug("📊 Processed %d Coinbase messages", message_count)
                         
                 except json.JSONDecodeError as e:
                     logger.error(f"Coinbase WS JSON decode error: {e}, message: {message[:200]}")
@@ -200,8 +315,13 @@ class CoinbaseConnector:
         except Exception as e:
             self.connected = False
             logger.error(f"Coinbase WS error: {e}", exc_info=True)
+        finally:
+            # Books cannot be trusted across a disconnect; a new subscription's
+            # snapshot will resync them
+            self.connected = False
+            await self._resync(list(self.books), "disconnect")
     
-    async def _handle_l2_snapshot(self, event: dict, sequence_num: int):
+    async def _handle_l2_snapshot(self, event: dict, sequence_num: int, stamps: Optional[Dict[str, int]] = None):
         """Handle initial L2 orderbook snapshot."""
         product_id = event.get("product_id")
         if not product_id:
@@ -210,102 +330,106 @@ class CoinbaseConnector:
         # NEW FORMAT: updates array with side, price_level, new_quantity
         updates = event.get("updates", [])
         
+        book = self.books.get(product_id)
+        if book is None:
+            book = self.books[product_id] = self._new_book(product_id)
+        price, size = book.scale.price, book.scale.size
+        
         bids = []
         asks = []
         
         for update in updates:
             side = update.get("side")
-            price = float(update.get("price_level", 0))
-            size = float(update.get("new_quantity", 0))
+            level = (price(update.get("price_level", "0")), size(update.get("new_quantity", "0")))
             
             if side == "bid":
-                bids.append((price, size))
+                bids.append(level)
             elif side == "offer":
-                asks.append((price, size))
+                asks.append(level)
         
-        # Store top 20 levels (sorted)
-        self.books[product_id] = {
-            "bids": sorted(bids, key=lambda x: x[0], reverse=True)[:20],
-            "asks": sorted(asks, key=lambda x: x[0])[:20]
-        }
+        # Keep full depth; each side is sorted once
+        book.load(bids, asks)
+        stamps = dict(stamps or {}, book_applied=time.monotonic_ns())
         
         self.last_update[product_id] = datetime.now(timezone.utc)
         
-        logger.info(f"📸 Coinbase {product_id} snapshot: {len(bids)} bids, {len(asks)} asks")
+        logger.info(f"📸 Coinbase {product_id} snapshot: {len(book.bids)} bids, {len(book.asks)} asks")
+        
+        if book.is_crossed():
+            await self._resync([product_id], "crossed")
+            return
+        self.sync.resynced(product_id)
         
         # Emit initial book event
-        if self.books[product_id]["bids"] and self.books[product_id]["asks"]:
-            await self._emit_book_update(product_id, sequence_num)
+        if book.bids and book.asks:
+            await self._emit_book_update(product_id, sequence_num, stamps)
     
-    async def _handle_l2_update(self, event: dict, sequence_num: int):
+    async def _handle_l2_update(self, event: dict, sequence_num: int, stamps: Optional[Dict[str, int]] = None):
         """Handle L2 orderbook updates."""
         product_id = event.get("product_id")
         if not product_id or product_id not in self.books:
             return
+        if self.sync.pending(product_id):
+            return  # Book was invalidated; wait for the resubscribe snapshot
         
-        updates = event.get("updates", [])
         book = self.books[product_id]
+        price, size = book.scale.price, book.scale.size
         
-        for update in updates:
-            side = update.get("side")
-            price = float(update.get("price_level", 0))
-            size = float(update.get("new_quantity", 0))
-            
-            if side == "bid":
-                # Update bids
-                bids_dict = {p: s for p, s in book["bids"]}
-                if size == 0:
-                    bids_dict.pop(price, None)
-                else:
-                    bids_dict[price] = size
-                book["bids"] = sorted(bids_dict.items(), key=lambda x: x[0], reverse=True)[:20]
-                
-            elif side == "offer":
-                # Update asks
-                asks_dict = {p: s for p, s in book["asks"]}
-                if size == 0:
-                    asks_dict.pop(price, None)
-                else:
-                    asks_dict[price] = size
-                book["asks"] = sorted(asks_dict.items(), key=lambda x: x[0])[:20]
+        # Apply the whole event as one batch, then emit once
+        book.apply(
+            (update.get("side") == "bid", price(update.get("price_level", "0")), size(update.get("new_quantity", "0")))
+            for update in event.get("updates", [])
+            if update.get("side") in ("bid", "offer")
+        )
+        stamps = dict(stamps or {}, book_applied=time.monotonic_ns())
         
         self.last_update[product_id] = datetime.now(timezone.utc)
         
+        if book.is_crossed():
+            await self._resync([product_id], "crossed")
+            return
+        
         # Emit book update (only if we have both bids and asks)
-        if book["bids"] and book["asks"]:
-            await self._emit_book_update(product_id, sequence_num)
+        if book.bids and book.asks:
+            await self._emit_book_update(product_id, sequence_num, stamps)
     
-    async def _emit_book_update(self, product_id: str, sequence_num: int = 0):
-        """Emit book update event."""
-        book = self.books[product_id]
-        
-        # Convert floats to strings for Pydantic validation
-        bids_str = [[str(p), str(s)] for p, s in book["bids"][:10]]
-        asks_str = [[str(p), str(s)] for p, s in book["asks"][:10]]
+    def _new_book(self, product_id: str) -> OrderBook:
+        """Create an empty book in the configured number mode."""
+        return OrderBook("coinbase", product_id, scale_for(product_id, self.fixed_point))
+    
+    async def _emit_book_update(
+        self, product_id: str, sequence_num: int = 0, stamps: Optional[Dict[str, int]] = None
+    ):
+        """Emit book update event; `stamps` are the frame's stage timestamps."""
+        self.updates_since_connect += 1
+        if self._disconnected_at is not None:
+            elapsed = time.monotonic() - self._disconnected_at
+            self._disconnected_at = None
+            ws_time_to_first_update_seconds.labels(venue="coinbase").observe(elapsed)
+            logger.info(f"Coinbase book updates resumed {elapsed:.2f}s after disconnect")
         
-        book_update = BookUpdate(
-            venue="coinbase",
-            pair=product_id,
+        book_update = self.books[product_id].view(
+            10,
             timestamp=self.last_update[product_id],
-            bids=bids_str,
-            asks=asks_str,
-            sequence=sequence_num  # Use Coinbase sequence_num
+            sequence=sequence_num,  # Use Coinbase sequence_num
+            stamps=dict(stamps or {}, bus_published=time.monotonic_ns())
         )
         await event_bus.publish("cex.bookUpdate", book_update)
     
     def get_best_bid_ask(self, product_id: str) -> tuple[Optional[float], Optional[float], Optional[float], Optional[float]]:
         """Get best bid/ask with sizes."""
-        book = self.books.get(product_id, {})
-        bids = book.get("bids", [])
-        asks = book.get("asks", [])
-        
-        if not bids or not asks:
+        book = self.books.get(product_id)
+        if not book or not book.bids or not book.asks or self.sync.pending(product_id):
             return None, None, None, None
         
-        best_bid, bid_size = bids[0]
-        best_ask, ask_size = asks[0]
+        scale = book.scale
+        best_bid, bid_size = book.bids.best()
+        best_ask, ask_size = book.asks.best()
         
-        return best_bid, bid_size, best_ask, ask_size
+        return (
+            float(scale.price_to_decimal(best_bid)), float(scale.size_to_decimal(bid_size)),
+            float(scale.price_to_decimal(best_ask)), float(scale.size_to_decimal(ask_size))
+        )
     
     def check_staleness(self, product_id: str) -> float:
         """Check staleness in seconds since last update."""
@@ -435,7 +559,9 @@ def init_coinbase_connector():
             key_name=settings.coinbase_key_name,
             private_key=settings.coinbase_private_key,
             base_url=settings.coinbase_adv_base_url,
-            ws_url=settings.coinbase_adv_ws_url
+            ws_url=settings.coinbase_adv_ws_url,
+            fixed_point=settings.fixed_point,
+            json_decoder=settings.ws_json_decoder
         )
         logger.info("Coinbase connector initialized")
         return connector
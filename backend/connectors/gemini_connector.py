@@ -8,17 +8,24 @@ import time
 import logging
 from typing import Dict, Optional, List
 from decimal import Decimal
-from datetime import datetime, timezone
+from datetime import datetime
 import httpx
 from websockets.asyncio.client import connect
 from websockets.exceptions import ConnectionClosed
 
 from config import settings
-from shared.types import BookUpdate, Side, OrderStatus
+from shared.types import Side, OrderStatus
 from shared.events import event_bus
+from shared.orderbook import OrderBook
+from shared.book_sync import BookSync
+from shared.fixedpoint import scale_for
+from shared.wsjson import get_decoder, decoder_name, prefix_filter
 
 logger = logging.getLogger(__name__)
 
+# Public feed frames the connector does not use, dropped before parsing
+IGNORED_FRAME = prefix_filter(('{"type":"heartbeat"', '{"type":"trade"'))
+
 
 class GeminiAuthenticator:
     """Handles HMAC-SHA384 authentication for Gemini API."""
@@ -55,7 +62,12 @@ class GeminiConnector:
             settings.gemini_api_key,
             settings.gemini_api_secret
         )
-        self.order_books: Dict[str, Dict] = {}
+        self.order_books: Dict[str, OrderBook] = {}
+        self.fixed_point = settings.fixed_point
+        self.decode = get_decoder(settings.ws_json_decoder)
+        self.sync = BookSync("gemini")
+        self.public_ws = None
+        self.reconnecting = False  # Set while closing the WS to resync books
         self.connected = False
         self.last_update_ts: Dict[str, datetime] = {}
     
@@ -64,7 +76,9 @@ class GeminiConnector:
         while True:
             try:
                 async with connect(self.ws_public_url) as ws:
-                    logger.info(f"Connected to Gemini public WS")
+                    logger.info(f"Connected to Gemini public WS (json decoder: {decoder_name(self.decode)})")
+                    self.public_ws = ws
+                    self.reconnecting = False
                     self.connected = True
                     
                     # Subscribe to L2 for all symbols
@@ -80,73 +94,84 @@ class GeminiConnector:
                     
                     # Listen for updates
                     async for message in ws:
-                        data = json.loads(message)
-                        await self._handle_public_message(data)
+                        received = time.monotonic_ns()
+                        if IGNORED_FRAME(message):
+                            continue
+                        data = self.decode(message)
+                        await self._handle_public_message(
+                            data, {"frame_received": received, "decoded": time.monotonic_ns()}
+                        )
                         
             except ConnectionClosed:
                 logger.warning("Gemini public WS closed, reconnecting...")
                 self.connected = False
+                await self._invalidate_books("disconnect")
                 await asyncio.sleep(5)
             except Exception as e:
                 logger.error(f"Gemini public WS error: {e}")
                 self.connected = False
+                await self._invalidate_books("disconnect")
                 await asyncio.sleep(5)
+            else:
+                # Closed cleanly (e.g. by a crossed-book resync); reconnect now
+                self.connected = False
+                await self._invalidate_books("disconnect")
     
-    async def _handle_public_message(self, data: Dict):
-        """Handle public WS message."""
+    async def _invalidate_books(self, reason: str):
+        """Clear all books; each resyncs from the snapshot sent on subscribe."""
+        for symbol, book in self.order_books.items():
+            self.sync.invalidate(symbol, reason)
+            book.clear()
+            # Empty book replaces (and conflates with) any queued pre-gap update
+            await event_bus.publish("cex.bookUpdate", book.view(10, sequence=book.version))
+    
+    async def _handle_public_message(self, data: Dict, stamps: Optional[Dict[str, int]] = None):
+        """Handle public WS message; `stamps` are the frame's stage timestamps."""
         msg_type = data.get("type")
         
-        if msg_type == "l2_updates":
+        if msg_type == "l2_updates" and not self.reconnecting:
             symbol = data.get("symbol")
             changes = data.get("changes", [])
             
             # Initialize order book if not exists
-            if symbol not in self.order_books:
-                self.order_books[symbol] = {"bids": {}, "asks": {}}
-            
-            book = self.order_books[symbol]
+            book = self.order_books.get(symbol)
+            if book is None:
+                book = self.order_books[symbol] = OrderBook("gemini", symbol, scale_for(symbol, self.fixed_point))
             
-            # Apply changes
-            for change in changes:
-                side_str, price_str, size_str = change
-                price = Decimal(price_str)
-                size = Decimal(size_str)
-                
-                side_book = book["bids"] if side_str == "buy" else book["asks"]
-                
-                if size == 0:
-                    side_book.pop(price, None)
-                else:
-                    side_book[price] = size
+            # Apply changes (the first message after subscribing is the full book)
+            price, size = book.scale.price, book.scale.size
+            for side_str, price_str, size_str in changes:
+                book.side(side_str == "buy").update(price(price_str), size(size_str))
+            stamps = dict(stamps or {}, book_applied=time.monotonic_ns())
             
             # Update timestamp
             self.last_update_ts[symbol] = datetime.utcnow()
             
-            # Emit book update event
-            bids = [[str(p), str(s)] for p, s in sorted(book["bids"].items(), reverse=True)[:10]]
-            asks = [[str(p), str(s)] for p, s in sorted(book["asks"].items())[:10]]
+            # The v2 feed has no sequence numbers, so a crossed book is the
+            # signal that updates were lost; reconnect for fresh snapshots
+            if book.is_crossed():
+                self.sync.invalidate(symbol, "crossed")
+                await self._invalidate_books("reconnect")
+                self.reconnecting = True
+                if self.public_ws is not None:
+                    await self.public_ws.close()
+                return
+            self.sync.resynced(symbol)
             
-            book_update = BookUpdate(
-                venue="gemini",
-                pair=symbol,
-                timestamp=datetime.now(timezone.utc),
-                bids=bids,
-                asks=asks,
-                sequence=0
-            )
-            
-            await event_bus.publish("cex.bookUpdate", book_update)
+            # Emit book update event; the book's change counter is the sequence
+            stamps["bus_published"] = time.monotonic_ns()
+            await event_bus.publish("cex.bookUpdate", book.view(10, sequence=book.version, stamps=stamps))
     
     def get_best_bid_ask(self, symbol: str) -> Optional[tuple[Decimal, Decimal]]:
         """Get best bid/ask for symbol."""
         book = self.order_books.get(symbol)
-        if not book or not book["bids"] or not book["asks"]:
+        if not book or self.sync.pending(symbol):
             return None
         
-        best_bid = max(book["bids"].keys())
-        best_ask = min(book["asks"].keys())
-        
-        return best_bid, best_ask
+        best = book.best_bid_ask()
+        if best is None:
+            return None
+        return book.scale.price_to_decimal(best[0]), book.scale.price_to_decimal(best[1])
     
     def check_staleness(self, symbol: str, max_age_sec: float = 10.0) -> bool:
         """Check if order book is stale."""
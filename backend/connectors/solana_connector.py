@@ -2,6 +2,7 @@
 import asyncio
 import json
 import logging
+import time
 from typing import Dict, Optional, List
 from decimal import Decimal
 from datetime import datetime, timezone, timedelta
@@ -14,6 +15,7 @@ from solana.rpc.websocket_api import connect as ws_connect
 from config import settings
 from shared.types import PoolUpdate, BoundQuote, Side
 from shared.events import event_bus
+from shared.pools import PoolRegistry, pool_registry
 
 logger = logging.getLogger(__name__)
 
@@ -49,12 +51,91 @@ class PoolMath:
         impact_pct = abs((final_price - initial_price) / initial_price) * Decimal(100)
         
         return amount_out, exec_price, impact_pct
+    
+    @staticmethod
+    def constant_product_quote_exact_out(
+        reserve_in: Decimal,
+        reserve_out: Decimal,
+        amount_out: Decimal,
+        fee_bps: int = 30
+    ) -> tuple[Decimal, Decimal, Decimal]:
+        """Compute the input needed to receive `amount_out` from a constant product pool.
+        
+        Returns: (amount_in, exec_price, impact_pct), exec_price in input per output token
+        """
+        if amount_out >= reserve_out:
+            raise ValueError(f"amount_out {amount_out} exceeds pool reserve {reserve_out}")
+        
+        fee_multiplier = Decimal(1) - (Decimal(fee_bps) / Decimal(10000))
+        amount_in_with_fee = (reserve_in * amount_out) / (reserve_out - amount_out)
+        amount_in = amount_in_with_fee / fee_multiplier
+        
+        exec_price = amount_in / amount_out
+        
+        initial_price = reserve_out / reserve_in
+        final_price = (reserve_out - amount_out) / (reserve_in + amount_in)
+        impact_pct = abs((final_price - initial_price) / initial_price) * Decimal(100)
+        
+        return amount_in, exec_price, impact_pct
+    
+    @staticmethod
+    def constant_product_quote_fixed(
+        reserve_in: int,
+        reserve_out: int,
+        amount_in: int,
+        fee_bps: int = 30,
+        decimals: int = 9
+    ) -> tuple[int, int, int]:
+        """Integer constant product quote on raw token amounts (base units).
+        
+        Amounts round down like the on-chain program. Ratios are returned as
+        integers scaled by 10**decimals.
+        
+        Returns: (amount_out, exec_price, impact_pct)
+        """
+        amount_in_with_fee = amount_in * (10000 - fee_bps)
+        amount_out = (reserve_out * amount_in_with_fee) // (reserve_in * 10000 + amount_in_with_fee)
+        
+        unit = 10 ** decimals
+        exec_price = amount_out * unit // amount_in
+        
+        # |final/initial - 1| with final = (R_out - out) / (R_in + in), initial = R_out / R_in
+        reserve_in_after = reserve_in + amount_in
+        price_change = abs((reserve_out - amount_out) * reserve_in - reserve_out * reserve_in_after)
+        impact_pct = price_change * 100 * unit // (reserve_out * reserve_in_after)
+        
+        return amount_out, exec_price, impact_pct
+    
+    @staticmethod
+    def constant_product_quote_exact_out_fixed(
+        reserve_in: int,
+        reserve_out: int,
+        amount_out: int,
+        fee_bps: int = 30,
+        decimals: int = 9
+    ) -> tuple[int, int]:
+        """Integer input needed to receive `amount_out` (base units).
+        
+        Rounds up, so the quote never costs less than the program charges.
+        The price is input per output token, scaled by 10**decimals.
+        
+        Returns: (amount_in, exec_price)
+        """
+        if amount_out >= reserve_out:
+            raise ValueError(f"amount_out {amount_out} exceeds pool reserve {reserve_out}")
+        
+        amount_in_with_fee = -(-reserve_in * amount_out // (reserve_out - amount_out))
+        amount_in = -(-amount_in_with_fee * 10000 // (10000 - fee_bps))
+        exec_price = -(-amount_in * 10 ** decimals // amount_out)
+        
+        return amount_in, exec_price
 
 
 class SolanaConnector:
     """Solana DEX connector using Helius with public RPC fallback."""
     
-    def __init__(self):
+    def __init__(self, registry: PoolRegistry = pool_registry):
+        self.registry = registry
         self.rpc_url = settings.helius_rpc_url
         self.ws_url = settings.helius_ws_url
         # Public Solana RPC as fallback
@@ -63,6 +144,7 @@ class SolanaConnector:
         self.fallback_client = AsyncClient(self.fallback_rpc_url)
         self.using_fallback = False
         self.pools: Dict[str, Dict] = {}
+        self.fixed_point = settings.fixed_point
         self.connected = False
         self.last_update_ts: Dict[str, datetime] = {}
     
@@ -82,6 +164,10 @@ class SolanaConnector:
             from solders.pubkey import Pubkey
             import struct
             
+            info = self.registry.get(pool_address)
+            if info is None:
+                raise ValueError(f"Pool {pool_address} is not in the pool registry")
+            
             pubkey = Pubkey.from_string(pool_address)
             
             # Try primary RPC (Helius) first
@@ -97,6 +183,7 @@ class SolanaConnector:
                 rpc_name = "Public RPC"
                 self.using_fallback = True
                 response = await self.fallback_client.get_account_info(pubkey)
+            received = time.monotonic_ns()
             
             if not response.value or not response.value.data:
                 logger.error(f"No account data for pool {pool_address} from {rpc_name}")
@@ -137,39 +224,49 @@ class SolanaConnector:
             
             # sqrtPrice is stored in Q64.64 fixed-point format
             # Conversion formula: sqrt_price_actual = raw_value / 2^64
-            # Then: price = sqrt_price_actual^2
-            # CRITICAL: Must account for token decimals
-            #   - Token A (USDC): 6 decimals
-            #   - Token B (SOL/wSOL): 9 decimals  
-            #   - For SOL/USDC price: 10^(decimals_b - decimals_a) = 10^(9-6) = 1000
+            # Then: price = sqrt_price_actual^2, token B base units per token A base unit
+            # CRITICAL: Must account for token decimals, per pool from the registry
+            #   - For SOL/USDC (SOL is token A): 10^(9 - 6) = 1000
             
             sqrt_price_decimal = Decimal(sqrt_price_raw) / Decimal(2 ** 64)
             price_before_decimals = sqrt_price_decimal * sqrt_price_decimal
             
-            # Apply decimal adjustment for SOL (9) / USDC (6)
-            # This gives us SOL price in USD
-            decimal_multiplier = Decimal(10) ** (9 - 6)  # 10^3 = 1000
-            price_mid = price_before_decimals * decimal_multiplier
-            
-            logger.info(f"Whirlpool {pool_address[:8]}: sqrtPrice={sqrt_price_decimal:.10f}, price=${price_mid:.2f}")
+            # Quote per base in human units; invert when the base token is B
+            if info.base_is_token_a:
+                price_mid = price_before_decimals * Decimal(10) ** (info.base_decimals - info.quote_decimals)
+            else:
+                price_mid = 1 / (price_before_decimals * Decimal(10) ** (info.quote_decimals - info.base_decimals))
             
-            # No inversion needed - price should already be SOL/USDC (~$145)
+            logger.info(f"Whirlpool {pool_address[:8]} ({info.asset}): sqrtPrice={sqrt_price_decimal:.10f}, price={price_mid:.2f}")
             
-            # Estimate reserves for constant-product pools
-            # For CLMM (concentrated liquidity), this is simplified
-            estimated_liquidity_usd = Decimal("1000000")
-            estimated_sol = estimated_liquidity_usd / (price_mid * Decimal("2"))
-            estimated_usdc = estimated_liquidity_usd / Decimal("2")
+            # Virtual reserves of the current tick range (liquidity u128 at
+            # offset 49): x = L / sqrtPrice of token A, y = L * sqrtPrice of
+            # token B, in base units. Within the range the pool trades exactly
+            # as constant product on them; 0 when no position covers the price.
+            liquidity = int.from_bytes(account_data[49:65], byteorder='little')
+            if sqrt_price_raw:
+                reserve_a = Decimal(liquidity) / sqrt_price_decimal
+                reserve_b = Decimal(liquidity) * sqrt_price_decimal
+            else:
+                reserve_a = reserve_b = Decimal(0)
+            if info.base_is_token_a:
+                base_reserve = reserve_a.scaleb(-info.base_decimals)
+                quote_reserve = reserve_b.scaleb(-info.quote_decimals)
+            else:
+                base_reserve = reserve_b.scaleb(-info.base_decimals)
+                quote_reserve = reserve_a.scaleb(-info.quote_decimals)
             
             return {
                 "address": pool_address,
-                "token_a_reserve": estimated_usdc,
-                "token_b_reserve": estimated_sol,
-                "fee_bps": 30,
+                "token_a_reserve": quote_reserve,  # Quote reserve (human units)
+                "token_b_reserve": base_reserve,  # Base reserve (human units)
+                "liquidity": liquidity,
+                "fee_bps": info.fee_bps,
                 "last_update": datetime.utcnow(),
                 "price_mid": price_mid,
                 "sqrt_price_raw": sqrt_price_raw,
-                "data_source": "whirlpool_on_chain"
+                "data_source": "whirlpool_on_chain",
+                "stamps": {"frame_received": received, "decoded": time.monotonic_ns()}
             }
             
         except Exception as e:
@@ -242,24 +339,31 @@ class SolanaConnector:
         """Emit pool update event."""
         token_a_reserve = pool_state["token_a_reserve"]
         token_b_reserve = pool_state["token_b_reserve"]
+        info = self.registry.get(pool_state["address"])
         
-        price_mid = token_a_reserve / token_b_reserve
+        # No liquidity in range: publish the mid price without reserves
+        reserves = {}
+        if token_a_reserve and token_b_reserve:
+            reserves = {
+                info.quote_mint: str(token_a_reserve),
+                info.base_mint: str(token_b_reserve)
+            }
         
         pool_update = PoolUpdate(
-            program="whirlpool",  # Or detect from account data
+            program=info.program,
             pool=pool_state["address"],
             timestamp=datetime.now(timezone.utc),
-            reserves={
-                settings.usdc_mint: str(token_a_reserve),
-                settings.wsol_mint: str(token_b_reserve)
-            },
-            price_mid=price_mid,
+            reserves=reserves,
+            price_mid=pool_state["price_mid"],
             fee_bps=pool_state["fee_bps"]
         )
         
         self.pools[pool_state["address"]] = pool_state
         self.last_update_ts[pool_state["address"]] = datetime.utcnow()
         
+        # Stored pool state is the DEX side's "book applied" stage
+        pool_update.stamps = dict(pool_state.get("stamps", {}), book_applied=time.monotonic_ns())
+        pool_update.stamps["bus_published"] = time.monotonic_ns()
         await event_bus.publish("dex.poolUpdate", pool_update)
     
     def get_bound_quote(
@@ -271,18 +375,37 @@ class SolanaConnector:
     ) -> Optional[BoundQuote]:
         """Get bound quote for execution."""
         pool = self.pools.get(pool_address)
-        if not pool:
+        info = self.registry.get(pool_address)
+        if not pool or info is None:
             return None
+        if not pool["token_a_reserve"] or not pool["token_b_reserve"]:
+            return None  # No liquidity in range
         
         reserve_in = pool["token_a_reserve"] if side == Side.BUY else pool["token_b_reserve"]
         reserve_out = pool["token_b_reserve"] if side == Side.BUY else pool["token_a_reserve"]
         
-        amount_out, exec_price, impact_pct = PoolMath.constant_product_quote(
-            reserve_in,
-            reserve_out,
-            size_in,
-            pool["fee_bps"]
-        )
+        if self.fixed_point:
+            # Quote in token base units; back to Decimal for the BoundQuote
+            decimals_in, decimals_out = (
+                (info.quote_decimals, info.base_decimals) if side == Side.BUY
+                else (info.base_decimals, info.quote_decimals)
+            )
+            raw_out, _, raw_impact = PoolMath.constant_product_quote_fixed(
+                int(reserve_in.scaleb(decimals_in)),
+                int(reserve_out.scaleb(decimals_out)),
+                int(size_in.scaleb(decimals_in)),
+                pool["fee_bps"]
+            )
+            amount_out = Decimal(raw_out).scaleb(-decimals_out)
+            exec_price = amount_out / size_in
+            impact_pct = Decimal(raw_impact).scaleb(-9)
+        else:
+            amount_out, exec_price, impact_pct = PoolMath.constant_product_quote(
+                reserve_in,
+                reserve_out,
+                size_in,
+                pool["fee_bps"]
+            )
         
         # Check impact against slippage cap
         if impact_pct > Decimal(slippage_bps) / Decimal(100):
@@ -1,14 +1,15 @@
 """Execution engine for dual-leg arbitrage trades."""
-import asyncio
 import logging
+import random
 import uuid
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional
 from decimal import Decimal
-from datetime import datetime, timezone
 
-from shared.types import Opportunity, Trade, Side, OrderStatus
-from shared.events import event_bus
+from shared.types import Opportunity, OpportunityState, Trade, Side, OrderStatus
+from shared.events import event_bus, EventBus
+from shared.clock import Clock, system_clock
 from config import settings
+from observability.latency import copy_stamps, observe, stamp
 from connectors.gemini_connector import gemini_connector
 from connectors.solana_connector import solana_connector
 
@@ -18,18 +19,61 @@ logger = logging.getLogger(__name__)
 class ExecutionEngine:
     """Executes dual-leg arbitrage trades."""
     
-    def __init__(self):
+    def __init__(
+        self,
+        bus: EventBus = event_bus,
+        clock: Clock = system_clock,
+        rng: Optional[random.Random] = None,
+        id_factory: Callable[[], str] = lambda: str(uuid.uuid4()),
+        observe_only: Optional[bool] = None
+    ):
+        self.bus = bus
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.id_factory = id_factory
+        # None follows settings.observe_only_mode at runtime
+        self.observe_only = observe_only
         self.active_trades: Dict[str, Trade] = {}
         self.trade_history: list[Trade] = []
+        self.paused = False
+        self.skipped_while_paused = 0
+        # CEX leg routing by Opportunity.cex_venue; others are registered at startup
+        self.cex_connectors: Dict[str, object] = {"gemini": gemini_connector}
         
-        # Subscribe to opportunities
-        event_bus.subscribe("signal.opportunity", self.handle_opportunity)
+        # Subscribe to opportunities and kill-switch events
+        self.bus.subscribe("signal.opportunity", self.handle_opportunity)
+        self.bus.subscribe("risk.paused", self.handle_pause)
+        self.bus.subscribe("risk.resumed", self.handle_resume)
+    
+    async def handle_pause(self, event: dict):
+        """Stop acting on opportunities."""
+        self.paused = True
+        logger.warning(f"Execution paused: {event.get('reason', '')}")
+    
+    async def handle_resume(self, event: dict):
+        """Resume acting on opportunities."""
+        self.paused = False
+        logger.info("Execution resumed")
     
     async def handle_opportunity(self, opp: Opportunity):
         """Handle arbitrage opportunity."""
+        # Trade once per spread episode, when it opens
+        if opp.state != OpportunityState.OPEN:
+            return
+        
+        # Sized to zero: no size is profitable after fees
+        if opp.size <= 0:
+            logger.debug("Skipping unsized opportunity %s", opp.id)
+            return
+        
+        if self.paused:
+            self.skipped_while_paused += 1
+            logger.info(f"Execution paused, skipping opportunity {opp.id}")
+            return
+        
         # Create trade
         trade = Trade(
-            trade_id=str(uuid.uuid4()),
+            trade_id=self.id_factory(),
             opportunity_id=opp.id,
             asset=opp.asset,
             direction=opp.direction,
@@ -40,15 +84,17 @@ class ExecutionEngine:
             pnl_abs=Decimal("0"),
             pnl_pct=Decimal("0"),
             latency_ms=0,
-            timestamp=datetime.now(timezone.utc),
+            timestamp=self.clock.now(),
             window_id=opp.window_id,
-            status=OrderStatus.PENDING
+            status=OrderStatus.PENDING,
+            stamps=stamp(copy_stamps(opp.stamps), "execution_started", self.clock)
         )
         
         self.active_trades[trade.trade_id] = trade
         
         # Check if in observe-only mode
-        if settings.observe_only_mode:
+        observe_only = settings.observe_only_mode if self.observe_only is None else self.observe_only
+        if observe_only:
             logger.info(f"OBSERVE-ONLY: Simulating execution for {opp.id}")
             await self.simulate_dual_leg(trade, opp)
         else:
@@ -57,25 +103,28 @@ class ExecutionEngine:
     
     async def simulate_dual_leg(self, trade: Trade, opp: Opportunity):
         """Simulate both legs of the arbitrage trade in OBSERVE-ONLY mode."""
-        start_time = datetime.utcnow()
+        start_time = self.clock.monotonic()
         
         try:
             logger.info(f"[SIMULATED] Executing {opp.direction}: {opp.asset} size={opp.size}")
             
-            # Simulate network latency (200-500ms)
-            import random
-            await asyncio.sleep(random.uniform(0.2, 0.5))
+            # Simulate network latency (200-500ms); both legs in flight together
+            stamp(trade.stamps, "cex_sent", self.clock)
+            stamp(trade.stamps, "dex_sent", self.clock)
+            await self.clock.sleep(self.rng.uniform(0.2, 0.5))
+            stamp(trade.stamps, "cex_acked", self.clock)
+            stamp(trade.stamps, "dex_acked", self.clock)
             
             # Simulate order IDs
             trade.cex_order_id = f"sim_cex_{trade.trade_id[:8]}"
             trade.dex_tx_sig = f"sim_dex_{trade.trade_id[:8]}"
             
             # Calculate latency
-            latency = (datetime.utcnow() - start_time).total_seconds() * 1000
+            latency = (self.clock.monotonic() - start_time) * 1000
             trade.latency_ms = int(latency)
             
             # Simulate fills with realistic slippage (0.05-0.15%)
-            slippage_pct = Decimal(str(random.uniform(0.0005, 0.0015)))
+            slippage_pct = Decimal(str(self.rng.uniform(0.0005, 0.0015)))
             
             if opp.direction == "cex_to_dex":
                 # Buy CEX (pay slightly more), Sell DEX (get slightly less)
@@ -102,6 +151,7 @@ class ExecutionEngine:
             trade.fees_total = cex_fee + dex_fee + priority_fee
             trade.pnl_abs = spread_abs - trade.fees_total
             trade.pnl_pct = (trade.pnl_abs / (opp.size * opp.cex_price)) * Decimal(100)
+            trade.latency_breakdown = observe(trade.stamps, trade.asset)
             
             logger.info(
                 f"[SIMULATED] Trade {trade.trade_id[:8]}... completed: "
@@ -112,7 +162,7 @@ class ExecutionEngine:
             )
             
             # Emit trade event
-            await event_bus.publish("trade.completed", trade)
+            await self.bus.publish("trade.completed", trade)
             
         except Exception as e:
             logger.error(f"[SIMULATED] Trade {trade.trade_id} failed: {e}")
@@ -125,28 +175,30 @@ class ExecutionEngine:
     
     async def execute_dual_leg(self, trade: Trade, opp: Opportunity):
         """Execute both legs of the arbitrage trade."""
-        start_time = datetime.utcnow()
+        start_time = self.clock.monotonic()
         
         try:
-            # Map asset to symbols
-            cex_symbol = opp.asset.lower().replace("-", "")  # e.g., solusd
-            pool_address = "mock_pool_address"  # Would be from config
+            pool_address = opp.dex_pool
+            if pool_address is None:
+                raise ValueError(f"Opportunity {opp.id} has no DEX pool")
             
             if opp.direction == "cex_to_dex":
                 # Buy CEX, Sell DEX
                 logger.info(f"Executing CEX->DEX: Buy {opp.size} on CEX, Sell on DEX")
                 
                 # Leg 1: Buy on CEX (IOC order)
-                cex_order = await gemini_connector.place_ioc_order(
-                    symbol=cex_symbol,
-                    side=Side.BUY,
-                    quantity=opp.size,
-                    price=opp.cex_price * Decimal("1.001"),  # Slight price cushion
-                    client_order_id=f"{trade.trade_id}_cex"
+                stamp(trade.stamps, "cex_sent", self.clock)
+                cex_order = await self._place_cex_order(
+                    opp,
+                    Side.BUY,
+                    opp.cex_price * Decimal("1.001"),  # Slight price cushion
+                    f"{trade.trade_id}_cex"
                 )
+                stamp(trade.stamps, "cex_acked", self.clock)
                 trade.cex_order_id = cex_order.get("order_id")
                 
                 # Leg 2: Sell on DEX
+                stamp(trade.stamps, "dex_sent", self.clock)
                 dex_tx_sig = await solana_connector.execute_swap(
                     pool_address=pool_address,
                     side=Side.SELL,
@@ -154,6 +206,7 @@ class ExecutionEngine:
                     min_size_out=opp.size * opp.dex_price * Decimal("0.99"),  # 1% slippage
                     priority_fee_lamports=5000
                 )
+                stamp(trade.stamps, "dex_acked", self.clock)
                 trade.dex_tx_sig = dex_tx_sig
                 
             else:
@@ -161,6 +214,7 @@ class ExecutionEngine:
                 logger.info(f"Executing DEX->CEX: Buy on DEX, Sell {opp.size} on CEX")
                 
                 # Leg 1: Buy on DEX
+                stamp(trade.stamps, "dex_sent", self.clock)
                 dex_tx_sig = await solana_connector.execute_swap(
                     pool_address=pool_address,
                     side=Side.BUY,
@@ -168,20 +222,22 @@ class ExecutionEngine:
                     min_size_out=opp.size * Decimal("0.99"),
                     priority_fee_lamports=5000
                 )
+                stamp(trade.stamps, "dex_acked", self.clock)
                 trade.dex_tx_sig = dex_tx_sig
                 
                 # Leg 2: Sell on CEX
-                cex_order = await gemini_connector.place_ioc_order(
-                    symbol=cex_symbol,
-                    side=Side.SELL,
-                    quantity=opp.size,
-                    price=opp.cex_price * Decimal("0.999"),  # Slight price cushion
-                    client_order_id=f"{trade.trade_id}_cex"
+                stamp(trade.stamps, "cex_sent", self.clock)
+                cex_order = await self._place_cex_order(
+                    opp,
+                    Side.SELL,
+                    opp.cex_price * Decimal("0.999"),  # Slight price cushion
+                    f"{trade.trade_id}_cex"
                 )
+                stamp(trade.stamps, "cex_acked", self.clock)
                 trade.cex_order_id = cex_order.get("order_id")
             
             # Calculate latency
-            latency = (datetime.utcnow() - start_time).total_seconds() * 1000
+            latency = (self.clock.monotonic() - start_time) * 1000
             trade.latency_ms = int(latency)
             
             # Update trade status
@@ -193,6 +249,7 @@ class ExecutionEngine:
             trade.fees_total = fees
             trade.pnl_abs = spread_abs - fees
             trade.pnl_pct = (trade.pnl_abs / (opp.size * opp.cex_price)) * Decimal(100)
+            trade.latency_breakdown = observe(trade.stamps, trade.asset)
             
             logger.info(
                 f"Trade {trade.trade_id[:8]}... completed: "
@@ -201,7 +258,7 @@ class ExecutionEngine:
             )
             
             # Emit trade event
-            await event_bus.publish("trade.completed", trade)
+            await self.bus.publish("trade.completed", trade)
             
         except Exception as e:
             logger.error(f"Trade {trade.trade_id} failed: {e}")
@@ -211,6 +268,28 @@ class ExecutionEngine:
             # Move to history
             self.trade_history.append(trade)
             del self.active_trades[trade.trade_id]
+    
+    async def _place_cex_order(self, opp: Opportunity, side: Side, price: Decimal, client_order_id: str) -> dict:
+        """IOC order for the CEX leg on the venue that quoted it."""
+        connector = self.cex_connectors.get(opp.cex_venue)
+        if connector is None:
+            raise ValueError(f"No connector for CEX venue {opp.cex_venue!r}")
+        symbol = opp.cex_symbol or opp.asset.lower().replace("-", "")
+        
+        if opp.cex_venue == "coinbase":
+            return await connector.place_ioc_order(
+                product_id=symbol,
+                side=side,
+                size=opp.size,
+                limit_price=price
+            )
+        return await connector.place_ioc_order(
+            symbol=symbol,
+            side=side,
+            quantity=opp.size,
+            price=price,
+            client_order_id=client_order_id
+        )
 
 
 # Global instance
@@ -0,0 +1,114 @@
+"""Consolidated best bid/offer across CEX venues.
+
+Venues name the same instrument differently (Gemini ``solusd``, Coinbase
+``SOL-USD``). :class:`SymbolTable` resolves a venue symbol to the canonical
+asset name (``SOL-USD``, as in ``settings.assets``) with one dict lookup, and
+gives back each venue's own symbol for order routing.
+
+:class:`NBBOIndex` keeps, per canonical instrument, every venue's executable
+bid/ask and the best of each side with the venue that holds it. Updates are
+incremental: a venue improving or matching a side takes it in O(1); only
+when the holder of a side worsens or drops out are the (few) venues rescanned.
+Prices are whatever the caller stores, Decimal or fixed-point ints, as long
+as one instrument uses one representation.
+"""
+from typing import Dict, Iterable, Optional, Tuple
+
+# Symbol style per venue, from the canonical "BASE-QUOTE"
+VENUE_SYMBOL_FORMATS = {
+    "gemini": lambda base, quote: f"{base}{quote}".lower(),
+    "coinbase": lambda base, quote: f"{base}-{quote}",
+}
+
+
+class SymbolTable:
+    """Precomputed (venue, symbol) <-> canonical asset lookups."""
+
+    def __init__(self, assets: Iterable[str], venues: Iterable[str] = tuple(VENUE_SYMBOL_FORMATS)):
+        self._canonical: Dict[Tuple[str, str], str] = {}
+        self._venue_symbols: Dict[Tuple[str, str], str] = {}
+        for asset in assets:
+            base, quote = asset.upper().split("-")
+            for venue in venues:
+                symbol = VENUE_SYMBOL_FORMATS[venue](base, quote)
+                self._venue_symbols[(asset, venue)] = symbol
+                # Accept case variants; Gemini echoes symbols upper-case
+                for variant in (symbol, symbol.lower(), symbol.upper()):
+                    self._canonical[(venue, variant)] = asset
+
+    def canonical(self, venue: str, symbol: str) -> Optional[str]:
+        """Canonical asset for a venue symbol, or None if not configured."""
+        return self._canonical.get((venue, symbol))
+
+    def venue_symbol(self, asset: str, venue: str) -> Optional[str]:
+        """The venue's own symbol for a canonical asset."""
+        return self._venue_symbols.get((asset, venue))
+
+
+class NBBO:
+    """Best bid/ask of one instrument across venues."""
+    __slots__ = ("quotes", "bid", "bid_venue", "ask", "ask_venue")
+
+    def __init__(self):
+        self.quotes: Dict[str, Tuple[object, object]] = {}  # venue -> (bid, ask)
+        self.bid = self.ask = None
+        self.bid_venue: Optional[str] = None
+        self.ask_venue: Optional[str] = None
+
+    def update(self, venue: str, bid, ask) -> None:
+        """Set a venue's bid/ask; None for a side it cannot fill."""
+        self.quotes[venue] = (bid, ask)
+
+        if bid is not None and (self.bid is None or bid >= self.bid):
+            self.bid, self.bid_venue = bid, venue
+        elif venue == self.bid_venue:
+            self._rescan_bid()
+
+        if ask is not None and (self.ask is None or ask <= self.ask):
+            self.ask, self.ask_venue = ask, venue
+        elif venue == self.ask_venue:
+            self._rescan_ask()
+
+    def remove(self, venue: str) -> None:
+        """Drop a venue (e.g. its book was invalidated)."""
+        if self.quotes.pop(venue, None) is None:
+            return
+        if venue == self.bid_venue:
+            self._rescan_bid()
+        if venue == self.ask_venue:
+            self._rescan_ask()
+
+    def _rescan_bid(self) -> None:
+        self.bid = self.bid_venue = None
+        for venue, (bid, _) in self.quotes.items():
+            if bid is not None and (self.bid is None or bid > self.bid):
+                self.bid, self.bid_venue = bid, venue
+
+    def _rescan_ask(self) -> None:
+        self.ask = self.ask_venue = None
+        for venue, (_, ask) in self.quotes.items():
+            if ask is not None and (self.ask is None or ask < self.ask):
+                self.ask, self.ask_venue = ask, venue
+
+
+class NBBOIndex:
+    """NBBO per canonical instrument."""
+
+    def __init__(self):
+        self._books: Dict[str, NBBO] = {}
+
+    def update(self, asset: str, venue: str, bid, ask) -> NBBO:
+        """Record a venue's bid/ask for `asset` and return the asset's NBBO."""
+        nbbo = self._books.get(asset)
+        if nbbo is None:
+            nbbo = self._books[asset] = NBBO()
+        nbbo.update(venue, bid, ask)
+        return nbbo
+
+    def remove(self, asset: str, venue: str) -> None:
+        nbbo = self._books.get(asset)
+        if nbbo is not None:
+            nbbo.remove(venue)
+
+    def get(self, asset: str) -> Optional[NBBO]:
+        return self._books.get(asset)
@@ -1,189 +1,610 @@
 """Signal engine for arbitrage opportunity detection."""
 import logging
 import uuid
-from typing import Dict, Optional
-from decimal import Decimal
-from datetime import datetime, timezone, timedelta
+from typing import Callable, Dict, Optional, Tuple, Union
+from decimal import Decimal, ROUND_DOWN
+from datetime import timedelta
 
-from shared.types import Opportunity, Window, BookUpdate, PoolUpdate
-from shared.events import event_bus
+import numpy as np
+
+from shared.types import Opportunity, OpportunityState, Trade, Window, BookUpdate, PoolUpdate
+from shared.events import event_bus, EventBus
+from shared.clock import Clock, system_clock
+from shared.fixedpoint import scale_for
+from shared.orderbook import BookView, DepthCurve
+from shared.pools import PoolInfo, PoolRegistry, pool_registry
+from engines.nbbo import NBBOIndex, SymbolTable
+from engines.spread_matrix import SpreadMatrix, Spreads
+from engines.sizing import optimal_size
+from observability.latency import copy_stamps, stamp
+from connectors.solana_connector import PoolMath
+from observability.metrics import signal_evaluations_total
 from config import settings
 
 logger = logging.getLogger(__name__)
 
+HUNDRED = Decimal(100)
+CENT = Decimal("0.01")
+ZERO = Decimal(0)
+
+
+def new_id() -> str:
+    """Random unique identifier."""
+    return str(uuid.uuid4())
+
 
 class WindowManager:
-    """Manages trading windows for TOD analysis."""
+    """Manages trading windows for TOD analysis.
+    
+    Windows close on time (``run`` checks every ``flush_interval_sec``), keep
+    their stats as running values, and are upserted to the window repository
+    in batches. Closed windows leave memory once persisted, or beyond
+    ``max_closed`` when there is no repository (replay).
+    """
     
-    def __init__(self):
-        self.windows: Dict[str, Window] = {}
+    def __init__(self, clock: Clock = system_clock, id_factory: Callable[[], str] = new_id):
+        self.clock = clock
+        self.id_factory = id_factory
+        self.windows: Dict[str, Window] = {}  # Closed, not yet evicted
         self.current_window: Dict[str, Optional[Window]] = {}
         self.window_grace_sec = 20
+        self.flush_interval_sec = 5.0
+        self.max_closed = 1000
+        # Per-window direction counts for dominant_dir
+        self._directions: Dict[str, Dict[str, int]] = {}
+        self._dirty: Dict[str, Window] = {}
     
     def get_or_create_window(self, asset: str) -> Window:
         """Get current window or create new one."""
         current = self.current_window.get(asset)
         
-        if current:
-            # Check if window should be closed
-            if datetime.utcnow() - current.start_ts > timedelta(seconds=self.window_grace_sec * 2):
-                # Close window
-                current.end_ts = datetime.utcnow()
-                self.windows[current.id] = current
-                current = None
+        if current and self._expired(current):
+            self._close(asset)
+            current = None
         
         if not current:
             # Create new window
             current = Window(
-                id=str(uuid.uuid4()),
+                id=self.id_factory(),
                 asset=asset,
-                start_ts=datetime.utcnow()
+                start_ts=self.clock.utcnow()
             )
             self.current_window[asset] = current
+            self._directions[current.id] = {}
+            self._dirty[current.id] = current
         
         return current
+    
+    def record_opportunity(self, opp: Opportunity):
+        """Fold an opened or updated opportunity into its window's stats."""
+        window = self._find(opp.asset, opp.window_id)
+        if window is None:
+            return
+        
+        pnl = opp.predicted_pnl_pct
+        if opp.state == OpportunityState.OPEN:
+            window.signals += 1
+            # Streaming mean over the window's opened opportunities
+            window.mean_net_pnl_pct += (pnl - window.mean_net_pnl_pct) / window.signals
+            directions = self._directions.setdefault(window.id, {})
+            directions[opp.direction] = directions.get(opp.direction, 0) + 1
+            window.dominant_dir = max(directions, key=directions.get)
+            if window.signals == 1:
+                window.max_net_pnl_pct = pnl
+        window.max_net_pnl_pct = max(window.max_net_pnl_pct, pnl)
+        self._dirty[window.id] = window
+    
+    async def handle_trade(self, trade: Trade):
+        """Count a completed trade in its window."""
+        window = self._find(trade.asset, trade.window_id)
+        if window is not None:
+            window.trades += 1
+            self._dirty[window.id] = window
+    
+    def close_expired(self) -> int:
+        """Close every window past its lifetime; returns how many closed."""
+        expired = [asset for asset, window in self.current_window.items() if window and self._expired(window)]
+        for asset in expired:
+            self._close(asset)
+        return len(expired)
+    
+    async def flush(self, repo=None):
+        """Upsert changed windows in one batch, then evict persisted closed ones."""
+        if repo is not None and self._dirty:
+            batch = list(self._dirty.values())
+            self._dirty = {}
+            try:
+                await repo.upsert_many(batch)
+            except Exception:
+                # Retry next flush; windows changed meanwhile keep their newer entry
+                for window in batch:
+                    self._dirty.setdefault(window.id, window)
+                raise
+            for window in batch:
+                if window.end_ts is not None:
+                    self.windows.pop(window.id, None)
+        
+        # Without persistence keep only the newest closed windows
+        while len(self.windows) > self.max_closed:
+            window_id = next(iter(self.windows))
+            self._dirty.pop(window_id, None)
+            del self.windows[window_id]
+    
+    async def run(self, repo=None):
+        """Close windows on time and persist them until cancelled."""
+        while True:
+            await self.clock.sleep(self.flush_interval_sec)
+            try:
+                self.close_expired()
+                await self.flush(repo)
+            except Exception as e:
+                logger.error(f"Window flush failed: {e}")
+    
+    def _expired(self, window: Window) -> bool:
+        return self.clock.utcnow() - window.start_ts > timedelta(seconds=self.window_grace_sec * 2)
+    
+    def _close(self, asset: str):
+        window = self.current_window.pop(asset)
+        window.end_ts = self.clock.utcnow()
+        self._directions.pop(window.id, None)
+        self.windows[window.id] = window
+        self._dirty[window.id] = window
+    
+    def _find(self, asset: str, window_id: Optional[str]) -> Optional[Window]:
+        current = self.current_window.get(asset)
+        if current is not None and current.id == window_id:
+            return current
+        return self.windows.get(window_id)
 
 
 class SignalEngine:
     """Detects arbitrage opportunities from market data."""
     
-    def __init__(self):
-        self.window_manager = WindowManager()
-        self.cex_books: Dict[str, BookUpdate] = {}
+    def __init__(
+        self,
+        bus: EventBus = event_bus,
+        clock: Clock = system_clock,
+        id_factory: Callable[[], str] = new_id,
+        fixed_point: Optional[bool] = None,
+        spread_matrix: Optional[bool] = None,
+        pools: PoolRegistry = pool_registry
+    ):
+        self.bus = bus
+        self.clock = clock
+        self.id_factory = id_factory
+        # Compare prices as scaled integers; Decimal only for emitted opportunities
+        self.fixed_point = settings.fixed_point if fixed_point is None else fixed_point
+        self.window_manager = WindowManager(clock, id_factory)
+        self.symbols = SymbolTable(settings.assets)
+        # Latest book per (asset, venue); executable prices consolidated in nbbo
+        self.cex_books: Dict[Tuple[str, str], Union[BookUpdate, BookView]] = {}
+        # Venues are ranked net of their taker fee; raw prices per (asset, venue)
+        self.nbbo = NBBOIndex()
+        self._cex_quotes: Dict[Tuple[str, str], tuple] = {}
+        # Latest update per registered pool address; per asset, the best pool
+        # to sell into (bid side) and buy from (ask side) at base_size
+        self.pools = pools
         self.dex_pools: Dict[str, PoolUpdate] = {}
+        self.best_pools = NBBOIndex()
+        # Per-(asset, venue) (book event, bid curve, ask curve); each event is one book version
+        self._depth_cache: Dict[Tuple[str, str], Tuple[object, DepthCurve, DepthCurve]] = {}
+        # Per-asset inputs of the last evaluation; most L2 updates change
+        # levels that do not move the executable prices at size
+        self._last_inputs: Dict[str, tuple] = {}
+        self._evaluation_counters: Dict[str, tuple] = {}
+        
+        # Fees and slippage haircut applied to the raw spread; the CEX taker
+        # fee is per venue (CEX_TAKER_FEES), cex_fee_pct for unlisted venues
+        self.cex_fee_pct = Decimal("0.35")  # Gemini taker fee ~0.35%
+        self.venue_fees_pct: Dict[str, Decimal] = {
+            venue: Decimal(str(pct)) for venue, pct in settings.cex_fees_pct.items()
+        }
+        self.dex_fee_pct = Decimal("0.30")  # Typical DEX fee 0.30%
+        self.haircut_pct = Decimal("0.75")  # Slippage/impact haircut
+        
+        # For production demo: Accept negative PnL to show realistic spreads
+        # Production: Use 1.0% threshold to ensure profitability
+        self.threshold_pct = Decimal("-1.0")  # Accept any spread for demo
+        
+        # Probe size for executable prices; opportunities are then sized to
+        # the PnL optimum when the pool has reserves
+        self.base_size = Decimal("50")
+        self.size_step = Decimal("0.001")
+        
+        # Spread episodes: one Opportunity per (asset, direction) from open to
+        # close; updates are published only when predicted PnL moves by
+        # material_change_pct, and it closes below threshold - hysteresis
+        self.hysteresis_pct = Decimal("0.10")
+        self.material_change_pct = Decimal("0.10")
+        self.open_opportunities: Dict[Tuple[str, str], Opportunity] = {}
+        self._emitted_pnl: Dict[Tuple[str, str], Decimal] = {}
+        
+        # Optional all-venue x all-pool screen, recomputed on every update
+        use_matrix = settings.spread_matrix_enabled if spread_matrix is None else spread_matrix
+        self.spread_matrix: Optional[SpreadMatrix] = None
+        self.spreads: Optional[Spreads] = None
+        if use_matrix:
+            self.spread_matrix = SpreadMatrix(settings.assets, settings.cex_fees_pct, float(self.haircut_pct))
         
         # Subscribe to market data events
-        event_bus.subscribe("cex.bookUpdate", self.handle_cex_update)
-        event_bus.subscribe("dex.poolUpdate", self.handle_dex_update)
+        self.bus.subscribe("cex.bookUpdate", self.handle_cex_update)
+        self.bus.subscribe("dex.poolUpdate", self.handle_dex_update)
+        self.bus.subscribe("trade.completed", self.window_manager.handle_trade)
     
-    async def handle_cex_update(self, book: BookUpdate):
+    async def handle_cex_update(self, book: Union[BookUpdate, BookView]):
         """Handle CEX order book update."""
-        # Store with lowercase key for consistent lookups
-        pair_lower = book.pair.lower()
-        self.cex_books[pair_lower] = book
-        
-        logger.info(f"SignalEngine: Received CEX update for {book.pair}, stored as {pair_lower}")
-        
-        # Normalize pair name for opportunity checking
-        if pair_lower == "solusd":
-            normalized = "SOL-USD"
-        elif pair_lower == "btcusd":
-            normalized = "BTC-USD"
-        elif pair_lower == "ethusd":
-            normalized = "ETH-USD"
-        else:
-            normalized = pair_lower.upper()
+        asset = self.symbols.canonical(book.venue, book.pair)
+        if asset is None:
+            logger.debug("SignalEngine: ignoring unconfigured %s %s", book.venue, book.pair)
+            return
+        key = (asset, book.venue)
+        
+        # Connectors publish an empty book when they invalidate one (gap,
+        # disconnect, crossed); forget the venue until a fresh snapshot
+        if _is_empty(book):
+            self.cex_books.pop(key, None)
+            self._depth_cache.pop(key, None)
+            self._cex_quotes.pop(key, None)
+            self.nbbo.remove(asset, book.venue)
+            if self.spread_matrix is not None and book.venue in self.spread_matrix.venues:
+                self.spread_matrix.remove_cex(asset, book.venue)
+            logger.info("SignalEngine: %s %s book invalidated, dropped", book.venue, book.pair)
+            # Episodes priced off this venue are re-evaluated (or closed) now
+            await self.check_opportunities(asset)
+            return
+        
+        self.cex_books[key] = book
         
-        logger.info(f"SignalEngine: Checking opportunities for {normalized}")
-        await self.check_opportunities(normalized)
+        # This venue's executable prices for the intended size into the NBBO
+        scale = scale_for(asset, self.fixed_point)
+        bid_curve, ask_curve = self._depth_curves(key, book, scale)
+        cex_size = scale.size_from_decimal(self.base_size)
+        bid, ask = bid_curve.vwap(cex_size), ask_curve.vwap(cex_size)
+        self._cex_quotes[key] = (bid, ask)
+        fee = self.venue_fee_pct(book.venue) / HUNDRED
+        self.nbbo.update(
+            asset, book.venue,
+            None if bid is None else bid * (1 - fee),  # Proceeds per unit sold
+            None if ask is None else ask * (1 + fee)  # Cost per unit bought
+        )
+        if self.spread_matrix is not None and book.venue in self.spread_matrix.venues:
+            self.spread_matrix.update_cex(asset, book.venue, _to_float(scale, bid), _to_float(scale, ask))
+            self.spreads = self.spread_matrix.compute()
+        
+        logger.debug("SignalEngine: %s %s -> %s", book.venue, book.pair, asset)
+        await self.check_opportunities(asset, getattr(book, "stamps", None))
     
     async def handle_dex_update(self, pool: PoolUpdate):
         """Handle DEX pool update."""
-        logger.info(f"SignalEngine: Received DEX pool update")
-        # Map pool to asset symbol
-        asset = "SOL-USD"  # Simplified for POC
-        self.dex_pools[asset] = pool
-        logger.info(f"SignalEngine: DEX pool stored for {asset}, price_mid={pool.price_mid}")
-        await self.check_opportunities(asset)
+        info = self.pools.get(pool.pool)
+        if info is None:
+            logger.debug("SignalEngine: ignoring unregistered pool %s", pool.pool)
+            return
+        asset = info.asset
+        self.dex_pools[pool.pool] = pool
+        
+        # Executable prices at the probe size, priced once per pool update
+        scale = scale_for(asset, self.fixed_point)
+        sell, buy = self._dex_prices(pool, info, self.base_size, scale)
+        self.best_pools.update(asset, pool.pool, sell, buy)
+        if self.spread_matrix is not None:
+            self.spread_matrix.update_dex(
+                asset, pool.pool, _to_float(scale, sell), _to_float(scale, buy), pool.fee_bps
+            )
+            self.spreads = self.spread_matrix.compute()
+        logger.debug("SignalEngine: DEX pool stored for %s, price_mid=%s", asset, pool.price_mid)
+        await self.check_opportunities(asset, pool.stamps)
     
-    async def check_opportunities(self, asset: str):
-        """Check for arbitrage opportunities."""
-        # Map asset to CEX symbol (e.g., SOL-USD -> solusd for Gemini)
-        cex_symbol = asset.lower().replace("-", "")
+    async def check_opportunities(self, asset: str, stamps: Optional[Dict[str, int]] = None):
+        """Check for arbitrage opportunities.
         
-        cex_book = self.cex_books.get(cex_symbol)
-        dex_pool = self.dex_pools.get(asset)
+        `stamps` are the triggering event's stage timestamps, carried onto
+        any opportunity it emits.
+        """
+        nbbo = self.nbbo.get(asset)
+        dex = self.best_pools.get(asset)
         
-        logger.debug(f"Checking {asset}: CEX book={bool(cex_book)}, DEX pool={bool(dex_pool)}")
+        logger.debug("Checking %s: NBBO=%s, DEX pool=%s", asset, nbbo is not None, dex is not None)
         
-        if not cex_book or not dex_pool:
+        if nbbo is None or dex is None:
             return
         
-        # Parse best prices
-        if not cex_book.bids or not cex_book.asks:
-            logger.debug(f"{asset}: CEX book has no bids/asks")
+        # Prices are Decimal, or ints at the instrument's price scale in fixed-point mode
+        scale = scale_for(asset, self.fixed_point)
+        size = self.base_size
+        
+        # Executable prices for the intended size: VWAP walking the book of
+        # the CEX venue that is best net of its taker fee, best pool price
+        # after impact. None where the size cannot be filled.
+        cex_bid = None if nbbo.bid is None else self._cex_quotes[(asset, nbbo.bid_venue)][0]
+        cex_ask = None if nbbo.ask is None else self._cex_quotes[(asset, nbbo.ask_venue)][1]
+        dex_sell, dex_buy = dex.bid, dex.ask
+        
+        evaluated, skipped = self._counters(asset)
+        inputs = (
+            size, cex_bid, nbbo.bid_venue, cex_ask, nbbo.ask_venue,
+            dex_sell, dex.bid_venue, dex_buy, dex.ask_venue
+        )
+        if inputs == self._last_inputs.get(asset):
+            skipped.inc()
             return
+        self._last_inputs[asset] = inputs
+        evaluated.inc()
         
-        cex_bid = Decimal(cex_book.bids[0][0])
-        cex_ask = Decimal(cex_book.asks[0][0])
-        dex_price = dex_pool.price_mid
+        if cex_bid is None and cex_ask is None:
+            logger.debug("%s: CEX books cannot fill size %s", asset, size)
         
-        logger.info(f"{asset} prices: CEX bid={cex_bid}, ask={cex_ask}, DEX mid={dex_price}")
+        if logger.isEnabledFor(logging.DEBUG):
+            fmt = lambda price: "-" if price is None else scale.format_price(price)
+            logger.debug(
+                "%s executable prices for %s: CEX bid=%s (%s), ask=%s (%s), DEX sell=%s, buy=%s",
+                asset, size, fmt(cex_bid), nbbo.bid_venue, fmt(cex_ask), nbbo.ask_venue,
+                fmt(dex_sell), fmt(dex_buy)
+            )
         
-        # Check both directions
+        # Check both directions; a direction without a positive spread
+        # closes its open episode, if any
         # Direction 1: Buy CEX, Sell DEX
-        if dex_price > cex_ask:
-            spread_pct = ((dex_price - cex_ask) / cex_ask) * Decimal(100)
-            logger.info(f"CEX→DEX spread detected: {asset} spread={spread_pct:.4f}% (CEX ask={cex_ask}, DEX mid={dex_price})")
+        if cex_ask is not None and dex_sell is not None and dex_sell > cex_ask:
+            spread_pct = (Decimal(dex_sell - cex_ask) / Decimal(cex_ask)) * HUNDRED
+            logger.debug("CEX→DEX spread detected: %s spread=%.4f%%", asset, spread_pct)
             await self._evaluate_opportunity(
                 asset=asset,
                 direction="cex_to_dex",
-                cex_price=cex_ask,
-                dex_price=dex_price,
-                spread_pct=spread_pct
+                cex_venue=nbbo.ask_venue,
+                dex_pool=dex.bid_venue,
+                cex_price=scale.price_to_decimal(cex_ask),
+                dex_price=scale.price_to_decimal(dex_sell),
+                spread_pct=spread_pct,
+                stamps=stamps
             )
+        else:
+            await self._close_opportunity(asset, "cex_to_dex")
         
         # Direction 2: Buy DEX, Sell CEX
-        if cex_bid > dex_price:
-            spread_pct = ((cex_bid - dex_price) / dex_price) * Decimal(100)
-            logger.info(f"DEX→CEX spread detected: {asset} spread={spread_pct:.4f}% (CEX bid={cex_bid}, DEX mid={dex_price})")
+        if cex_bid is not None and dex_buy is not None and cex_bid > dex_buy:
+            spread_pct = (Decimal(cex_bid - dex_buy) / Decimal(dex_buy)) * HUNDRED
+            logger.debug("DEX→CEX spread detected: %s spread=%.4f%%", asset, spread_pct)
             await self._evaluate_opportunity(
                 asset=asset,
                 direction="dex_to_cex",
-                cex_price=cex_bid,
-                dex_price=dex_price,
-                spread_pct=spread_pct
+                cex_venue=nbbo.bid_venue,
+                dex_pool=dex.ask_venue,
+                cex_price=scale.price_to_decimal(cex_bid),
+                dex_price=scale.price_to_decimal(dex_buy),
+                spread_pct=spread_pct,
+                stamps=stamps
+            )
+        else:
+            await self._close_opportunity(asset, "dex_to_cex")
+    
+    def venue_fee_pct(self, venue: str) -> Decimal:
+        """Taker fee of a CEX venue, in percent."""
+        return self.venue_fees_pct.get(venue, self.cex_fee_pct)
+    
+    def _counters(self, asset: str) -> tuple:
+        """(evaluated, skipped) counters for an asset, bound once."""
+        counters = self._evaluation_counters.get(asset)
+        if counters is None:
+            counters = self._evaluation_counters[asset] = (
+                signal_evaluations_total.labels(asset=asset, result="evaluated"),
+                signal_evaluations_total.labels(asset=asset, result="skipped")
             )
+        return counters
+    
+    def _depth_curves(self, key: Tuple[str, str], book: Union[BookUpdate, BookView], scale) -> Tuple[DepthCurve, DepthCurve]:
+        """Bid/ask depth curves for a book event, built once per event."""
+        cached = self._depth_cache.get(key)
+        if cached is not None and cached[0] is book:
+            return cached[1], cached[2]
+        
+        if isinstance(book, BookView) and book.scale is scale:
+            bids, asks = book.levels(True), book.levels(False)
+        else:
+            price, size = scale.price, scale.size
+            bids = [(price(p), size(s)) for p, s in book.bids]
+            asks = [(price(p), size(s)) for p, s in book.asks]
+        
+        curves = DepthCurve(bids, True, scale), DepthCurve(asks, False, scale)
+        self._depth_cache[key] = (book, *curves)
+        return curves
+    
+    def _dex_prices(self, pool: PoolUpdate, info: PoolInfo, size: Decimal, scale) -> tuple:
+        """(sell price, buy price) of `size` base tokens on the pool, in `scale`.
+        
+        Uses the constant product quote on the pool reserves (fee excluded;
+        it is charged via dex_fee_pct), or the mid price when the update
+        carries no reserves. In fixed-point mode the quote is integer math on
+        token base units, rounded against us like the on-chain program.
+        """
+        base_reserve = pool.reserves.get(info.base_mint)
+        quote_reserve = pool.reserves.get(info.quote_mint)
+        if not base_reserve or not quote_reserve:
+            sell = buy = scale.price_from_decimal(pool.price_mid)
+        elif scale.fixed:
+            base_reserve = int(Decimal(base_reserve).scaleb(info.base_decimals))
+            quote_reserve = int(Decimal(quote_reserve).scaleb(info.quote_decimals))
+            base_size = int(size.scaleb(info.base_decimals))
+            # Quote units per base unit, rescaled to quote per base at the price scale
+            decimals = info.base_decimals - info.quote_decimals + scale.price_decimals
+            _, sell, _ = PoolMath.constant_product_quote_fixed(base_reserve, quote_reserve, base_size, 0, decimals)
+            try:
+                _, buy = PoolMath.constant_product_quote_exact_out_fixed(
+                    quote_reserve, base_reserve, base_size, 0, decimals
+                )
+            except ValueError:
+                buy = None  # Pool cannot supply the size
+        else:
+            base_reserve, quote_reserve = Decimal(base_reserve), Decimal(quote_reserve)
+            _, sell_price, _ = PoolMath.constant_product_quote(base_reserve, quote_reserve, size, 0)
+            sell = scale.price_from_decimal(sell_price)
+            try:
+                _, buy_price, _ = PoolMath.constant_product_quote_exact_out(quote_reserve, base_reserve, size, 0)
+                buy = scale.price_from_decimal(buy_price)
+            except ValueError:
+                buy = None  # Pool cannot supply the size
+        return sell, buy
+    
+    def _size_opportunity(self, opportunity: Opportunity, scale):
+        """Resize to the PnL-maximizing size against the pool curve and CEX depth.
+        
+        Without pool reserves the curve is unknown: the probe size
+        (base_size) is kept, capped at max_position_size_usd, with its CEX
+        price re-walked if capped. When no size is profitable after fees
+        the size is 0 and the executor skips the opportunity. spread_pct and
+        predicted_pnl_pct stay the probe-size screening values.
+        """
+        cap = Decimal(str(settings.max_position_size_usd)) / opportunity.cex_price
+        opportunity.size = min(self.base_size, cap).quantize(self.size_step, rounding=ROUND_DOWN)
+        opportunity.expected_pnl_usd = None
+        
+        pool = self.dex_pools.get(opportunity.dex_pool)
+        info = self.pools.get(opportunity.dex_pool)
+        cached = self._depth_cache.get((opportunity.asset, opportunity.cex_venue))
+        if pool is None or info is None or cached is None:
+            return
+        cex_to_dex = opportunity.direction == "cex_to_dex"
+        curve = cached[2] if cex_to_dex else cached[1]
+        base_reserve = pool.reserves.get(info.base_mint)
+        quote_reserve = pool.reserves.get(info.quote_mint)
+        if not base_reserve or not quote_reserve:
+            if opportunity.size < self.base_size:
+                cex_price = curve.vwap(scale.size_from_decimal(opportunity.size))
+                opportunity.cex_price = scale.price_to_decimal(cex_price)
+            return
+        
+        prices = [float(scale.price_to_decimal(p)) for p in curve.prices]
+        cum_sizes = [float(scale.size_to_decimal(s)) for s in curve.cum_sizes]
+        sized = optimal_size(
+            opportunity.direction, prices, np.diff(cum_sizes, prepend=0.0),
+            float(base_reserve), float(quote_reserve), pool.fee_bps,
+            float(self.venue_fee_pct(opportunity.cex_venue)),
+            settings.max_position_size_usd
+        )
+        size = ZERO if sized is None else Decimal(sized.size).quantize(self.size_step, rounding=ROUND_DOWN)
+        if size <= 0:
+            opportunity.size = ZERO  # Unprofitable at any size
+            return
+        
+        # Leg prices at that size, exactly as the engine prices the probe size
+        cex_price = curve.vwap(scale.size_from_decimal(size))
+        sell, buy = self._dex_prices(pool, info, size, scale)
+        dex_price = sell if cex_to_dex else buy
+        if cex_price is None or dex_price is None:
+            opportunity.size = ZERO
+            return
+        opportunity.size = size
+        opportunity.cex_price = scale.price_to_decimal(cex_price)
+        opportunity.dex_price = scale.price_to_decimal(dex_price)
+        opportunity.expected_pnl_usd = Decimal(sized.pnl).quantize(CENT)
     
     async def _evaluate_opportunity(
         self,
         asset: str,
         direction: str,
+        cex_venue: str,
+        dex_pool: str,
         cex_price: Decimal,
         dex_price: Decimal,
-        spread_pct: Decimal
+        spread_pct: Decimal,
+        stamps: Optional[Dict[str, int]] = None
     ):
-        """Evaluate if opportunity meets threshold."""
-        # Apply fees and slippage haircut
-        cex_fee_pct = Decimal("0.35")  # Gemini taker fee ~0.35%
-        dex_fee_pct = Decimal("0.30")  # Typical DEX fee 0.30%
-        haircut_pct = Decimal("0.75")  # Slippage/impact haircut
+        """Open, update or close the (asset, direction) spread episode."""
+        stamps = stamp(copy_stamps(stamps), "signal_evaluated", self.clock)
         
-        total_costs = cex_fee_pct + dex_fee_pct + haircut_pct
+        # Apply fees and slippage haircut
+        total_costs = self.venue_fee_pct(cex_venue) + self.dex_fee_pct + self.haircut_pct
         predicted_pnl_pct = spread_pct - total_costs
         
-        # Check threshold
-        # For production demo: Accept negative PnL to show realistic spreads
-        # Production: Use 1.0% threshold to ensure profitability
-        threshold_pct = Decimal("-1.0")  # Accept any spread for demo
+        key = (asset, direction)
+        opportunity = self.open_opportunities.get(key)
+        
+        if opportunity is None:
+            # Check threshold
+            if predicted_pnl_pct < self.threshold_pct:
+                return
+            
+            # Opportunity detected!
+            window = self.window_manager.get_or_create_window(asset)
+            
+            opportunity = self.open_opportunities[key] = Opportunity(
+                id=self.id_factory(),
+                asset=asset,
+                direction=direction,
+                cex_venue=cex_venue,
+                cex_symbol=self.symbols.venue_symbol(asset, cex_venue),
+                dex_pool=dex_pool,
+                cex_price=cex_price,
+                dex_price=dex_price,
+                spread_pct=spread_pct,
+                predicted_pnl_pct=predicted_pnl_pct,
+                size=self.base_size,
+                timestamp=self.clock.now(),
+                window_id=window.id,
+                peak_spread_pct=spread_pct
+            )
+            self._size_opportunity(opportunity, scale_for(asset, self.fixed_point))
+            self._emitted_pnl[key] = predicted_pnl_pct
+            self.window_manager.record_opportunity(opportunity)
+            
+            logger.info(
+                "Opportunity open: %s %s spread=%.2f%% predicted_pnl=%.2f%%",
+                asset, direction, spread_pct, predicted_pnl_pct
+            )
+            opportunity.stamps = stamp(stamps, "opportunity_emitted", self.clock)
+            await self.bus.publish("signal.opportunity", opportunity.model_copy())
+            return
         
-        if predicted_pnl_pct < threshold_pct:
+        # Hysteresis: stay open until PnL falls clearly below the open threshold
+        if predicted_pnl_pct < self.threshold_pct - self.hysteresis_pct:
+            await self._close_opportunity(asset, direction)
             return
         
-        # Opportunity detected!
-        window = self.window_manager.get_or_create_window(asset)
-        window.signals += 1
-        
-        opportunity = Opportunity(
-            id=str(uuid.uuid4()),
-            asset=asset,
-            direction=direction,
-            cex_price=cex_price,
-            dex_price=dex_price,
-            spread_pct=spread_pct,
-            predicted_pnl_pct=predicted_pnl_pct,
-            size=Decimal("50"),  # Base size, will be adjusted by executor
-            timestamp=datetime.now(timezone.utc),
-            window_id=window.id
-        )
+        opportunity.cex_venue = cex_venue
+        opportunity.cex_symbol = self.symbols.venue_symbol(asset, cex_venue)
+        opportunity.dex_pool = dex_pool
+        opportunity.cex_price = cex_price
+        opportunity.dex_price = dex_price
+        opportunity.spread_pct = spread_pct
+        opportunity.predicted_pnl_pct = predicted_pnl_pct
+        opportunity.peak_spread_pct = max(opportunity.peak_spread_pct, spread_pct)
+        opportunity.updates += 1
+        self._size_opportunity(opportunity, scale_for(asset, self.fixed_point))
+        
+        # Emit only material changes
+        if abs(predicted_pnl_pct - self._emitted_pnl[key]) >= self.material_change_pct:
+            self._emitted_pnl[key] = predicted_pnl_pct
+            opportunity.state = OpportunityState.UPDATED
+            self.window_manager.record_opportunity(opportunity)
+            opportunity.stamps = stamp(stamps, "opportunity_emitted", self.clock)
+            await self.bus.publish("signal.opportunity", opportunity.model_copy())
+    
+    async def _close_opportunity(self, asset: str, direction: str):
+        """Close the (asset, direction) episode if one is open."""
+        key = (asset, direction)
+        opportunity = self.open_opportunities.pop(key, None)
+        if opportunity is None:
+            return
+        del self._emitted_pnl[key]
         
+        opportunity.state = OpportunityState.CLOSED
+        opportunity.closed_ts = self.clock.now()
         logger.info(
-            f"Opportunity: {asset} {direction} spread={spread_pct:.2f}% "
-            f"predicted_pnl={predicted_pnl_pct:.2f}%"
+            "Opportunity closed: %s %s peak_spread=%.2f%% after %d updates",
+            asset, direction, opportunity.peak_spread_pct, opportunity.updates
         )
-        
-        # Emit opportunity event
-        await event_bus.publish("signal.opportunity", opportunity)
+        await self.bus.publish("signal.opportunity", opportunity)
+
+def _to_float(scale, price) -> Optional[float]:
+    """Price in `scale` as a float for the spread matrix."""
+    return None if price is None else float(scale.price_to_decimal(price))
+
+
+def _is_empty(book: Union[BookUpdate, BookView]) -> bool:
+    """True if either side of a book event has no levels."""
+    if isinstance(book, BookView):
+        return book.best_bid is None or book.best_ask is None
+    return not book.bids or not book.asks
 
 
 # Global instance
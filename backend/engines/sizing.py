@@ -0,0 +1,139 @@
+"""PnL-maximizing trade size against a constant product pool and CEX depth.
+
+The DEX leg follows ``PoolMath.constant_product_quote`` with fee factor
+g = 1 - fee_bps / 10000 on reserves (B base, Q quote). The CEX leg walks the
+book: inside level i the marginal price is that level's price p_i, net of
+the taker fee. PnL is concave in size, so the optimum is where the pool's
+marginal price meets the book's:
+
+- cex_to_dex (buy CEX, sell x into the pool): out(x) = Q g x / (B + g x),
+  out'(x) = Q g B / (B + g x)^2 = p_i  ->  x_i = (sqrt(Q g B / p_i) - B) / g
+- dex_to_cex (buy x from the pool, sell on CEX): in(x) = Q x / (g (B - x)),
+  in'(x) = Q B / (g (B - x)^2) = p_i  ->  x_i = B - sqrt(Q B / (g p_i))
+
+Each x_i is computed for all levels at once, clipped to level i's size
+range [S_i-1, S_i], and the optimum is the clipped value at the first level
+whose x_i ends inside it (the marginal prices cross there). The result is
+capped by the book depth and a notional limit.
+
+Concentrated liquidity pools are sized on the virtual reserves of their
+current tick range (L / sqrtPrice and L * sqrtPrice, published by the Solana
+connector). The curve is exactly constant product until a trade crosses a
+tick boundary; beyond it the size is an estimate.
+"""
+from typing import NamedTuple, Optional, Sequence
+
+import numpy as np
+
+CEX_TO_DEX = "cex_to_dex"
+DEX_TO_CEX = "dex_to_cex"
+
+
+class SizeResult(NamedTuple):
+    """Optimal size (base units) and the leg prices/PnL at that size."""
+    size: float
+    cex_price: float  # CEX VWAP
+    dex_price: float  # Pool average price per base token
+    pnl: float  # Quote currency, after pool and CEX fees
+
+
+def optimal_size(
+    direction: str,
+    level_prices: Sequence[float],
+    level_sizes: Sequence[float],
+    base_reserve: float,
+    quote_reserve: float,
+    fee_bps: int,
+    cex_fee_pct: float,
+    max_notional: Optional[float] = None
+) -> Optional[SizeResult]:
+    """PnL-maximizing size for one direction, or None if no size is profitable.
+
+    Args:
+        direction: "cex_to_dex" (CEX asks given) or "dex_to_cex" (CEX bids given).
+        level_prices: CEX level prices, best first.
+        level_sizes: CEX level sizes, same order.
+        base_reserve: Pool base token reserve (B).
+        quote_reserve: Pool quote token reserve (Q).
+        fee_bps: Pool fee.
+        cex_fee_pct: CEX taker fee, percent of notional.
+        max_notional: Cap on size x CEX price, in quote currency.
+    """
+    prices = np.asarray(level_prices, dtype=float)
+    sizes = np.asarray(level_sizes, dtype=float)
+    if prices.size == 0 or base_reserve <= 0 or quote_reserve <= 0:
+        return None
+
+    g = 1.0 - fee_bps / 10000.0
+    cum = np.cumsum(sizes)
+    lower = cum - sizes
+    B, Q = base_reserve, quote_reserve
+
+    if direction == CEX_TO_DEX:
+        marginal = prices * (1.0 + cex_fee_pct / 100.0)  # Cost per base bought
+        x = (np.sqrt(Q * g * B / marginal) - B) / g
+    elif direction == DEX_TO_CEX:
+        marginal = prices * (1.0 - cex_fee_pct / 100.0)  # Proceeds per base sold
+        x = B - np.sqrt(Q * B / (g * marginal))
+    else:
+        raise ValueError(f"Unknown direction {direction!r}")
+
+    inside = x < cum
+    i = int(np.argmax(inside)) if inside.any() else len(cum) - 1
+    size = float(min(max(x[i], lower[i]), cum[i]))
+
+    if max_notional is not None:
+        size = min(size, max_notional / float(prices[0]))
+    if direction == DEX_TO_CEX:
+        size = min(size, B * 0.999)  # The pool cannot pay out its reserve
+    if size <= 0:
+        return None
+
+    result = evaluate(direction, prices, sizes, B, Q, fee_bps, cex_fee_pct, size)
+    if result is None or result.pnl <= 0:
+        return None
+    return result
+
+
+def evaluate(
+    direction: str,
+    level_prices: Sequence[float],
+    level_sizes: Sequence[float],
+    base_reserve: float,
+    quote_reserve: float,
+    fee_bps: int,
+    cex_fee_pct: float,
+    size
+):
+    """Leg prices and PnL at `size`, a scalar (SizeResult or None) or an array.
+
+    Array input evaluates a whole size grid in one pass and returns the PnL
+    array (NaN beyond the book depth).
+    """
+    prices = np.asarray(level_prices, dtype=float)
+    sizes = np.asarray(level_sizes, dtype=float)
+    x = np.asarray(size, dtype=float)
+    g = 1.0 - fee_bps / 10000.0
+    B, Q = base_reserve, quote_reserve
+
+    # CEX notional for x: full levels below plus a partial level
+    cum = np.cumsum(sizes)
+    cum_notional = np.cumsum(prices * sizes)
+    i = np.minimum(np.searchsorted(cum, x), len(cum) - 1)
+    filled = cum[i] - sizes[i]
+    notional = np.where(i > 0, cum_notional[i] - prices[i] * sizes[i], 0.0) + (x - filled) * prices[i]
+    notional = np.where(x <= cum[-1], notional, np.nan)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if direction == CEX_TO_DEX:
+            pool = Q * g * x / (B + g * x)  # Quote received
+            pnl = pool - notional * (1.0 + cex_fee_pct / 100.0)
+        else:
+            pool = np.where(x < B, Q * x / (g * (B - x)), np.nan)  # Quote paid
+            pnl = notional * (1.0 - cex_fee_pct / 100.0) - pool
+
+    if x.ndim:
+        return pnl
+    if np.isnan(pnl) or x <= 0:
+        return None
+    return SizeResult(float(x), float(notional / x), float(pool / x), float(pnl))
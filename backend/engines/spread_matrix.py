@@ -0,0 +1,135 @@
+"""Vectorized spreads across every CEX venue, DEX pool and asset.
+
+:class:`SpreadMatrix` holds the latest executable prices as float64 arrays:
+
+- CEX bid/ask per (asset, venue), at the size the signal engine evaluates
+- DEX sell/buy price per (asset, pool), plus each pool's fee
+
+:meth:`SpreadMatrix.compute` derives both directions' spread and net PnL
+(after per-venue taker fee, per-pool fee and haircut) for the whole
+asset x venue x pool cube in one NumPy pass. Missing prices are NaN and
+yield NaN spreads. Floats make this a screen: emitted opportunities are
+still priced exactly by SignalEngine.
+"""
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+import numpy as np
+
+CEX_TO_DEX = "cex_to_dex"
+DEX_TO_CEX = "dex_to_cex"
+DIRECTIONS = (CEX_TO_DEX, DEX_TO_CEX)
+
+
+class Spreads(NamedTuple):
+    """Result of one pass; arrays are (asset, venue, pool), in percent."""
+    cex_to_dex: np.ndarray
+    dex_to_cex: np.ndarray
+    cex_to_dex_net: np.ndarray
+    dex_to_cex_net: np.ndarray
+
+
+class BestSpread(NamedTuple):
+    """Best net spread for one asset."""
+    asset: str
+    direction: str
+    venue: str
+    pool: str
+    spread_pct: float
+    net_pct: float
+
+
+class SpreadMatrix:
+    """Latest CEX/DEX prices and their spread cube."""
+
+    def __init__(
+        self,
+        assets: Iterable[str],
+        venue_fees_pct: Dict[str, float],
+        haircut_pct: float = 0.0,
+        pool_capacity: int = 8
+    ):
+        self.assets: List[str] = list(assets)
+        self.venues: List[str] = list(venue_fees_pct)
+        self.pools: List[str] = []
+        self._asset_index = {asset: i for i, asset in enumerate(self.assets)}
+        self._venue_index = {venue: i for i, venue in enumerate(self.venues)}
+        self._pool_index: Dict[str, int] = {}
+        self.haircut_pct = haircut_pct
+
+        shape = (len(self.assets), len(self.venues))
+        self.cex_bid = np.full(shape, np.nan)
+        self.cex_ask = np.full(shape, np.nan)
+        self.venue_fee_pct = np.array([venue_fees_pct[v] for v in self.venues], dtype=float)
+
+        self.dex_sell = np.full((len(self.assets), pool_capacity), np.nan)
+        self.dex_buy = np.full((len(self.assets), pool_capacity), np.nan)
+        self.pool_fee_pct = np.zeros(pool_capacity)
+
+    def update_cex(self, asset: str, venue: str, bid: Optional[float], ask: Optional[float]) -> None:
+        """Set a venue's executable bid/ask; None for a side it cannot fill."""
+        a, v = self._asset_index[asset], self._venue_index[venue]
+        self.cex_bid[a, v] = np.nan if bid is None else bid
+        self.cex_ask[a, v] = np.nan if ask is None else ask
+
+    def update_dex(
+        self, asset: str, pool: str, sell: Optional[float], buy: Optional[float], fee_bps: int
+    ) -> None:
+        """Set a pool's executable sell/buy prices for `asset`."""
+        a, p = self._asset_index[asset], self._pool_column(pool)
+        self.dex_sell[a, p] = np.nan if sell is None else sell
+        self.dex_buy[a, p] = np.nan if buy is None else buy
+        self.pool_fee_pct[p] = fee_bps / 100
+
+    def remove_cex(self, asset: str, venue: str) -> None:
+        self.update_cex(asset, venue, None, None)
+
+    def compute(self) -> Spreads:
+        """Spread and net PnL cubes for both directions."""
+        n = len(self.pools)
+        bid = self.cex_bid[:, :, None]
+        ask = self.cex_ask[:, :, None]
+        sell = self.dex_sell[:, None, :n]
+        buy = self.dex_buy[:, None, :n]
+        costs = self.venue_fee_pct[None, :, None] + self.pool_fee_pct[None, None, :n] + self.haircut_pct
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cex_to_dex = (sell - ask) / ask * 100
+            dex_to_cex = (bid - buy) / buy * 100
+        return Spreads(cex_to_dex, dex_to_cex, cex_to_dex - costs, dex_to_cex - costs)
+
+    def best(self, spreads: Optional[Spreads] = None) -> List[BestSpread]:
+        """Best net spread per asset that has any priced pair."""
+        spreads = spreads or self.compute()
+        # (asset, direction, venue, pool) flattened per asset; NaN never wins
+        net = np.stack([spreads.cex_to_dex_net, spreads.dex_to_cex_net], axis=1)
+        gross = np.stack([spreads.cex_to_dex, spreads.dex_to_cex], axis=1)
+        flat = np.where(np.isnan(net), -np.inf, net).reshape(len(self.assets), -1)
+        if flat.shape[1] == 0:
+            return []
+        cells = flat.argmax(axis=1)
+
+        results = []
+        for a in np.flatnonzero(np.isfinite(flat[np.arange(len(cells)), cells])):
+            d, v, p = np.unravel_index(cells[a], net.shape[1:])
+            results.append(BestSpread(
+                self.assets[a], DIRECTIONS[d], self.venues[v], self.pools[p],
+                float(gross[a, d, v, p]), float(net[a, d, v, p])
+            ))
+        return results
+
+    def _pool_column(self, pool: str) -> int:
+        column = self._pool_index.get(pool)
+        if column is None:
+            column = self._pool_index[pool] = len(self.pools)
+            self.pools.append(pool)
+            if column == self.dex_sell.shape[1]:
+                self._grow()
+        return column
+
+    def _grow(self) -> None:
+        """Double the pool capacity."""
+        capacity = self.dex_sell.shape[1]
+        pad = np.full((len(self.assets), capacity), np.nan)
+        self.dex_sell = np.hstack([self.dex_sell, pad])
+        self.dex_buy = np.hstack([self.dex_buy, pad.copy()])
+        self.pool_fee_pct = np.concatenate([self.pool_fee_pct, np.zeros(capacity)])
@@ -0,0 +1,73 @@
+"""Tick-to-trade stage timestamps.
+
+Events carry ``stamps``: monotonic nanosecond times keyed by stage, added as
+a market data frame becomes a book event, an opportunity and finally a
+trade. Connectors stamp with ``time.monotonic_ns`` and engines with their
+clock's ``monotonic_ns``, which is the same source on the system clock.
+
+Stamps are shared by every subscriber of an event, so stages after the bus
+are recorded on a copy. When a trade completes, :func:`breakdown` turns its
+stamps into per-stage durations stored with the trade, and :func:`observe`
+feeds them to the per-stage and end-to-end histograms.
+"""
+from typing import Dict, Optional
+
+from shared.clock import Clock, system_clock
+from observability.metrics import pipeline_stage_seconds, trade_latency_seconds
+
+# Pipeline order; leg stages follow the order the legs are sent in
+STAGES = (
+    "frame_received",
+    "decoded",
+    "book_applied",
+    "bus_published",
+    "signal_evaluated",
+    "opportunity_emitted",
+    "execution_started",
+    "cex_sent",
+    "cex_acked",
+    "dex_sent",
+    "dex_acked",
+)
+_ORDER = {stage: i for i, stage in enumerate(STAGES)}
+
+
+def stamp(stamps: Dict[str, int], stage: str, clock: Clock = system_clock) -> Dict[str, int]:
+    """Record `stage` at the clock's monotonic time and return `stamps`."""
+    stamps[stage] = clock.monotonic_ns()
+    return stamps
+
+
+def copy_stamps(stamps: Optional[Dict[str, int]]) -> Dict[str, int]:
+    """Private copy of an event's stamps (empty if it carries none)."""
+    return dict(stamps) if stamps else {}
+
+
+def breakdown(stamps: Dict[str, int]) -> Dict[str, float]:
+    """Milliseconds from the previous stage to each stage, plus ``total``.
+
+    The first stage present is the origin (0.0); for a replayed or
+    REST-sourced event that is wherever the stamps start.
+    """
+    ordered = sorted(stamps.items(), key=lambda item: (item[1], _ORDER.get(item[0], len(STAGES))))
+    if not ordered:
+        return {}
+    result = {}
+    previous = ordered[0][1]
+    for stage, ns in ordered:
+        result[stage] = (ns - previous) / 1e6
+        previous = ns
+    result["total"] = (ordered[-1][1] - ordered[0][1]) / 1e6
+    return result
+
+
+def observe(stamps: Dict[str, int], asset: str) -> Dict[str, float]:
+    """Observe a completed trade's stages; returns its :func:`breakdown`."""
+    result = breakdown(stamps)
+    if not result:
+        return result
+    # Skip the origin (always 0) and the total
+    for stage, ms in list(result.items())[1:-1]:
+        pipeline_stage_seconds.labels(stage=stage).observe(ms / 1000)
+    trade_latency_seconds.labels(asset=asset).observe(result["total"] / 1000)
+    return result
@@ -0,0 +1,178 @@
+"""Process-wide logging: queue-backed handlers, hot-path rate limiting, JSON output.
+
+``configure_logging()`` replaces ``logging.basicConfig`` in the entry points.
+Callers keep using ``logging.getLogger(__name__)``; what changes is where the
+cost lands:
+
+- The root logger gets a single ``QueueHandler``. A record is put on an
+  in-memory queue as is, and a ``QueueListener`` thread formats and writes
+  it, so the event loop never blocks on a stream or does the formatting.
+- ``RateLimitFilter`` runs before the queue and caps repetitive INFO/DEBUG
+  records per call site (logger name + message template). Records over the
+  limit are dropped; the next one let through carries the count.
+- Output is the usual text line or one JSON object per line.
+
+Messages are formatted on the listener thread, so hot-path calls should use
+lazy ``%``-style arguments with immutable values (ints, strings, Decimals).
+"""
+import atexit
+import json
+import logging
+import queue
+import sys
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener: Optional[QueueListener] = None
+
+
+class RateLimitFilter(logging.Filter):
+    """Token bucket per call site for records below WARNING.
+
+    Each call site (source file and line) may emit `burst` records at once
+    and `rate` per second on average; keying by site rather than message
+    also throttles f-string calls and keeps one bucket per logging line. Dropped records are counted and reported
+    as ``record.suppressed`` on the next record that passes for that key.
+    """
+
+    def __init__(self, rate: float = 10.0, burst: int = 20, clock=time.monotonic):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        # key -> [tokens, last refill time, suppressed count]
+        self._buckets: Dict[Tuple[str, int], list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.rate <= 0:
+            return True
+
+        key = (record.pathname, record.lineno)
+        now = self.clock()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [float(self.burst), now, 0]
+        else:
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+
+        if bucket[0] < 1:
+            bucket[2] += 1
+            return False
+
+        bucket[0] -= 1
+        if bucket[2]:
+            record.suppressed = bucket[2]
+            bucket[2] = 0
+        return True
+
+
+class DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread.
+
+    The stdlib handler formats the message in ``prepare()``, i.e. on the
+    calling thread; here the record is queued untouched.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class TextFormatter(logging.Formatter):
+    """The classic text line, with the suppressed count appended."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            text += f" [{suppressed} similar suppressed]"
+        return text
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: ts, level, logger, msg (+ suppressed, exc)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            entry["suppressed"] = suppressed
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def build_formatter(fmt: str) -> logging.Formatter:
+    """Formatter by name: "text" or "json".
+
+    Raises:
+        ValueError: If `fmt` is not a known format.
+    """
+    if fmt == "text":
+        return TextFormatter(TEXT_FORMAT)
+    if fmt == "json":
+        return JsonFormatter()
+    raise ValueError(f"Unknown log format {fmt!r}, expected text/json")
+
+
+def configure_logging(
+    level: Optional[str] = None,
+    fmt: Optional[str] = None,
+    use_queue: Optional[bool] = None,
+    rate: Optional[float] = None,
+    burst: Optional[int] = None,
+    stream=None
+) -> Optional[QueueListener]:
+    """Install the root handler; arguments default to the LOG_* settings.
+
+    Returns the running listener in queue mode (stopped at exit, or by
+    :func:`shutdown_logging`), else None.
+    """
+    from config import settings
+
+    global _listener
+    shutdown_logging()
+
+    level = level or settings.log_level
+    fmt = fmt or settings.log_format
+    use_queue = settings.log_queue if use_queue is None else use_queue
+    rate = settings.log_rate_limit_per_sec if rate is None else rate
+    burst = settings.log_rate_limit_burst if burst is None else burst
+
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(build_formatter(fmt))
+
+    if use_queue:
+        handler = DeferredQueueHandler(queue.SimpleQueue())
+        _listener = QueueListener(handler.queue, output, respect_handler_level=True)
+        _listener.start()
+    else:
+        handler = output
+    handler.addFilter(RateLimitFilter(rate, burst))
+
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level.upper())
+    return _listener
+
+
+def shutdown_logging():
+    """Stop the listener, writing out every queued record."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
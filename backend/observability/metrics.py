@@ -40,6 +40,14 @@ trade_latency_seconds = Histogram(
     buckets=[0.1, 0.25, 0.5, 0.7, 1.0, 1.5, 2.0, 3.0]
 )
 
+pipeline_stage_seconds = Histogram(
+    'arb_pipeline_stage_seconds',
+    'Time from the previous tick-to-trade stage until this one, per traded opportunity',
+    ['stage'],
+    registry=registry,
+    buckets=[0.00001, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0]
+)
+
 # Staleness
 ws_staleness_seconds = Gauge(
     'arb_ws_staleness_seconds',
@@ -48,6 +56,46 @@ ws_staleness_seconds = Gauge(
     registry=registry
 )
 
+# Order book consistency
+book_gaps_total = Counter(
+    'arb_book_gaps_total',
+    'Order books invalidated pending a fresh snapshot',
+    ['venue', 'reason'],
+    registry=registry
+)
+
+book_resync_seconds = Histogram(
+    'arb_book_resync_seconds',
+    'Time from book invalidation until a consistent snapshot is applied',
+    ['venue'],
+    registry=registry,
+    buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+)
+
+# WebSocket reconnects
+ws_reconnects_total = Counter(
+    'arb_ws_reconnects_total',
+    'WebSocket reconnect attempts after a dropped or failed connection',
+    ['venue'],
+    registry=registry
+)
+
+ws_time_to_first_update_seconds = Histogram(
+    'arb_ws_time_to_first_update_seconds',
+    'Time from losing a WebSocket connection until the first book update on the new one',
+    ['venue'],
+    registry=registry,
+    buckets=[0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0]
+)
+
+# Signal evaluation
+signal_evaluations_total = Counter(
+    'arb_signal_evaluations_total',
+    'Market data events reaching opportunity checks, evaluated or skipped as unchanged',
+    ['asset', 'result'],
+    registry=registry
+)
+
 # Risk
 risk_paused = Gauge(
     'arb_risk_paused',
@@ -55,6 +103,13 @@ risk_paused = Gauge(
     registry=registry
 )
 
+pause_propagation_seconds = Histogram(
+    'arb_pause_propagation_seconds',
+    'Time from kill-switch trigger until every pause handler has acknowledged',
+    registry=registry,
+    buckets=[0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05, 0.1]
+)
+
 daily_pnl_usd = Gauge(
     'arb_daily_pnl_usd',
     'Daily cumulative PnL',
@@ -69,6 +124,29 @@ connection_status = Gauge(
     registry=registry
 )
 
+# Event bus
+event_handler_duration_seconds = Histogram(
+    'arb_event_handler_duration_seconds',
+    'Event handler execution time',
+    ['topic', 'handler'],
+    registry=registry,
+    buckets=[0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0]
+)
+
+event_handler_errors_total = Counter(
+    'arb_event_handler_errors_total',
+    'Exceptions raised by event handlers',
+    ['topic', 'handler', 'exception'],
+    registry=registry
+)
+
+event_handler_slow_total = Counter(
+    'arb_event_handler_slow_total',
+    'Event handler calls exceeding the slow-handler threshold',
+    ['topic', 'handler'],
+    registry=registry
+)
+
 
 def get_metrics() -> bytes:
     """Get Prometheus metrics."""
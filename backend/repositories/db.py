@@ -3,6 +3,7 @@ import logging
 from typing import List, Optional
 from datetime import datetime
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import UpdateOne
 
 from config import settings
 from shared.types import Trade, Opportunity, Window, InventorySnapshot
@@ -80,6 +81,14 @@ class OpportunityRepository:
         result = await self.collection.insert_one(doc)
         return str(result.inserted_id)
     
+    async def upsert(self, opp: Opportunity):
+        """Insert or replace an opportunity by id (one document per episode)."""
+        await self.collection.update_one(
+            {"id": opp.id},
+            {"$set": opp.model_dump(mode="json")},
+            upsert=True
+        )
+    
     async def find_recent(self, limit: int = 100) -> List[Opportunity]:
         """Find recent opportunities."""
         cursor = self.collection.find().sort("timestamp", -1).limit(limit)
@@ -107,6 +116,15 @@ class WindowRepository:
             upsert=True
         )
     
+    async def upsert_many(self, windows: List[Window]):
+        """Upsert windows by id in one bulk write."""
+        if not windows:
+            return
+        await self.collection.bulk_write(
+            [UpdateOne({"id": w.id}, {"$set": w.model_dump(mode="json")}, upsert=True) for w in windows],
+            ordered=False
+        )
+    
     async def find_by_asset(self, asset: str, limit: int = 50) -> List[Window]:
         """Find windows for asset."""
         cursor = self.collection.find({"asset": asset}).sort("start_ts", -1).limit(limit)
@@ -1,6 +1,7 @@
 """FastAPI gateway server - REST API + WebSocket."""
 import asyncio
 import logging
+from operator import attrgetter
 from contextlib import asynccontextmanager
 from typing import List, Optional
 from datetime import datetime, timezone
@@ -13,7 +14,10 @@ from slowapi.errors import RateLimitExceeded
 
 from config import settings
 from shared.types import Trade, Opportunity
-from shared.events import event_bus
+from shared.events import event_bus, BackpressurePolicy
+from shared.transport import build_transport
+from observability.logging_setup import configure_logging
+from shared.journal import EventJournal
 import repositories.db as db_module
 from connectors.gemini_connector import gemini_connector
 from connectors.coinbase_connector import init_coinbase_connector
@@ -26,10 +30,7 @@ from auth.routes import router as auth_router
 from auth.dependencies import require_admin, require_operator, get_current_user_or_api_key
 from auth.repository import user_repo
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 # Rate limiting
@@ -41,14 +42,26 @@ active_connections: List[WebSocket] = []
 # Global reference for Coinbase connector
 coinbase_connector = None
 
+# Event journal (enabled via EVENT_JOURNAL_ENABLED)
+event_journal: Optional[EventJournal] = None
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
-    global coinbase_connector
+    global coinbase_connector, event_journal
     
     logger.info("Starting arbitrage application...")
     
+    # Record bus traffic before any producer starts
+    if settings.event_journal_enabled:
+        event_journal = EventJournal(
+            settings.event_journal_dir,
+            segment_bytes=settings.event_journal_segment_mb * 1024 * 1024
+        )
+        event_journal.start()
+        event_bus.add_tap(event_journal.record)
+    
     # Initialize Coinbase connector
     coinbase_connector = init_coinbase_connector()
     
@@ -61,28 +74,37 @@ async def lifespan(app: FastAPI):
         logger.warning(f"Created default admin user: {default_admin.username} / admin123")
         logger.warning("CHANGE DEFAULT PASSWORD IMMEDIATELY!")
     
+    # Start cross-process event transport (no-op for the in-process default)
+    transport = build_transport(
+        settings.event_transport,
+        settings.event_transport_listen,
+        settings.transport_peers
+    )
+    event_bus.set_transport(transport, settings.transport_topics)
+    await transport.start(event_bus)
+    
     # Start background tasks
     tasks = [
-        asyncio.create_task(gemini_connector.connect_public_ws(["solusd", "btcusd", "ethusd"])),
-        # Solana pool monitoring with real Orca Whirlpool SOL/USDC address
-        asyncio.create_task(solana_connector.subscribe_pool_updates(["HJPjoWUrhoZzkNfRpHuieeFk9WcZWjwy6PBjZ81ngndJ"])),
-        asyncio.create_task(monitor_system_status())
+        asyncio.create_task(monitor_system_status()),
+        # Closes windows on time and batches them into Mongo
+        asyncio.create_task(signal_engine.window_manager.run(db_module.window_repo)),
     ]
     
+    if settings.run_connectors:
+        tasks += [
+            asyncio.create_task(gemini_connector.connect_public_ws(["solusd", "btcusd", "ethusd"])),
+            # Every registered Whirlpool (the account layout the connector parses)
+            asyncio.create_task(solana_connector.subscribe_pool_updates(solana_connector.registry.addresses("whirlpool"))),
+        ]
+    else:
+        logger.info("Venue connectors run in a separate bus_worker process")
+    
     # Add Coinbase connector task if enabled
-    if coinbase_connector:
+    if coinbase_connector and settings.run_connectors:
         logger.info("Starting Coinbase Advanced connector...")
-        # Create connection task
-        asyncio.create_task(coinbase_connector.connect_public_ws())
-        
-        # Wait for connection to establish
-        await asyncio.sleep(2)
-        
-        # Now subscribe to products
-        await coinbase_connector.subscribe_orderbook("SOL-USD")
-        await coinbase_connector.subscribe_orderbook("BTC-USD")
-        await coinbase_connector.subscribe_orderbook("ETH-USD")
-        logger.info("✅ Coinbase connector started and subscribed")
+        # Supervised: connects, subscribes all products and reconnects on drops
+        tasks.append(asyncio.create_task(coinbase_connector.run(["SOL-USD", "BTC-USD", "ETH-USD"])))
+        execution_engine.cex_connectors["coinbase"] = coinbase_connector
     else:
         logger.info("Coinbase connector disabled or not initialized")
     
@@ -94,6 +116,16 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down...")
     for task in tasks:
         task.cancel()
+    try:
+        await signal_engine.window_manager.flush(db_module.window_repo)
+    except Exception as e:
+        logger.error(f"Final window flush failed: {e}")
+    if coinbase_connector:
+        await coinbase_connector.close()
+    await transport.stop()
+    await event_bus.stop()
+    if event_journal:
+        event_journal.close()
 
 
 app = FastAPI(
@@ -163,7 +195,40 @@ async def get_status(request: Request):
         "version": "1.0.0",
         "connections": connections,
         "risk": risk_service.get_status(),
-        "event_stats": event_bus.get_stats()
+        "event_stats": event_bus.get_stats(),
+        "event_queues": event_bus.get_queue_stats(),
+        "event_transport": event_bus.get_transport_stats(),
+        "event_journal": event_journal.get_stats() if event_journal else None
+    }
+
+
+@app.get("/api/v1/books/{venue}/{pair}")
+@limiter.limit("200/minute")
+async def get_order_book(request: Request, venue: str, pair: str, depth: int = 10) -> dict:
+    """Get the top of a CEX order book with cumulative depth (rate limit: 200/min)."""
+    books = {"gemini": gemini_connector.order_books}
+    if coinbase_connector:
+        books["coinbase"] = coinbase_connector.books
+    
+    book = books.get(venue, {}).get(pair)
+    if book is None:
+        raise HTTPException(status_code=404, detail=f"No order book for {venue} {pair}")
+    return book.to_dict(depth)
+
+
+@app.get("/api/v1/spreads")
+@limiter.limit("200/minute")
+async def get_spreads(request: Request) -> dict:
+    """Best net spread per asset across all CEX venues and DEX pools (rate limit: 200/min)."""
+    matrix = signal_engine.spread_matrix
+    if matrix is None:
+        raise HTTPException(status_code=404, detail="Spread matrix disabled (SPREAD_MATRIX_ENABLED)")
+    
+    best = matrix.best(signal_engine.spreads) if signal_engine.spreads else []
+    return {
+        "venues": matrix.venues,
+        "pools": matrix.pools,
+        "best": [b._asdict() for b in best]
     }
 
 
@@ -380,10 +445,10 @@ async def broadcast_opportunity(opp: Opportunity):
         "data": opp.model_dump(mode="json")
     })
     
-    # Also persist opportunity
+    # Also persist opportunity; open, update and close events share one document
     if db_module.opportunity_repo:
-        await db_module.opportunity_repo.insert(opp)
-        logger.info(f"Opportunity persisted: {opp.asset} {opp.direction} {opp.predicted_pnl_pct}%")
+        await db_module.opportunity_repo.upsert(opp)
+        logger.info(f"Opportunity {opp.state.value}: {opp.asset} {opp.direction} {opp.predicted_pnl_pct}%")
 
 
 async def broadcast_trade(trade: Trade):
@@ -397,6 +462,15 @@ async def broadcast_trade(trade: Trade):
         await db_module.trade_repo.insert(trade)
 
 
+event_bus.configure_instrumentation(settings.event_handler_slow_ms, settings.event_handler_sample_every)
+
+# Queued dispatch: feed readers never wait on signal evaluation, persistence or UI fan-out
+# Market data is conflated: slow consumers see only the newest book per (venue, pair) / pool
+event_bus.configure_topic("cex.bookUpdate", BackpressurePolicy.CONFLATE, key=attrgetter("venue", "pair"))
+event_bus.configure_topic("dex.poolUpdate", BackpressurePolicy.CONFLATE, key=attrgetter("pool"))
+event_bus.configure_topic("signal.opportunity", BackpressurePolicy.DROP_OLDEST, settings.event_queue_maxsize)
+event_bus.configure_topic("trade.completed", BackpressurePolicy.BLOCK, settings.event_queue_maxsize)
+
 event_bus.subscribe("signal.opportunity", broadcast_opportunity)
 event_bus.subscribe("trade.completed", broadcast_trade)
 
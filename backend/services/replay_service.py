@@ -0,0 +1,205 @@
+"""Deterministic replay of recorded market data through the trading engines.
+
+Feeds journaled ``cex.bookUpdate`` / ``dex.poolUpdate`` events into fresh
+SignalEngine, ExecutionEngine (simulated fills) and RiskService instances on
+a private event bus, driven by a virtual clock set from each record's
+wall-clock timestamp. Identifiers and simulated slippage/latency come from
+seeded generators, so two runs over the same journal with the same
+parameters produce identical opportunities, trades and windows.
+
+Usage (from backend/):
+    python -m services.replay_service journal/ --speed max
+    python -m services.replay_service journal/ --speed 10 --threshold 0.5 --cex-fee 0.25
+"""
+import argparse
+import asyncio
+import hashlib
+import itertools
+import json
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+
+from shared.clock import VirtualClock
+from shared.events import EventBus
+from shared.journal import JournalRecord, read_journal
+from shared.types import Opportunity, Trade
+from engines.signal_engine import SignalEngine
+from engines.execution_engine import ExecutionEngine
+from services.risk_service import RiskService
+
+logger = logging.getLogger(__name__)
+
+MARKET_DATA_TOPICS = ("cex.bookUpdate", "dex.poolUpdate")
+
+
+class ReplayResult:
+    """Output of a replay run."""
+
+    def __init__(self):
+        self.events_replayed = 0
+        self.opportunities: List[Opportunity] = []
+        self.trades: List[Trade] = []
+        self.windows: List[dict] = []
+        self.risk: dict = {}
+        self.wall_seconds = 0.0
+        self.virtual_seconds = 0.0
+
+    def to_dict(self) -> dict:
+        """Serializable view of the results (without wall-time measurements)."""
+        return {
+            "events_replayed": self.events_replayed,
+            "virtual_seconds": self.virtual_seconds,
+            "opportunities": [o.model_dump(mode="json") for o in self.opportunities],
+            "trades": [t.model_dump(mode="json") for t in self.trades],
+            "windows": self.windows,
+            "risk": self.risk
+        }
+
+    def fingerprint(self) -> str:
+        """Hash of the results; equal for identical runs."""
+        payload = json.dumps(self.to_dict(), sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def summary(self) -> dict:
+        """Aggregate statistics for comparing parameter sets."""
+        pnl = sum((t.pnl_abs for t in self.trades), Decimal("0"))
+        return {
+            "events_replayed": self.events_replayed,
+            "opportunities": len(self.opportunities),
+            "trades": len(self.trades),
+            "windows": len(self.windows),
+            "total_pnl_usd": float(pnl),
+            "virtual_seconds": round(self.virtual_seconds, 3),
+            "wall_seconds": round(self.wall_seconds, 3),
+            "speedup": round(self.virtual_seconds / self.wall_seconds, 1) if self.wall_seconds else None,
+            "fingerprint": self.fingerprint()
+        }
+
+
+class ReplayRunner:
+    """Replays recorded market data through isolated engine instances."""
+
+    def __init__(
+        self,
+        records: Iterable[JournalRecord],
+        speed: Optional[float] = None,
+        seed: int = 0,
+        signal_params: Optional[Dict[str, Decimal]] = None
+    ):
+        """
+        Args:
+            records: Journal records in recorded order.
+            speed: Playback multiplier (1.0 = real time); None replays at max speed.
+            seed: Seed for simulated fills.
+            signal_params: SignalEngine attribute overrides, e.g.
+                {"threshold_pct": Decimal("0.5"), "cex_fee_pct": Decimal("0.25")}.
+        """
+        self.records = records
+        self.speed = speed
+        self.seed = seed
+        self.signal_params = signal_params or {}
+
+    async def run(self) -> ReplayResult:
+        """Replay all records and collect the engine output."""
+        result = ReplayResult()
+        records = iter(self.records)
+        first = next((r for r in records if r.event_type in MARKET_DATA_TOPICS), None)
+        if first is None:
+            return result
+
+        start = _record_time(first)
+        clock = VirtualClock(start)
+        counter = itertools.count(1)
+        ids = lambda: f"replay-{next(counter):08d}"
+
+        bus = EventBus()
+        signal = SignalEngine(bus=bus, clock=clock, id_factory=ids)
+        for name, value in self.signal_params.items():
+            setattr(signal, name, value)
+        execution = ExecutionEngine(
+            bus=bus, clock=clock, rng=random.Random(self.seed), id_factory=ids, observe_only=True
+        )
+        risk = RiskService(bus=bus, clock=clock)
+
+        async def collect_opportunity(opp: Opportunity):
+            result.opportunities.append(opp)
+
+        async def collect_trade(trade: Trade):
+            result.trades.append(trade)
+
+        bus.subscribe("signal.opportunity", collect_opportunity)
+        bus.subscribe("trade.completed", collect_trade)
+
+        wall_start = time.perf_counter()
+        previous = start
+        for record in itertools.chain([first], records):
+            if record.event_type not in MARKET_DATA_TOPICS:
+                continue
+            when = _record_time(record)
+            if self.speed and when > previous:
+                await asyncio.sleep((when - previous).total_seconds() / self.speed)
+            previous = max(previous, when)
+            clock.advance_to(when)
+            await bus.publish(record.event_type, record.data)
+            result.events_replayed += 1
+
+        result.wall_seconds = time.perf_counter() - wall_start
+        result.virtual_seconds = (clock.now() - start).total_seconds()
+
+        manager = signal.window_manager
+        windows = list(manager.windows.values()) + [w for w in manager.current_window.values() if w]
+        result.windows = [w.model_dump(mode="json") for w in windows]
+        result.risk = {
+            "is_paused": risk.is_paused,
+            "pause_reason": risk.pause_reason,
+            "daily_pnl_usd": float(risk.daily_pnl),
+            "daily_trades": risk.daily_trades
+        }
+        return result
+
+
+def _record_time(record: JournalRecord) -> datetime:
+    """Recorded publish time of a journal record."""
+    return datetime.fromtimestamp(record.wall_ns / 1e9, tz=timezone.utc)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded event journal through the engines")
+    parser.add_argument("journal", help="Event journal directory")
+    parser.add_argument("--speed", default="max", help="Playback speed multiplier, or 'max'")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for simulated fills")
+    parser.add_argument("--threshold", type=Decimal, help="Override predicted PnL threshold (%%)")
+    parser.add_argument("--cex-fee", type=Decimal, help="Override CEX fee (%%)")
+    parser.add_argument("--dex-fee", type=Decimal, help="Override DEX fee (%%)")
+    parser.add_argument("--haircut", type=Decimal, help="Override slippage haircut (%%)")
+    parser.add_argument("--output", help="Write full results as JSON to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    overrides = {
+        "threshold_pct": args.threshold,
+        "cex_fee_pct": args.cex_fee,
+        "dex_fee_pct": args.dex_fee,
+        "haircut_pct": args.haircut,
+    }
+    runner = ReplayRunner(
+        read_journal(args.journal),
+        speed=None if args.speed == "max" else float(args.speed),
+        seed=args.seed,
+        signal_params={k: v for k, v in overrides.items() if v is not None}
+    )
+    result = asyncio.run(runner.run())
+
+    print(json.dumps(result.summary(), indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result.to_dict(), f, indent=2, default=str)
+
+
+if __name__ == "__main__":
+    main()
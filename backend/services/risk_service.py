@@ -1,37 +1,48 @@
 """Risk service for kill-switches and limits."""
 import logging
+import time
 from decimal import Decimal
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timedelta
 from collections import defaultdict
 
 from shared.types import Trade
-from shared.events import event_bus
+from shared.events import event_bus, EventBus, TopicPriority
+from shared.clock import Clock, system_clock
 from config import settings
+from observability.metrics import pause_propagation_seconds
 
 logger = logging.getLogger(__name__)
 
+# Kill-switch topics, delivered ahead of queued market data
+CONTROL_TOPICS = ("risk.paused", "risk.resumed")
+
 
 class RiskService:
     """Manages risk controls and kill-switches."""
     
-    def __init__(self):
+    def __init__(self, bus: EventBus = event_bus, clock: Clock = system_clock):
+        self.bus = bus
+        self.clock = clock
         self.daily_pnl: Decimal = Decimal("0")
         self.daily_trades: int = 0
-        self.daily_reset_time: datetime = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0)
+        self.daily_reset_time: datetime = self.clock.now().replace(hour=0, minute=0, second=0)
         self.is_paused: bool = False
         self.pause_reason: str = ""
         self.staleness_checks: dict = {}
         
+        for topic in CONTROL_TOPICS:
+            self.bus.set_priority(topic, TopicPriority.CONTROL)
+        
         # Subscribe to trade completions
-        event_bus.subscribe("trade.completed", self.handle_trade_completed)
+        self.bus.subscribe("trade.completed", self.handle_trade_completed)
     
     async def handle_trade_completed(self, trade: Trade):
         """Track completed trade for risk limits."""
         # Reset daily counters if new day
-        if datetime.now(timezone.utc) - self.daily_reset_time > timedelta(days=1):
+        if self.clock.now() - self.daily_reset_time > timedelta(days=1):
             self.daily_pnl = Decimal("0")
             self.daily_trades = 0
-            self.daily_reset_time = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0)
+            self.daily_reset_time = self.clock.now().replace(hour=0, minute=0, second=0)
         
         # Update daily stats
         self.daily_pnl += trade.pnl_abs
@@ -43,25 +54,29 @@ class RiskService:
     
     async def trigger_pause(self, reason: str):
         """Trigger kill-switch pause."""
+        start = time.perf_counter()
         self.is_paused = True
         self.pause_reason = reason
         logger.warning(f"KILL-SWITCH TRIGGERED: {reason}")
         
         # Emit pause event
-        await event_bus.publish("risk.paused", {
+        await self.bus.publish("risk.paused", {
             "reason": reason,
-            "timestamp": datetime.now(timezone.utc)
+            "timestamp": self.clock.now()
         })
+        
+        # Control topics are dispatched inline, so publish returns once every handler has acknowledged
+        pause_propagation_seconds.observe(time.perf_counter() - start)
     
     async def check_staleness(self, venue: str, last_update: datetime) -> bool:
         """Check if venue data is stale."""
-        age = (datetime.now(timezone.utc) - last_update).total_seconds()
+        age = (self.clock.now() - last_update).total_seconds()
         
         if age > 10.0:  # 10 second staleness threshold
             if venue not in self.staleness_checks or \
-               (datetime.now(timezone.utc) - self.staleness_checks[venue]).total_seconds() > 60:
+               (self.clock.now() - self.staleness_checks[venue]).total_seconds() > 60:
                 await self.trigger_pause(f"Venue {venue} data stale: {age:.1f}s")
-                self.staleness_checks[venue] = datetime.now(timezone.utc)
+                self.staleness_checks[venue] = self.clock.now()
                 return True
         
         return False
@@ -84,8 +99,8 @@ class RiskService:
         self.pause_reason = ""
         logger.info("Risk service resumed")
         
-        await event_bus.publish("risk.resumed", {
-            "timestamp": datetime.now(timezone.utc)
+        await self.bus.publish("risk.resumed", {
+            "timestamp": self.clock.now()
         })
 
 
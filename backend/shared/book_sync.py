@@ -0,0 +1,55 @@
+"""Order book resync tracking.
+
+A connector invalidates a book when it can no longer trust it: a sequence
+gap, a reconnect, or a crossed book. Until the venue delivers a fresh
+snapshot the pair is *pending* and its connector must not publish
+``cex.bookUpdate`` for it, so downstream engines never see phantom spreads
+from a half-applied book. On invalidation the connector publishes the
+cleared (empty) book once, so consumers drop the last good book; sent on
+the same topic, it also conflates with any update still queued.
+"""
+import logging
+from typing import Dict, List
+
+from shared.clock import Clock, system_clock
+from observability.metrics import book_gaps_total, book_resync_seconds
+
+logger = logging.getLogger(__name__)
+
+
+class BookSync:
+    """Pairs of one venue awaiting a snapshot, with gap and resync metrics."""
+
+    def __init__(self, venue: str, clock: Clock = system_clock):
+        self.venue = venue
+        self.clock = clock
+        self._pending: Dict[str, float] = {}  # pair -> monotonic invalidation time
+
+    def invalidate(self, pair: str, reason: str) -> bool:
+        """Mark `pair` pending until its next snapshot.
+
+        Returns:
+            False if the pair was already pending (counted once per resync).
+        """
+        if pair in self._pending:
+            return False
+        self._pending[pair] = self.clock.monotonic()
+        book_gaps_total.labels(venue=self.venue, reason=reason).inc()
+        logger.warning(f"{self.venue} {pair} book invalidated ({reason}), awaiting snapshot")
+        return True
+
+    def pending(self, pair: str) -> bool:
+        """True while `pair` has no consistent book."""
+        return pair in self._pending
+
+    def pending_pairs(self) -> List[str]:
+        return list(self._pending)
+
+    def resynced(self, pair: str) -> None:
+        """Record that a fresh snapshot for `pair` has been applied."""
+        started = self._pending.pop(pair, None)
+        if started is None:
+            return
+        elapsed = self.clock.monotonic() - started
+        book_resync_seconds.labels(venue=self.venue).observe(elapsed)
+        logger.info(f"{self.venue} {pair} book resynced in {elapsed:.3f}s")
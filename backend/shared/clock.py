@@ -0,0 +1,78 @@
+"""Injectable time sources.
+
+Components that read the time take a ``clock`` so replays can drive them
+from recorded timestamps instead of the system clock.
+"""
+import asyncio
+import time
+from datetime import datetime, timezone, timedelta
+
+
+class Clock:
+    """System clock."""
+
+    def now(self) -> datetime:
+        """Current UTC time (timezone-aware)."""
+        return datetime.now(timezone.utc)
+
+    def utcnow(self) -> datetime:
+        """Current UTC time (naive), like ``datetime.utcnow()``."""
+        return datetime.utcnow()
+
+    def monotonic(self) -> float:
+        """Monotonic seconds for measuring durations."""
+        return time.monotonic()
+
+    def monotonic_ns(self) -> int:
+        """Monotonic nanoseconds for pipeline stage timestamps."""
+        return time.monotonic_ns()
+
+    async def sleep(self, seconds: float) -> None:
+        """Wait for `seconds`."""
+        await asyncio.sleep(seconds)
+
+
+class VirtualClock(Clock):
+    """Clock that only moves when told to.
+
+    ``sleep`` advances virtual time instantly, so simulated latencies cost
+    no wall time during replay.
+    """
+
+    def __init__(self, start: datetime):
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=timezone.utc)
+        self._now = start
+        self._monotonic = 0.0
+
+    def now(self) -> datetime:
+        return self._now
+
+    def utcnow(self) -> datetime:
+        return self._now.replace(tzinfo=None)
+
+    def monotonic(self) -> float:
+        return self._monotonic
+
+    def monotonic_ns(self) -> int:
+        return int(self._monotonic * 1_000_000_000)
+
+    def advance(self, seconds: float) -> None:
+        """Move virtual time forward by `seconds`."""
+        if seconds > 0:
+            self._now += timedelta(seconds=seconds)
+            self._monotonic += seconds
+
+    def advance_to(self, when: datetime) -> None:
+        """Move virtual time forward to `when` (never backwards)."""
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        self.advance((when - self._now).total_seconds())
+
+    async def sleep(self, seconds: float) -> None:
+        self.advance(seconds)
+        await asyncio.sleep(0)
+
+
+# Global system clock instance
+system_clock = Clock()
@@ -0,0 +1,231 @@
+"""Compact binary encoding for events crossing process boundaries.
+
+Bus models are encoded field by field in declaration order, using a schema
+derived once from the Pydantic model definitions so the wire format follows
+the models as they evolve. Decoding uses ``model_construct`` to skip
+re-validation of data that was validated by the publishing process.
+
+Layout: ``u8 tag`` followed by the fields. Strings and decimals are
+length-prefixed UTF-8, datetimes are i64 microseconds since the epoch (UTC),
+nullable fields carry a one-byte presence flag, and book levels/maps are a
+single separator-joined blob. Anything that is not a registered model (e.g.
+risk event dicts) falls back to JSON under tag 0. A :class:`BookView` is
+sent as its :class:`BookUpdate`, so receivers decode the model.
+"""
+import json
+import struct
+from datetime import datetime, timezone, timedelta
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Dict, List, Tuple, Type, Union, get_args, get_origin
+
+from pydantic import BaseModel
+
+from shared.types import BookUpdate, PoolUpdate, Opportunity, Trade
+from shared.orderbook import BookView
+
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_SEP = "\x1f"
+
+JSON_TAG = 0
+MODEL_TAGS: Dict[Type[BaseModel], int] = {
+    BookUpdate: 1,
+    PoolUpdate: 2,
+    Opportunity: 3,
+    Trade: 4,
+}
+
+
+class CodecError(ValueError):
+    """Raised when a buffer cannot be decoded."""
+
+
+def _to_micros(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _from_micros(micros: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=micros)
+
+
+def _put_str(out: bytearray, value: str) -> None:
+    raw = value.encode()
+    out += _U16.pack(len(raw))
+    out += raw
+
+
+def _put_blob(out: bytearray, value: str) -> None:
+    raw = value.encode()
+    out += _U32.pack(len(raw))
+    out += raw
+
+
+class _Reader:
+    """Cursor over an encoded buffer."""
+    __slots__ = ("buf", "pos")
+
+    def __init__(self, buf: bytes, pos: int = 0):
+        self.buf = buf
+        self.pos = pos
+
+    def u8(self) -> int:
+        value = self.buf[self.pos]
+        self.pos += 1
+        return value
+
+    def i64(self) -> int:
+        value = _I64.unpack_from(self.buf, self.pos)[0]
+        self.pos += 8
+        return value
+
+    def text(self) -> str:
+        size = _U16.unpack_from(self.buf, self.pos)[0]
+        start = self.pos + 2
+        self.pos = start + size
+        return bytes(self.buf[start:self.pos]).decode()
+
+    def blob(self) -> str:
+        size = _U32.unpack_from(self.buf, self.pos)[0]
+        start = self.pos + 4
+        self.pos = start + size
+        return bytes(self.buf[start:self.pos]).decode()
+
+
+# Field kinds: (encode(out, value), decode(reader))
+_Kind = Tuple[Callable[[bytearray, Any], None], Callable[[_Reader], Any]]
+
+
+def _levels_encode(out: bytearray, levels: List[List[str]]) -> None:
+    out += _U32.pack(len(levels))
+    _put_blob(out, _SEP.join([x for level in levels for x in level]))
+
+
+def _levels_decode(reader: _Reader) -> List[List[str]]:
+    count = _U32.unpack_from(reader.buf, reader.pos)[0]
+    reader.pos += 4
+    blob = reader.blob()
+    if not count:
+        return []
+    flat = blob.split(_SEP)
+    width = len(flat) // count
+    return [flat[i:i + width] for i in range(0, len(flat), width)]
+
+
+def _map_encode(out: bytearray, mapping: Dict[str, str]) -> None:
+    _put_blob(out, _SEP.join([x for item in mapping.items() for x in item]))
+
+
+def _map_decode(reader: _Reader) -> Dict[str, str]:
+    blob = reader.blob()
+    if not blob:
+        return {}
+    flat = blob.split(_SEP)
+    return dict(zip(flat[::2], flat[1::2]))
+
+
+_STR: _Kind = (_put_str, _Reader.text)
+_DECIMAL: _Kind = (lambda out, v: _put_str(out, str(v)), lambda r: Decimal(r.text()))
+_DATETIME: _Kind = (lambda out, v: out.extend(_I64.pack(_to_micros(v))), lambda r: _from_micros(r.i64()))
+_INT: _Kind = (lambda out, v: out.extend(_I64.pack(v)), _Reader.i64)
+_BOOL: _Kind = (lambda out, v: out.extend(_U8.pack(1 if v else 0)), lambda r: bool(r.u8()))
+_LEVELS: _Kind = (_levels_encode, _levels_decode)
+_MAP: _Kind = (_map_encode, _map_decode)
+_JSON: _Kind = (
+    lambda out, v: _put_blob(out, json.dumps(v, default=str)),
+    lambda r: json.loads(r.blob())
+)
+
+
+def _enum_kind(enum_cls: Type[Enum]) -> _Kind:
+    return (lambda out, v: _put_str(out, v.value), lambda r: enum_cls(r.text()))
+
+
+def _nullable(kind: _Kind) -> _Kind:
+    encode, decode = kind
+
+    def encode_nullable(out: bytearray, value: Any) -> None:
+        if value is None:
+            out += b"\x00"
+        else:
+            out += b"\x01"
+            encode(out, value)
+
+    def decode_nullable(reader: _Reader) -> Any:
+        return decode(reader) if reader.u8() else None
+
+    return encode_nullable, decode_nullable
+
+
+def _kind_for(annotation: Any) -> _Kind:
+    """Map a model field annotation to its wire encoding."""
+    if get_origin(annotation) is Union:
+        args = [a for a in get_args(annotation) if a is not type(None)]
+        if len(args) == 1:
+            return _nullable(_kind_for(args[0]))
+        return _JSON
+    if annotation is str:
+        return _STR
+    if annotation is Decimal:
+        return _DECIMAL
+    if annotation is datetime:
+        return _DATETIME
+    if annotation is bool:
+        return _BOOL
+    if annotation is int:
+        return _INT
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return _enum_kind(annotation)
+    if annotation == List[List[str]]:
+        return _LEVELS
+    if annotation == Dict[str, str]:
+        return _MAP
+    return _JSON
+
+
+def _build_schema(model: Type[BaseModel]) -> List[Tuple[str, _Kind]]:
+    return [(name, _kind_for(field.annotation)) for name, field in model.model_fields.items()]
+
+
+_SCHEMAS: Dict[Type[BaseModel], List[Tuple[str, _Kind]]] = {
+    model: _build_schema(model) for model in MODEL_TAGS
+}
+_MODELS_BY_TAG: Dict[int, Type[BaseModel]] = {tag: model for model, tag in MODEL_TAGS.items()}
+
+
+def encode_event(data: Any) -> bytes:
+    """Encode a bus event to bytes."""
+    if type(data) is BookView:
+        data = data.to_book_update()
+    tag = MODEL_TAGS.get(type(data))
+    out = bytearray()
+    if tag is None:
+        out += _U8.pack(JSON_TAG)
+        _JSON[0](out, data)
+        return bytes(out)
+
+    out += _U8.pack(tag)
+    for name, (encode, _) in _SCHEMAS[type(data)]:
+        encode(out, getattr(data, name))
+    return bytes(out)
+
+
+def decode_event(buf: Union[bytes, memoryview]) -> Any:
+    """Decode bytes produced by :func:`encode_event`."""
+    try:
+        reader = _Reader(buf)
+        tag = reader.u8()
+        if tag == JSON_TAG:
+            return _JSON[1](reader)
+        model = _MODELS_BY_TAG[tag]
+        fields = {name: decode(reader) for name, (_, decode) in _SCHEMAS[model]}
+        return model.model_construct(**fields)
+    except (KeyError, IndexError, struct.error, ValueError) as e:  # ValueError covers JSON/Unicode errors
+        raise CodecError(f"Malformed event buffer: {e}") from e
@@ -1,44 +1,368 @@
 """In-memory event bus for service communication."""
 import asyncio
 import logging
-from typing import Dict, List, Callable, Any
-from collections import defaultdict
-from datetime import datetime
+from enum import Enum
+from time import perf_counter_ns
+from typing import Dict, List, Callable, Any, Optional, Hashable, Iterable
+from collections import defaultdict, OrderedDict
+
+from observability.metrics import (
+    event_handler_duration_seconds,
+    event_handler_errors_total,
+    event_handler_slow_total
+)
 
 logger = logging.getLogger(__name__)
 
 
+class BackpressurePolicy(str, Enum):
+    """What a queued subscription does when its queue is full."""
+    BLOCK = "block"              # Publisher waits for free space
+    DROP_OLDEST = "drop_oldest"  # Evict the oldest queued event
+    DROP_NEWEST = "drop_newest"  # Discard the incoming event
+    CONFLATE = "conflate"        # Keep only the newest event per key
+
+
+class TopicPriority(str, Enum):
+    """Delivery class of a topic."""
+    NORMAL = "normal"    # Inline or queued per topic configuration
+    CONTROL = "control"  # Inline, ahead of any queued events
+
+
+class TopicConfig:
+    """Queued dispatch settings for a topic."""
+    __slots__ = ("policy", "maxsize", "key")
+
+    def __init__(self, policy: BackpressurePolicy, maxsize: int, key: Optional[Callable[[Any], Hashable]] = None):
+        self.policy = policy
+        self.maxsize = maxsize
+        self.key = key
+
+
+class ConflatingQueue:
+    """Latest-value queue keyed by event identity.
+
+    Publishing an event whose key is already pending replaces the pending
+    event in place, so a slow consumer only ever sees the newest state per
+    key. Keys are served in the order they first became pending. Implements
+    the subset of asyncio.Queue used by the bus workers.
+    """
+
+    def __init__(self, key: Callable[[Any], Hashable]):
+        self.key = key
+        self.maxsize = 0
+        self.conflated = 0
+        self._pending: OrderedDict = OrderedDict()
+        self._ready = asyncio.Event()
+        self._finished = asyncio.Event()
+        self._finished.set()
+        self._unfinished = 0
+
+    def qsize(self) -> int:
+        return len(self._pending)
+
+    def full(self) -> bool:
+        return False
+
+    def put_nowait(self, data: Any) -> None:
+        k = self.key(data)
+        if k in self._pending:
+            self._pending[k] = data
+            self.conflated += 1
+            return
+        self._pending[k] = data
+        self._unfinished += 1
+        self._finished.clear()
+        self._ready.set()
+
+    async def get(self) -> Any:
+        while not self._pending:
+            self._ready.clear()
+            await self._ready.wait()
+        return self._pending.popitem(last=False)[1]
+
+    def task_done(self) -> None:
+        self._unfinished -= 1
+        if self._unfinished == 0:
+            self._finished.set()
+
+    async def join(self) -> None:
+        if self._unfinished:
+            await self._finished.wait()
+
+
+class Subscription:
+    """A handler registered for one event type.
+
+    Inline subscriptions are awaited by the publisher. Queued subscriptions
+    own a bounded queue drained by a dedicated worker task, so the publisher
+    only waits on them under the BLOCK policy.
+    """
+    __slots__ = (
+        "event_type", "handler", "name", "queue", "policy", "worker", "dropped",
+        "calls", "duration", "slow"
+    )
+
+    def __init__(self, event_type: str, handler: Callable):
+        self.event_type = event_type
+        self.handler = handler
+        self.name = getattr(handler, "__qualname__", repr(handler))
+        self.queue = None  # asyncio.Queue or ConflatingQueue
+        self.policy: Optional[BackpressurePolicy] = None
+        self.worker: Optional[asyncio.Task] = None
+        self.dropped = 0
+        self.calls = 0
+        # Bind metric children once instead of resolving labels per call
+        self.duration = event_handler_duration_seconds.labels(event_type, self.name)
+        self.slow = event_handler_slow_total.labels(event_type, self.name)
+
+    def attach_queue(self, config: TopicConfig) -> None:
+        """Switch this subscription to queued dispatch."""
+        if config.policy is BackpressurePolicy.CONFLATE:
+            self.queue = ConflatingQueue(config.key)
+        else:
+            self.queue = asyncio.Queue(maxsize=config.maxsize)
+        self.policy = config.policy
+
+
 class EventBus:
     """Simple in-memory event bus for POC."""
-    
+
     def __init__(self):
-        self._subscribers: Dict[str, List[Callable]] = defaultdict(list)
+        self._subscribers: Dict[str, List[Subscription]] = defaultdict(list)
         self._event_count: Dict[str, int] = defaultdict(int)
-    
+        self._topic_configs: Dict[str, TopicConfig] = {}
+        self._slow_threshold_ns = 50_000_000
+        self._sample_every = 1
+        self._transport = None
+        self._export_topics: frozenset = frozenset()
+        self._taps: List[Callable[[str, Any], None]] = []
+        self._control_topics: set = set()
+        self._control_inflight = 0
+        self._control_idle = asyncio.Event()
+        self._control_idle.set()
+
+    def add_tap(self, tap: Callable[[str, Any], None]) -> None:
+        """Observe every event dispatched in this process.
+
+        Taps are plain callables invoked synchronously before the handlers,
+        so they must only hand the event off (e.g. to a queue).
+        """
+        self._taps.append(tap)
+
+    def set_transport(self, transport, topics: Iterable[str]) -> None:
+        """Forward locally published events on `topics` through `transport`.
+
+        Events arriving from the transport are dispatched with
+        :meth:`publish_local` and are not forwarded again.
+        """
+        self._transport = transport
+        self._export_topics = frozenset(topics)
+
+    def configure_instrumentation(self, slow_threshold_ms: float = 50.0, sample_every: int = 1) -> None:
+        """Set the slow-handler log threshold and histogram sampling rate.
+
+        Every call is timed and checked against the threshold; only one in
+        `sample_every` calls is recorded in the duration histogram.
+        """
+        self._slow_threshold_ns = int(slow_threshold_ms * 1_000_000)
+        self._sample_every = max(1, sample_every)
+
+    def set_priority(self, event_type: str, priority: TopicPriority) -> None:
+        """Set the delivery class of a topic.
+
+        CONTROL topics are always dispatched inline, and queue workers hold
+        back their next event until every in-flight control event has been
+        handled, so a kill-switch is seen before any market data or
+        opportunity that was queued ahead of it.
+        """
+        priority = TopicPriority(priority)
+        if priority is TopicPriority.CONTROL:
+            if event_type in self._topic_configs:
+                raise ValueError(f"Topic {event_type} is queued and cannot be a control topic")
+            self._control_topics.add(event_type)
+        else:
+            self._control_topics.discard(event_type)
+        logger.info(f"Topic {event_type} priority={priority.value}")
+
     def subscribe(self, event_type: str, handler: Callable) -> None:
         """Subscribe to event type."""
-        self._subscribers[event_type].append(handler)
-        logger.info(f"Subscribed to {event_type}: {handler.__name__}")
-    
+        sub = Subscription(event_type, handler)
+        config = self._topic_configs.get(event_type)
+        if config:
+            sub.attach_queue(config)
+        self._subscribers[event_type].append(sub)
+        logger.info(f"Subscribed to {event_type}: {sub.name}")
+
+    def configure_topic(
+        self,
+        event_type: str,
+        policy: BackpressurePolicy = BackpressurePolicy.DROP_OLDEST,
+        maxsize: int = 1000,
+        key: Optional[Callable[[Any], Hashable]] = None
+    ) -> None:
+        """Give every subscriber of a topic its own bounded queue and worker.
+
+        With the CONFLATE policy, `key` maps an event to its identity (e.g.
+        venue and pair) and the queue is bounded by the number of keys
+        instead of `maxsize`.
+
+        Applies to existing and future subscriptions. Must be called before
+        the first event is published on the topic.
+        """
+        policy = BackpressurePolicy(policy)
+        if event_type in self._control_topics:
+            raise ValueError(f"Control topic {event_type} cannot be queued")
+        if policy is BackpressurePolicy.CONFLATE and key is None:
+            raise ValueError("Conflating topics require a key function")
+        config = TopicConfig(policy, maxsize, key)
+        self._topic_configs[event_type] = config
+        for sub in self._subscribers.get(event_type, []):
+            sub.attach_queue(config)
+        logger.info(f"Topic {event_type} queued: policy={config.policy.value}, maxsize={maxsize}")
+
     async def publish(self, event_type: str, data: Any) -> None:
         """Publish event to all subscribers."""
+        if event_type in self._export_topics:
+            self._transport.send(event_type, data)
+        await self.publish_local(event_type, data)
+
+    async def publish_local(self, event_type: str, data: Any) -> None:
+        """Publish event to subscribers in this process only."""
         self._event_count[event_type] += 1
-        
-        handlers = self._subscribers.get(event_type, [])
-        if not handlers:
-            logger.debug(f"No subscribers for {event_type}")
+        for tap in self._taps:
+            tap(event_type, data)
+
+        subscriptions = self._subscribers.get(event_type, [])
+        if not subscriptions:
+            logger.debug("No subscribers for %s", event_type)
+            return
+
+        logger.debug("Publishing %s to %d handlers", event_type, len(subscriptions))
+
+        if event_type in self._control_topics:
+            await self._dispatch_control(subscriptions, data)
             return
-        
-        logger.debug(f"Publishing {event_type} to {len(handlers)} handlers")
-        
-        # Execute handlers concurrently
-        tasks = [handler(data) for handler in handlers]
-        await asyncio.gather(*tasks, return_exceptions=True)
-    
+
+        tasks = []
+        for sub in subscriptions:
+            if sub.queue is None:
+                tasks.append(self._invoke(sub, data))
+            else:
+                await self._enqueue(sub, data)
+
+        # Execute inline handlers concurrently
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def _dispatch_control(self, subscriptions: List[Subscription], data: Any) -> None:
+        """Deliver a control event while queue workers are held back."""
+        self._control_inflight += 1
+        self._control_idle.clear()
+        try:
+            await asyncio.gather(*(self._invoke(sub, data) for sub in subscriptions))
+        finally:
+            self._control_inflight -= 1
+            if self._control_inflight == 0:
+                self._control_idle.set()
+
+    async def _invoke(self, sub: Subscription, data: Any) -> None:
+        """Run one handler call with timing and error accounting."""
+        start = perf_counter_ns()
+        try:
+            await sub.handler(data)
+        except Exception as e:
+            event_handler_errors_total.labels(sub.event_type, sub.name, type(e).__name__).inc()
+            logger.error(f"Handler {sub.name} failed on {sub.event_type}: {e}", exc_info=True)
+        finally:
+            elapsed_ns = perf_counter_ns() - start
+            sub.calls += 1
+            if sub.calls % self._sample_every == 0:
+                sub.duration.observe(elapsed_ns / 1e9)
+            if elapsed_ns >= self._slow_threshold_ns:
+                sub.slow.inc()
+                logger.warning(f"Slow handler {sub.name} on {sub.event_type}: {elapsed_ns / 1e6:.1f}ms")
+
+    async def _enqueue(self, sub: Subscription, data: Any) -> None:
+        """Hand an event to a queued subscription, applying its policy."""
+        if sub.worker is None or sub.worker.done():
+            sub.worker = asyncio.create_task(self._drain(sub))
+
+        queue = sub.queue
+        if queue.full():
+            if sub.policy is BackpressurePolicy.DROP_NEWEST:
+                sub.dropped += 1
+                return
+            if sub.policy is BackpressurePolicy.DROP_OLDEST:
+                queue.get_nowait()
+                queue.task_done()
+                sub.dropped += 1
+            else:
+                await queue.put(data)
+                return
+
+        queue.put_nowait(data)
+
+    async def _drain(self, sub: Subscription) -> None:
+        """Worker loop feeding queued events to one handler."""
+        queue = sub.queue
+        while True:
+            data = await queue.get()
+            if not self._control_idle.is_set():
+                await self._control_idle.wait()
+            try:
+                await self._invoke(sub, data)
+            finally:
+                queue.task_done()
+
+    async def join(self) -> None:
+        """Wait until every queued event has been handled."""
+        for subscriptions in list(self._subscribers.values()):
+            for sub in subscriptions:
+                if sub.queue is not None:
+                    await sub.queue.join()
+
+    async def stop(self) -> None:
+        """Cancel all subscription workers."""
+        workers = [
+            sub.worker
+            for subscriptions in self._subscribers.values()
+            for sub in subscriptions
+            if sub.worker is not None
+        ]
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        for subscriptions in self._subscribers.values():
+            for sub in subscriptions:
+                sub.worker = None
+
     def get_stats(self) -> Dict[str, int]:
         """Get event statistics."""
         return dict(self._event_count)
 
+    def get_transport_stats(self) -> Dict[str, Any]:
+        """Get transport statistics."""
+        if self._transport is None:
+            return {"transport": "inprocess"}
+        return self._transport.get_stats()
+
+    def get_queue_stats(self) -> Dict[str, Dict[str, dict]]:
+        """Get queue depth and drop counts per queued subscription."""
+        stats: Dict[str, Dict[str, dict]] = {}
+        for event_type, subscriptions in self._subscribers.items():
+            for sub in subscriptions:
+                if sub.queue is None:
+                    continue
+                stats.setdefault(event_type, {})[sub.name] = {
+                    "policy": sub.policy.value,
+                    "depth": sub.queue.qsize(),
+                    "maxsize": sub.queue.maxsize,
+                    "dropped": sub.dropped,
+                    "conflated": getattr(sub.queue, "conflated", 0)
+                }
+        return stats
+
 
 # Global event bus instance
 event_bus = EventBus()
@@ -0,0 +1,186 @@
+"""Fixed-point integer prices and sizes.
+
+In fixed-point mode prices and sizes are held as integers in units of the
+instrument's price and size scales (e.g. SOL-USD prices in 1e-4 USD), from
+WS parsing through book storage and spread comparison. ``Decimal`` is only
+used at persistence and API boundaries.
+
+Components take a *scale* and call ``scale.price(text)`` /
+``scale.format_price(value)`` etc., so the same code runs in both modes:
+:data:`DECIMAL` keeps ``Decimal`` values, :class:`FixedScale` uses ints.
+"""
+from decimal import Decimal, ROUND_HALF_EVEN
+from typing import Dict, NamedTuple
+
+_POW10 = [10 ** i for i in range(19)]
+
+# Entries per memo table before it is reset
+MEMO_LIMIT = 65536
+
+
+def parse_fixed(text: str, decimals: int) -> int:
+    """Parse a decimal string into an integer count of 10**-decimals units.
+
+    Raises:
+        ValueError: If `text` has non-zero digits beyond `decimals` places.
+    """
+    dot = text.find(".")
+    if dot < 0:
+        return int(text) * _POW10[decimals]
+    places = len(text) - dot - 1
+    if places > decimals:
+        if text[dot + 1 + decimals:].strip("0"):
+            raise ValueError(f"{text!r} has more than {decimals} decimal places")
+        text = text[:dot + 1 + decimals]
+        places = decimals
+    return int(text[:dot] + text[dot + 1:]) * _POW10[decimals - places]
+
+
+def format_fixed(value: int, decimals: int) -> str:
+    """Format an integer count of 10**-decimals units as a decimal string."""
+    if not decimals:
+        return str(value)
+    sign = "-" if value < 0 else ""
+    whole, frac = divmod(abs(value), _POW10[decimals])
+    return f"{sign}{whole}.{frac:0{decimals}d}"
+
+
+class DecimalScale:
+    """Decimal mode: values stay ``Decimal``."""
+    __slots__ = ()
+    fixed = False
+
+    price = staticmethod(Decimal)
+    size = staticmethod(Decimal)
+    format_price = staticmethod(str)
+    format_size = staticmethod(str)
+
+    def price_from_decimal(self, value: Decimal) -> Decimal:
+        return value
+
+    def size_from_decimal(self, value: Decimal) -> Decimal:
+        return value
+
+    def price_from_notional(self, notional: Decimal, size: Decimal, round_up: bool = False) -> Decimal:
+        return notional / size
+
+    def price_to_decimal(self, value: Decimal) -> Decimal:
+        return value
+
+    def size_to_decimal(self, value: Decimal) -> Decimal:
+        return value
+
+
+class FixedScale:
+    """Fixed-point mode: prices and sizes as ints at per-instrument scales.
+
+    Market data revisits the same few hundred price levels and sizes, so
+    conversions are memoized in bounded dicts; a hit costs one dict lookup
+    instead of string slicing and integer parsing or formatting.
+    """
+    __slots__ = (
+        "price_decimals", "size_decimals", "_price_quantum",
+        "_prices", "_sizes", "_price_texts", "_size_texts", "_decimal_prices"
+    )
+    fixed = True
+
+    def __init__(self, price_decimals: int, size_decimals: int):
+        self.price_decimals = price_decimals
+        self.size_decimals = size_decimals
+        self._price_quantum = Decimal(1).scaleb(-price_decimals)
+        self._prices: Dict[str, int] = {}
+        self._sizes: Dict[str, int] = {}
+        self._price_texts: Dict[int, str] = {}
+        self._size_texts: Dict[int, str] = {}
+        self._decimal_prices: Dict[Decimal, int] = {}
+
+    def price(self, text: str) -> int:
+        """Parse a price string."""
+        value = self._prices.get(text)
+        if value is None:
+            value = _memo(self._prices, text, parse_fixed(text, self.price_decimals))
+        return value
+
+    def size(self, text: str) -> int:
+        """Parse a size string."""
+        value = self._sizes.get(text)
+        if value is None:
+            value = _memo(self._sizes, text, parse_fixed(text, self.size_decimals))
+        return value
+
+    def format_price(self, value: int) -> str:
+        text = self._price_texts.get(value)
+        if text is None:
+            text = _memo(self._price_texts, value, format_fixed(value, self.price_decimals))
+        return text
+
+    def format_size(self, value: int) -> str:
+        text = self._size_texts.get(value)
+        if text is None:
+            text = _memo(self._size_texts, value, format_fixed(value, self.size_decimals))
+        return text
+
+    def price_from_decimal(self, value: Decimal) -> int:
+        """Convert a Decimal price, rounding half-even to the price scale."""
+        result = self._decimal_prices.get(value)
+        if result is None:
+            scaled = value.quantize(self._price_quantum, rounding=ROUND_HALF_EVEN).scaleb(self.price_decimals)
+            result = _memo(self._decimal_prices, value, int(scaled))
+        return result
+
+    def size_from_decimal(self, value: Decimal) -> int:
+        """Convert a Decimal size, rounding half-even to the size scale."""
+        return int(value.scaleb(self.size_decimals).to_integral_value(rounding=ROUND_HALF_EVEN))
+
+    def price_from_notional(self, notional: int, size: int, round_up: bool = False) -> int:
+        """Average price of `notional` (price units x size units) over `size`.
+
+        Rounds down, or up if `round_up`, so a VWAP never looks better than
+        what the levels actually give.
+        """
+        if round_up:
+            return -(-notional // size)
+        return notional // size
+
+    def price_to_decimal(self, value: int) -> Decimal:
+        return Decimal(value).scaleb(-self.price_decimals)
+
+    def size_to_decimal(self, value: int) -> Decimal:
+        return Decimal(value).scaleb(-self.size_decimals)
+
+
+def _memo(table: dict, key, value):
+    if len(table) >= MEMO_LIMIT:
+        table.clear()
+    table[key] = value
+    return value
+
+
+class InstrumentScale(NamedTuple):
+    """Decimal places of an instrument's prices and sizes."""
+    price_decimals: int
+    size_decimals: int
+
+
+# Finest tick/lot across supported venues, keyed by normalized symbol
+INSTRUMENT_SCALES: Dict[str, InstrumentScale] = {
+    "SOLUSD": InstrumentScale(4, 8),
+    "BTCUSD": InstrumentScale(2, 8),
+    "ETHUSD": InstrumentScale(2, 8),
+}
+DEFAULT_SCALE = InstrumentScale(6, 8)
+
+DECIMAL = DecimalScale()
+
+_fixed_scales: Dict[str, FixedScale] = {}
+
+
+def scale_for(pair: str, fixed: bool):
+    """Scale for a venue symbol ("solusd", "SOL-USD"), or DECIMAL if not `fixed`."""
+    if not fixed:
+        return DECIMAL
+    key = pair.upper().replace("-", "").replace("/", "")
+    scale = _fixed_scales.get(key)
+    if scale is None:
+        scale = _fixed_scales[key] = FixedScale(*INSTRUMENT_SCALES.get(key, DEFAULT_SCALE))
+    return scale
@@ -0,0 +1,179 @@
+"""Append-only binary journal of event bus traffic.
+
+Events are stamped and handed to a dedicated writer thread through a
+``queue.SimpleQueue`` (a lock-free C queue), so recording costs the
+publishing coroutine one tuple allocation and one put. The writer encodes
+events with :mod:`shared.codec` and appends them to memory-mapped segment
+files that are preallocated and rotated by size.
+
+Segment layout: 8-byte magic, then records of
+``u32 length | u64 monotonic ns | u64 wall-clock ns | u8 topic length |
+topic | encoded event``. The zero-filled tail of a segment reads as a
+zero length, which marks the end of data; closed segments are truncated to
+their written size.
+"""
+import logging
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+from shared.codec import encode_event, decode_event, CodecError
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"ARBJRNL1"
+_RECORD_HEADER = struct.Struct("<IQQB")
+_STOP = object()
+
+
+class JournalRecord(NamedTuple):
+    """One journaled event."""
+    mono_ns: int
+    wall_ns: int
+    event_type: str
+    data: Any
+
+
+class EventJournal:
+    """Records bus events to size-rotated, memory-mapped segment files."""
+
+    def __init__(self, directory: str, segment_bytes: int = 64 * 1024 * 1024):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        self._pos = 0
+        self._segment_index = 0
+        self.records_written = 0
+        self.bytes_written = 0
+        self.errors = 0
+
+    def start(self) -> None:
+        """Start the writer thread."""
+        os.makedirs(self.directory, exist_ok=True)
+        existing = _segment_paths(self.directory)
+        if existing:
+            self._segment_index = _segment_number(existing[-1]) + 1
+        self._thread = threading.Thread(target=self._run, name="event-journal", daemon=True)
+        self._thread.start()
+        logger.info(f"Event journal recording to {self.directory}")
+
+    def record(self, event_type: str, data: Any) -> None:
+        """Queue an event for writing (bus tap, called on the hot path)."""
+        self._queue.put((time.monotonic_ns(), time.time_ns(), event_type, data))
+
+    def close(self) -> None:
+        """Flush queued events, finalize the open segment and stop the writer."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            try:
+                self._append(*item)
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Event journal write failed for {item[2]}: {e}")
+        self._close_segment()
+
+    def _append(self, mono_ns: int, wall_ns: int, event_type: str, data: Any) -> None:
+        topic = event_type.encode()
+        payload = encode_event(data)
+        body_len = _RECORD_HEADER.size - 4 + len(topic) + len(payload)
+        total = 4 + body_len
+
+        if self._map is None or self._pos + total > len(self._map):
+            self._open_segment(total)
+
+        end = self._pos + _RECORD_HEADER.size
+        self._map[self._pos:end] = _RECORD_HEADER.pack(body_len, mono_ns, wall_ns, len(topic))
+        self._map[end:end + len(topic)] = topic
+        end += len(topic)
+        self._map[end:end + len(payload)] = payload
+        self._pos = end + len(payload)
+
+        self.records_written += 1
+        self.bytes_written += total
+
+    def _open_segment(self, min_record_bytes: int) -> None:
+        self._close_segment()
+        size = max(self.segment_bytes, len(MAGIC) + min_record_bytes)
+        path = os.path.join(self.directory, f"events-{self._segment_index:06d}.journal")
+        self._segment_index += 1
+
+        self._file = open(path, "w+b")
+        self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), size)
+        self._map[:len(MAGIC)] = MAGIC
+        self._pos = len(MAGIC)
+        logger.info(f"Event journal opened segment {path}")
+
+    def _close_segment(self) -> None:
+        if self._map is None:
+            return
+        self._map.flush()
+        self._map.close()
+        self._file.truncate(self._pos)
+        self._file.close()
+        self._map = None
+        self._file = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get journal statistics."""
+        return {
+            "directory": self.directory,
+            "segment": self._segment_index - 1,
+            "records_written": self.records_written,
+            "bytes_written": self.bytes_written,
+            "pending": self._queue.qsize(),
+            "errors": self.errors
+        }
+
+
+def _segment_number(path: str) -> int:
+    return int(os.path.basename(path).split("-")[1].split(".")[0])
+
+
+def _segment_paths(directory: str) -> List[str]:
+    names = sorted(n for n in os.listdir(directory) if n.startswith("events-") and n.endswith(".journal"))
+    return [os.path.join(directory, n) for n in names]
+
+
+def read_segment(path: str) -> Iterator[JournalRecord]:
+    """Yield the records of one segment file."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size <= len(MAGIC):
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if data[:len(MAGIC)] != MAGIC:
+                raise CodecError(f"Not an event journal segment: {path}")
+            pos = len(MAGIC)
+            end = len(data)
+            while pos + _RECORD_HEADER.size <= end:
+                body_len, mono_ns, wall_ns, topic_len = _RECORD_HEADER.unpack_from(data, pos)
+                if body_len == 0:
+                    break
+                start = pos + _RECORD_HEADER.size
+                stop = pos + 4 + body_len
+                event_type = data[start:start + topic_len].decode()
+                event = decode_event(data[start + topic_len:stop])
+                yield JournalRecord(mono_ns, wall_ns, event_type, event)
+                pos = stop
+
+
+def read_journal(directory: str) -> Iterator[JournalRecord]:
+    """Yield every record in a journal directory in write order."""
+    for path in _segment_paths(directory):
+        yield from read_segment(path)
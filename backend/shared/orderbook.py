@@ -0,0 +1,363 @@
+"""Incrementally maintained order books.
+
+Each side keeps its price levels in sorted parallel arrays ordered worst to
+best, so the best level is the last element. Updates find their level with
+``bisect`` (O(log n)) and, since most activity happens near the top of the
+book, inserts and deletes usually shift only a few trailing elements.
+
+:class:`OrderBook` is the one book representation shared by all CEX
+connectors; :meth:`OrderBook.view` produces the ``cex.bookUpdate`` event, a
+:class:`BookView` that defers string formatting and model construction
+until a consumer needs them. Levels hold whatever the book's scale parses to: ``Decimal`` by
+default, integers in fixed-point mode (see :mod:`shared.fixedpoint`).
+"""
+from bisect import bisect_left
+from datetime import datetime, timezone
+from decimal import Decimal
+from itertools import accumulate
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from shared.types import BookUpdate
+from shared.fixedpoint import DECIMAL
+
+
+class BookSide:
+    """One side of an order book, sorted by price priority."""
+    __slots__ = ("descending", "version", "_keys", "_sizes")
+
+    def __init__(self, descending: bool):
+        """
+        Args:
+            descending: True for bids (best = highest price), False for asks.
+        """
+        self.descending = descending
+        self.version = 0  # Incremented on every change
+        # Sort keys are the price for bids and the negated price for asks,
+        # so ascending key order is worst-to-best on both sides
+        self._keys: List[Decimal] = []
+        self._sizes: List[Decimal] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def update(self, price: Decimal, size: Decimal) -> None:
+        """Set the size at a price level; zero size removes the level."""
+        key = price if self.descending else -price
+        keys = self._keys
+        i = bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            if size:
+                self._sizes[i] = size
+            else:
+                del keys[i]
+                del self._sizes[i]
+        elif size:
+            keys.insert(i, key)
+            self._sizes.insert(i, size)
+        else:
+            return
+        self.version += 1
+
+    def load(self, levels: Iterable[Tuple[Decimal, Decimal]]) -> None:
+        """Replace all levels from a snapshot of (price, size) pairs.
+
+        Builds the arrays with one sort instead of per-level inserts; later
+        duplicates of a price win and zero-size levels are skipped.
+        """
+        if self.descending:
+            merged = {price: size for price, size in levels}
+        else:
+            merged = {-price: size for price, size in levels}
+        pairs = sorted(item for item in merged.items() if item[1])
+        self._keys = [k for k, _ in pairs]
+        self._sizes = [s for _, s in pairs]
+        self.version += 1
+
+    def clear(self) -> None:
+        """Remove all levels."""
+        self._keys.clear()
+        self._sizes.clear()
+        self.version += 1
+
+    def copy(self) -> "BookSide":
+        """Independent copy of this side."""
+        side = BookSide(self.descending)
+        side.version = self.version
+        side._keys = self._keys.copy()
+        side._sizes = self._sizes.copy()
+        return side
+
+    def best(self) -> Optional[Tuple[Decimal, Decimal]]:
+        """Best (price, size), or None if the side is empty."""
+        if not self._keys:
+            return None
+        key = self._keys[-1]
+        return (key if self.descending else -key), self._sizes[-1]
+
+    def best_price(self) -> Optional[Decimal]:
+        """Best price, or None if the side is empty."""
+        if not self._keys:
+            return None
+        key = self._keys[-1]
+        return key if self.descending else -key
+
+    def top(self, n: int) -> List[Tuple[Decimal, Decimal]]:
+        """Best `n` levels as (price, size), best first."""
+        keys = self._keys[:-n - 1:-1]
+        sizes = self._sizes[:-n - 1:-1]
+        if self.descending:
+            return list(zip(keys, sizes))
+        return [(-k, s) for k, s in zip(keys, sizes)]
+
+    def cumulative(self, n: int) -> List[Tuple[Decimal, Decimal]]:
+        """Best `n` levels as (price, total size at this price or better)."""
+        levels = self.top(n)
+        return list(zip((p for p, _ in levels), accumulate(s for _, s in levels)))
+
+    def tail(self, n: int) -> Tuple[List[Decimal], List[Decimal]]:
+        """Sort keys and sizes of the best `n` levels, in internal (worst-to-best) order."""
+        if n <= 0:
+            return [], []
+        return self._keys[-n:], self._sizes[-n:]
+
+    def to_strings(self, n: int, scale=DECIMAL) -> List[List[str]]:
+        """Best `n` levels as [[price, size], ...] strings (BookUpdate format)."""
+        format_price, format_size = scale.format_price, scale.format_size
+        return [[format_price(p), format_size(s)] for p, s in self.top(n)]
+
+
+class OrderBook:
+    """Bid and ask sides of one instrument on one venue."""
+    __slots__ = ("venue", "pair", "scale", "bids", "asks")
+
+    def __init__(self, venue: str = "", pair: str = "", scale=DECIMAL):
+        self.venue = venue
+        self.pair = pair
+        self.scale = scale  # Parses and formats level values
+        self.bids = BookSide(descending=True)
+        self.asks = BookSide(descending=False)
+
+    @property
+    def version(self) -> int:
+        """Change counter; increases with every applied change."""
+        return self.bids.version + self.asks.version
+
+    def side(self, is_bid: bool) -> BookSide:
+        """Bid side if `is_bid`, else the ask side."""
+        return self.bids if is_bid else self.asks
+
+    def apply(self, changes: Iterable[Tuple[bool, Decimal, Decimal]]) -> None:
+        """Apply a batch of (is_bid, price, size) level changes."""
+        bids, asks = self.bids, self.asks
+        for is_bid, price, size in changes:
+            (bids if is_bid else asks).update(price, size)
+
+    def load(self, bids: Iterable[Tuple[Decimal, Decimal]], asks: Iterable[Tuple[Decimal, Decimal]]) -> None:
+        """Replace both sides from a snapshot."""
+        self.bids.load(bids)
+        self.asks.load(asks)
+
+    def clear(self) -> None:
+        """Remove all levels from both sides."""
+        self.bids.clear()
+        self.asks.clear()
+
+    def copy(self) -> "OrderBook":
+        """Point-in-time copy that later updates do not affect."""
+        book = OrderBook(self.venue, self.pair, self.scale)
+        book.bids = self.bids.copy()
+        book.asks = self.asks.copy()
+        return book
+
+    def best_bid_ask(self) -> Optional[Tuple[Decimal, Decimal]]:
+        """(best bid, best ask), or None unless both sides have levels."""
+        if not self.bids._keys or not self.asks._keys:
+            return None
+        return self.bids.best_price(), self.asks.best_price()
+
+    def is_crossed(self) -> bool:
+        """True if the best bid is at or above the best ask (inconsistent book)."""
+        best = self.best_bid_ask()
+        return best is not None and best[0] >= best[1]
+
+    def view(
+        self,
+        depth: int = 10,
+        timestamp: Optional[datetime] = None,
+        sequence: int = 0,
+        stamps: Optional[Dict[str, int]] = None
+    ) -> "BookView":
+        """Immutable ``cex.bookUpdate`` event for the top `depth` levels.
+
+        `stamps` are the connector's tick-to-trade stage timestamps.
+        """
+        return BookView(self, depth, timestamp or datetime.now(timezone.utc), sequence, stamps)
+
+    def to_book_update(
+        self,
+        depth: int = 10,
+        timestamp: Optional[datetime] = None,
+        sequence: int = 0
+    ) -> BookUpdate:
+        """Build the ``cex.bookUpdate`` event for the top `depth` levels."""
+        return BookUpdate(
+            venue=self.venue,
+            pair=self.pair,
+            timestamp=timestamp or datetime.now(timezone.utc),
+            bids=self.bids.to_strings(depth, self.scale),
+            asks=self.asks.to_strings(depth, self.scale),
+            sequence=sequence
+        )
+
+    def to_dict(self, depth: int = 10) -> Dict[str, Any]:
+        """JSON-friendly view of the top `depth` levels as [price, size, cumulative size]."""
+        return {
+            "venue": self.venue,
+            "pair": self.pair,
+            "version": self.version,
+            "bids": _levels_with_depth(self.bids, depth, self.scale),
+            "asks": _levels_with_depth(self.asks, depth, self.scale)
+        }
+
+
+class BookView:
+    """Read-only top-of-book event over an :class:`OrderBook`.
+
+    Best bid/ask are taken when the view is created and kept in the book's
+    scale, which is all spread detection reads. The top levels are captured
+    as slices of the book's sort arrays (references, no per-level objects),
+    so the view stays valid after the book moves on; ``bids``/``asks``
+    strings and the :class:`BookUpdate` model are built on first access,
+    e.g. for transport, journaling or UI broadcast.
+    """
+    __slots__ = (
+        "venue", "pair", "timestamp", "sequence", "version", "scale", "stamps",
+        "best_bid", "best_ask", "_bid_tail", "_ask_tail", "_bids", "_asks", "_model"
+    )
+
+    def __init__(
+        self,
+        book: OrderBook,
+        depth: int,
+        timestamp: datetime,
+        sequence: int,
+        stamps: Optional[Dict[str, int]] = None
+    ):
+        self.venue = book.venue
+        self.pair = book.pair
+        self.timestamp = timestamp
+        self.sequence = sequence
+        self.version = book.version
+        self.scale = book.scale
+        self.stamps = stamps or {}
+        self._bid_tail = book.bids.tail(depth)
+        self._ask_tail = book.asks.tail(depth)
+        bid_keys, ask_keys = self._bid_tail[0], self._ask_tail[0]
+        self.best_bid = bid_keys[-1] if bid_keys else None
+        self.best_ask = -ask_keys[-1] if ask_keys else None
+        self._bids: Optional[List[List[str]]] = None
+        self._asks: Optional[List[List[str]]] = None
+        self._model: Optional[BookUpdate] = None
+
+    @property
+    def bids(self) -> List[List[str]]:
+        """Bid levels as [[price, size], ...] strings, best first."""
+        if self._bids is None:
+            self._bids = _tail_strings(self._bid_tail, True, self.scale)
+        return self._bids
+
+    @property
+    def asks(self) -> List[List[str]]:
+        """Ask levels as [[price, size], ...] strings, best first."""
+        if self._asks is None:
+            self._asks = _tail_strings(self._ask_tail, False, self.scale)
+        return self._asks
+
+    def levels(self, is_bid: bool) -> List[Tuple[Decimal, Decimal]]:
+        """Captured (price, size) levels of one side in the book's scale, best first."""
+        keys, sizes = self._bid_tail if is_bid else self._ask_tail
+        if is_bid:
+            return list(zip(reversed(keys), reversed(sizes)))
+        return [(-k, s) for k, s in zip(reversed(keys), reversed(sizes))]
+
+    def to_book_update(self) -> BookUpdate:
+        """The equivalent validated :class:`BookUpdate` (built once)."""
+        if self._model is None:
+            self._model = BookUpdate(
+                venue=self.venue,
+                pair=self.pair,
+                timestamp=self.timestamp,
+                bids=self.bids,
+                asks=self.asks,
+                sequence=self.sequence
+            )
+        return self._model
+
+    def __repr__(self) -> str:
+        return (
+            f"BookView(venue={self.venue!r}, pair={self.pair!r}, version={self.version}, "
+            f"best_bid={self.best_bid}, best_ask={self.best_ask})"
+        )
+
+
+class DepthCurve:
+    """Cumulative size and notional of one book side, for VWAP by size.
+
+    Built once per book version from (price, size) levels, best first; each
+    size query is then a ``bisect`` over the cumulative sizes. Values stay in
+    the book's scale (``Decimal`` or fixed-point ints).
+    """
+    __slots__ = ("scale", "is_bid", "prices", "cum_sizes", "cum_notionals")
+
+    def __init__(self, levels: Iterable[Tuple[Decimal, Decimal]], is_bid: bool, scale=DECIMAL):
+        self.scale = scale
+        self.is_bid = is_bid
+        self.prices: List[Decimal] = []
+        self.cum_sizes: List[Decimal] = []
+        self.cum_notionals: List[Decimal] = []
+        size_total = notional_total = 0
+        for price, size in levels:
+            size_total += size
+            notional_total += price * size
+            self.prices.append(price)
+            self.cum_sizes.append(size_total)
+            self.cum_notionals.append(notional_total)
+
+    @property
+    def total_size(self):
+        """Size available across all levels."""
+        return self.cum_sizes[-1] if self.cum_sizes else 0
+
+    def vwap(self, size) -> Optional[Decimal]:
+        """Average fill price for taking `size`, or None if the levels cannot fill it.
+
+        Rounds against the taker in fixed-point mode (down when selling into
+        bids, up when buying asks).
+        """
+        if not self.prices:
+            return None
+        if size <= 0:
+            return self.prices[0]
+        i = bisect_left(self.cum_sizes, size)
+        if i == len(self.cum_sizes):
+            return None
+        if i:
+            notional = self.cum_notionals[i - 1] + (size - self.cum_sizes[i - 1]) * self.prices[i]
+        else:
+            notional = size * self.prices[0]
+        return self.scale.price_from_notional(notional, size, round_up=not self.is_bid)
+
+
+def _tail_strings(tail: Tuple[list, list], descending: bool, scale) -> List[List[str]]:
+    keys, sizes = tail
+    fp, fs = scale.format_price, scale.format_size
+    if descending:
+        return [[fp(k), fs(s)] for k, s in zip(reversed(keys), reversed(sizes))]
+    return [[fp(-k), fs(s)] for k, s in zip(reversed(keys), reversed(sizes))]
+
+
+def _levels_with_depth(side: BookSide, depth: int, scale) -> List[List[str]]:
+    levels = side.top(depth)
+    totals = accumulate(s for _, s in levels)
+    fp, fs = scale.format_price, scale.format_size
+    return [[fp(p), fs(s), fs(t)] for (p, s), t in zip(levels, totals)]
@@ -0,0 +1,124 @@
+"""Registry of monitored DEX pools.
+
+Each pool address maps to a :class:`PoolInfo`: its program, the asset it
+prices (a canonical symbol from ``settings.assets``), its base/quote mints
+and SPL decimals, and its fee tier. Components look pools up by address in
+O(1) instead of assuming the SOL/USDC Whirlpool.
+
+The registry is built once at import from ``POOL_REGISTRY_FILE``, a JSON list
+of :class:`PoolInfo` objects whose assets must be in ``ASSET_LIST``, e.g.::
+
+    [{"address": "HJPj...", "program": "whirlpool", "asset": "SOL-USD",
+      "base_mint": "So11...", "quote_mint": "EPjF...",
+      "base_decimals": 9, "quote_decimals": 6, "fee_bps": 30}]
+
+Without a file it holds the SOL/USDC Whirlpool (``ORCA_SOL_USDC_POOL``).
+"""
+import json
+import logging
+from typing import Dict, Iterable, List, Optional
+
+from pydantic import BaseModel, Field
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Orca SOL/USDC Whirlpool, monitored when no registry file is configured
+DEFAULT_SOL_USDC_WHIRLPOOL = "HJPjoWUrhoZzkNfRpHuieeFk9WcZWjwy6PBjZ81ngndJ"
+WSOL_DECIMALS = 9
+USDC_DECIMALS = 6
+
+
+class PoolInfo(BaseModel):
+    """Static description of one DEX pool."""
+    address: str
+    program: str  # "whirlpool", "raydium", ...
+    asset: str  # Canonical symbol, e.g. "SOL-USD"
+    base_mint: str
+    quote_mint: str
+    base_decimals: int = Field(ge=0, le=18)
+    quote_decimals: int = Field(ge=0, le=18)
+    fee_bps: int = Field(ge=0, le=10000)
+    base_is_token_a: bool = True  # Whirlpool price is token B per token A
+
+
+class PoolRegistry:
+    """Pool address -> :class:`PoolInfo`, plus pools per asset."""
+
+    def __init__(self, pools: Iterable[PoolInfo] = ()):
+        self._pools: Dict[str, PoolInfo] = {}
+        self._by_asset: Dict[str, List[PoolInfo]] = {}
+        for pool in pools:
+            self.add(pool)
+
+    def add(self, pool: PoolInfo) -> None:
+        """Register (or replace) a pool."""
+        previous = self._pools.get(pool.address)
+        if previous is not None:
+            self._by_asset[previous.asset].remove(previous)
+        self._pools[pool.address] = pool
+        self._by_asset.setdefault(pool.asset, []).append(pool)
+
+    def get(self, address: str) -> Optional[PoolInfo]:
+        """The pool at `address`, or None if not registered."""
+        return self._pools.get(address)
+
+    def for_asset(self, asset: str) -> List[PoolInfo]:
+        """Pools pricing `asset`."""
+        return self._by_asset.get(asset, [])
+
+    def addresses(self, program: Optional[str] = None) -> List[str]:
+        """Registered addresses, optionally only one program's."""
+        return [a for a, pool in self._pools.items() if program is None or pool.program == program]
+
+    def __len__(self) -> int:
+        return len(self._pools)
+
+    def __contains__(self, address: str) -> bool:
+        return address in self._pools
+
+    @classmethod
+    def from_file(cls, path: str, assets: Optional[Iterable[str]] = None) -> "PoolRegistry":
+        """Load a JSON list of pools, optionally restricted to `assets`.
+
+        Raises:
+            ValueError: If an entry is invalid (pydantic ``ValidationError``)
+                or prices an asset not in `assets`.
+        """
+        with open(path) as f:
+            entries = json.load(f)
+        pools = [PoolInfo.model_validate(entry) for entry in entries]
+        if assets is not None:
+            allowed = set(assets)
+            unknown = sorted({pool.asset for pool in pools} - allowed)
+            if unknown:
+                raise ValueError(f"{path}: pools for assets not in ASSET_LIST: {', '.join(unknown)}")
+        return cls(pools)
+
+    @classmethod
+    def default(cls) -> "PoolRegistry":
+        """The SOL/USDC Whirlpool only."""
+        return cls([PoolInfo(
+            address=settings.orca_sol_usdc_pool or DEFAULT_SOL_USDC_WHIRLPOOL,
+            program="whirlpool",
+            asset="SOL-USD",
+            base_mint=settings.wsol_mint,
+            quote_mint=settings.usdc_mint,
+            base_decimals=WSOL_DECIMALS,
+            quote_decimals=USDC_DECIMALS,
+            fee_bps=30
+        )])
+
+
+def load_registry() -> PoolRegistry:
+    """Registry from ``settings.pool_registry_file``, or the default pool."""
+    if not settings.pool_registry_file:
+        return PoolRegistry.default()
+    registry = PoolRegistry.from_file(settings.pool_registry_file, settings.assets)
+    logger.info("Loaded %d pools from %s", len(registry), settings.pool_registry_file)
+    return registry
+
+
+# Global instance
+pool_registry = load_registry()
@@ -0,0 +1,192 @@
+"""Pluggable transports carrying event bus traffic between processes.
+
+The default :class:`Transport` keeps everything in-process. With
+:class:`UnixSocketTransport`, each process listens on its own Unix domain
+socket and connects to its peers' sockets; events on exported topics are
+encoded with :mod:`shared.codec` and written to every connected peer, which
+dispatches them to its local subscribers. Received events are never
+re-forwarded, so a full mesh of processes does not loop.
+
+Frame layout: ``u32 length | u8 topic length | topic | encoded event``.
+"""
+import asyncio
+import logging
+import os
+import struct
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from shared.codec import encode_event, decode_event, CodecError
+
+logger = logging.getLogger(__name__)
+
+_FRAME_HEADER = struct.Struct("<IB")
+_U32 = struct.Struct("<I")
+
+
+def encode_frame(event_type: str, data: Any) -> bytes:
+    """Encode one event as a length-prefixed frame."""
+    topic = event_type.encode()
+    payload = encode_event(data)
+    return _FRAME_HEADER.pack(1 + len(topic) + len(payload), len(topic)) + topic + payload
+
+
+def decode_frame(body: bytes) -> Tuple[str, Any]:
+    """Decode a frame body (everything after the u32 length)."""
+    topic_len = body[0]
+    event_type = body[1:1 + topic_len].decode()
+    return event_type, decode_event(memoryview(body)[1 + topic_len:])
+
+
+class Transport:
+    """In-process transport: events never leave the process (default)."""
+
+    name = "inprocess"
+
+    async def start(self, bus) -> None:
+        """Start accepting and forwarding events for `bus`."""
+
+    def send(self, event_type: str, data: Any) -> None:
+        """Forward a locally published event to peers."""
+
+    async def stop(self) -> None:
+        """Close all connections."""
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get transport statistics."""
+        return {"transport": self.name}
+
+
+class UnixSocketTransport(Transport):
+    """Event transport over Unix domain sockets."""
+
+    name = "unix"
+
+    def __init__(
+        self,
+        listen_path: Optional[str] = None,
+        peers: Sequence[str] = (),
+        max_buffer_bytes: int = 4 * 1024 * 1024,
+        reconnect_delay: float = 1.0
+    ):
+        self.listen_path = listen_path
+        self.peers = list(peers)
+        self.max_buffer_bytes = max_buffer_bytes
+        self.reconnect_delay = reconnect_delay
+        self._bus = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers: Dict[str, asyncio.StreamWriter] = {}
+        self._inbound: Dict[asyncio.StreamWriter, asyncio.Task] = {}
+        self._tasks: List[asyncio.Task] = []
+        self.sent = 0
+        self.received = 0
+        self.dropped = 0
+
+    async def start(self, bus) -> None:
+        """Listen for inbound peers and connect to outbound peers."""
+        self._bus = bus
+        if self.listen_path:
+            if os.path.exists(self.listen_path):
+                os.unlink(self.listen_path)
+            self._server = await asyncio.start_unix_server(self._serve_peer, path=self.listen_path)
+            logger.info(f"Event transport listening on {self.listen_path}")
+        for path in self.peers:
+            self._tasks.append(asyncio.create_task(self._connect_peer(path)))
+
+    async def wait_connected(self, timeout: float = 5.0) -> None:
+        """Wait until every outbound peer is connected."""
+        deadline = asyncio.get_running_loop().time() + timeout
+        while len(self._writers) < len(self.peers):
+            if asyncio.get_running_loop().time() > deadline:
+                raise TimeoutError(f"Event transport peers not reachable: {self.peers}")
+            await asyncio.sleep(0.01)
+
+    async def _connect_peer(self, path: str) -> None:
+        """Keep an outbound connection to one peer open, reconnecting on loss."""
+        while True:
+            try:
+                reader, writer = await asyncio.open_unix_connection(path)
+            except OSError as e:
+                logger.debug(f"Event transport peer {path} unavailable: {e}")
+                await asyncio.sleep(self.reconnect_delay)
+                continue
+
+            self._writers[path] = writer
+            logger.info(f"Event transport connected to {path}")
+            try:
+                # Peers never write back; EOF means the peer went away
+                await reader.read()
+            finally:
+                self._writers.pop(path, None)
+                writer.close()
+            logger.warning(f"Event transport peer {path} disconnected, reconnecting...")
+            await asyncio.sleep(self.reconnect_delay)
+
+    def send(self, event_type: str, data: Any) -> None:
+        """Write an event frame to every connected peer without waiting."""
+        if not self._writers:
+            return
+        frame = encode_frame(event_type, data)
+        for writer in self._writers.values():
+            # Never block the publisher: drop if a peer stops draining
+            if writer.transport.get_write_buffer_size() > self.max_buffer_bytes:
+                self.dropped += 1
+                continue
+            writer.write(frame)
+        self.sent += 1
+
+    async def _serve_peer(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Read frames from an inbound peer and dispatch them locally."""
+        self._inbound[writer] = asyncio.current_task()
+        try:
+            while True:
+                header = await reader.readexactly(4)
+                body = await reader.readexactly(_U32.unpack(header)[0])
+                try:
+                    event_type, data = decode_frame(body)
+                except CodecError as e:
+                    logger.error(f"Event transport dropped malformed frame: {e}")
+                    continue
+                self.received += 1
+                await self._bus.publish_local(event_type, data)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._inbound.pop(writer, None)
+            writer.close()
+
+    async def stop(self) -> None:
+        """Close the listener and all peer connections."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        # Closing the socket ends each inbound reader with EOF
+        handlers = list(self._inbound.values())
+        for writer in list(self._inbound):
+            writer.close()
+        await asyncio.gather(*handlers, return_exceptions=True)
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            if self.listen_path and os.path.exists(self.listen_path):
+                os.unlink(self.listen_path)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get transport statistics."""
+        return {
+            "transport": self.name,
+            "peers_connected": len(self._writers),
+            "sent": self.sent,
+            "received": self.received,
+            "dropped": self.dropped
+        }
+
+
+def build_transport(kind: str, listen_path: Optional[str] = None, peers: Sequence[str] = ()) -> Transport:
+    """Create the transport selected in settings."""
+    if kind == "inprocess":
+        return Transport()
+    if kind == "unix":
+        return UnixSocketTransport(listen_path=listen_path, peers=peers)
+    raise ValueError(f"Unknown event transport: {kind}")
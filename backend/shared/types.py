@@ -37,6 +37,13 @@ class OrderStatus(str, Enum):
     FAILED = "failed"
 
 
+class OpportunityState(str, Enum):
+    """Lifecycle of a spread episode."""
+    OPEN = "open"
+    UPDATED = "updated"
+    CLOSED = "closed"
+
+
 class BookUpdate(BaseModelWithTimezone):
     """CEX order book update event."""
     venue: str
@@ -55,6 +62,7 @@ class PoolUpdate(BaseModelWithTimezone):
     reserves: Dict[str, str]  # {mint: amount}
     price_mid: Decimal
     fee_bps: int
+    stamps: Dict[str, int] = Field(default_factory=dict, exclude=True)  # Stage -> monotonic ns
 
 
 class BoundQuote(BaseModelWithTimezone):
@@ -81,6 +89,15 @@ class Opportunity(BaseModelWithTimezone):
     size: Decimal
     timestamp: datetime
     window_id: Optional[str] = None
+    cex_venue: str = "gemini"  # Venue holding the CEX side
+    cex_symbol: Optional[str] = None  # The venue's own symbol, e.g. "solusd"
+    dex_pool: Optional[str] = None  # Address of the pool holding the DEX side
+    state: OpportunityState = OpportunityState.OPEN
+    peak_spread_pct: Optional[Decimal] = None
+    updates: int = 0  # Re-evaluations while open
+    closed_ts: Optional[datetime] = None
+    expected_pnl_usd: Optional[Decimal] = None  # At the sized trade, after fees
+    stamps: Dict[str, int] = Field(default_factory=dict, exclude=True)  # Stage -> monotonic ns
 
 
 class Trade(BaseModelWithTimezone):
@@ -101,6 +118,8 @@ class Trade(BaseModelWithTimezone):
     cex_order_id: Optional[str] = None
     dex_tx_sig: Optional[str] = None
     status: OrderStatus = OrderStatus.PENDING
+    latency_breakdown: Dict[str, float] = Field(default_factory=dict)  # Stage -> ms since previous stage
+    stamps: Dict[str, int] = Field(default_factory=dict, exclude=True)  # Stage -> monotonic ns
 
 
 class Window(BaseModelWithTimezone):
@@ -0,0 +1,67 @@
+"""JSON decoding for venue WebSocket feeds.
+
+Uses ``orjson`` when it is installed (several times faster on the large
+Coinbase snapshots) and falls back to the stdlib ``json`` module otherwise.
+``orjson`` is optional; nothing else changes when it is missing.
+
+Frames a connector ignores can be dropped by their raw prefix before any
+parsing, see :func:`prefix_filter`.
+"""
+import json
+import logging
+from typing import Any, Callable, Dict, Iterable, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+Frame = Union[str, bytes]
+Decoder = Callable[[Frame], Any]
+
+DECODERS: Dict[str, Decoder] = {"stdlib": json.loads}
+if orjson is not None:
+    DECODERS["orjson"] = orjson.loads
+
+
+def get_decoder(name: str = "auto") -> Decoder:
+    """Decoder by name: "auto" (fastest available), "orjson" or "stdlib".
+
+    Decoders raise ``json.JSONDecodeError`` (or a subclass) on bad input.
+
+    Raises:
+        ValueError: If `name` is not a known decoder.
+    """
+    if name == "auto":
+        name = "orjson" if "orjson" in DECODERS else "stdlib"
+    elif name == "orjson" and "orjson" not in DECODERS:
+        logger.warning("orjson requested but not installed, using stdlib json")
+        name = "stdlib"
+    elif name not in DECODERS:
+        raise ValueError(f"Unknown JSON decoder {name!r}, expected auto/orjson/stdlib")
+    return DECODERS[name]
+
+
+def decoder_name(decoder: Decoder) -> str:
+    """Name of a decoder returned by :func:`get_decoder`."""
+    for name, candidate in DECODERS.items():
+        if candidate is decoder:
+            return name
+    return getattr(decoder, "__name__", "custom")
+
+
+def prefix_filter(prefixes: Iterable[str]) -> Callable[[Frame], bool]:
+    """Predicate that is True for frames starting with any of `prefixes`.
+
+    Matches text and binary frames; prefixes must be written exactly as the
+    venue serializes them (no whitespace, same key order).
+    """
+    text = tuple(prefixes)
+    raw = tuple(p.encode() for p in text)
+
+    def matches(frame: Frame) -> bool:
+        return frame.startswith(raw if isinstance(frame, bytes) else text)
+
+    return matches
@@ -0,0 +1,106 @@
+"""Benchmark: eager BookUpdate vs lazy BookView per market data message.
+
+Each message applies one near-top level change to a deep book, builds the
+``cex.bookUpdate`` event and reads best bid/ask the way SignalEngine does.
+Three variants:
+
+- eager:             to_book_update() + parse bids[0][0] / asks[0][0]
+- view:              view() + best_bid / best_ask
+- view+materialize:  view() + to_book_update(), i.e. a consumer that needs
+                     the model (transport, journal)
+
+CPU is timed without tracing. Allocation is measured with tracemalloc as
+the memory held by retained events, divided by the number of events.
+
+Run from the repository root:
+    python benchmarks/bench_book_view.py
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../backend'))
+
+from shared.orderbook import OrderBook
+
+DEPTH = 1000
+MESSAGES = 20000
+RETAINED = 2000
+MID = 14500  # cents
+
+
+def make_book_and_changes(seed: int = 1):
+    """Deep SOL-USD book and a stream of near-top (is_bid, price, size) changes."""
+    rng = random.Random(seed)
+    book = OrderBook("gemini", "solusd")
+    book.load(
+        [(Decimal(MID - 1 - i) / 100, Decimal("5")) for i in range(DEPTH)],
+        [(Decimal(MID + 1 + i) / 100, Decimal("5")) for i in range(DEPTH)]
+    )
+    changes = []
+    for _ in range(MESSAGES):
+        is_bid = rng.random() < 0.5
+        offset = int(rng.expovariate(0.2))
+        cents = MID - 1 - offset if is_bid else MID + 1 + offset
+        changes.append((is_bid, Decimal(cents) / 100, Decimal(rng.choice([0, 1, 2, 5]))))
+    return book, changes
+
+
+def eager(book: OrderBook):
+    event = book.to_book_update(10)
+    return event, Decimal(event.bids[0][0]), Decimal(event.asks[0][0])
+
+
+def view(book: OrderBook):
+    event = book.view(10)
+    return event, event.best_bid, event.best_ask
+
+
+def view_materialize(book: OrderBook):
+    event = book.view(10)
+    event.to_book_update()
+    return event, event.best_bid, event.best_ask
+
+
+def cpu_us_per_message(make_event) -> float:
+    book, changes = make_book_and_changes()
+    start = time.perf_counter()
+    for is_bid, price, size in changes:
+        book.side(is_bid).update(price, size)
+        make_event(book)
+    return (time.perf_counter() - start) / MESSAGES * 1e6
+
+
+def bytes_per_event(make_event) -> float:
+    book, changes = make_book_and_changes()
+    retained = []
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for is_bid, price, size in changes[:RETAINED]:
+        book.side(is_bid).update(price, size)
+        retained.append(make_event(book)[0])
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / RETAINED
+
+
+def main():
+    print("=" * 60)
+    print("BookUpdate vs BookView Benchmark")
+    print("=" * 60)
+    print(f"{MESSAGES} messages, {DEPTH} levels/side, top 10 per event\n")
+
+    print(f"{'variant':<20}{'us/msg':>10}{'bytes/event':>14}")
+    baseline = None
+    for label, make_event in (("eager", eager), ("view", view), ("view+materialize", view_materialize)):
+        cpu = min(cpu_us_per_message(make_event) for _ in range(3))
+        size = bytes_per_event(make_event)
+        baseline = baseline or cpu
+        print(f"{label:<20}{cpu:>10.2f}{size:>14,.0f}   ({baseline / cpu:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
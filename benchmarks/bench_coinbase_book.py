@@ -0,0 +1,142 @@
+"""Benchmark: Coinbase level2 event application.
+
+Compares the previous handler (rebuild, sort and truncate a 20-level list
+for every entry of an update event) with the full-depth OrderBook applying
+each event as one batch, for several batch sizes. Also times loading a
+deep snapshot.
+
+Run from the repository root:
+    python benchmarks/bench_coinbase_book.py
+"""
+import os
+import random
+import sys
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../backend'))
+
+from shared.orderbook import OrderBook
+
+SNAPSHOT_DEPTH = 5000
+EVENTS = 2000
+BATCH_SIZES = [1, 10, 50]
+MID = 14500  # cents
+
+
+def make_snapshot() -> list:
+    """Coinbase snapshot entries around the mid price."""
+    updates = []
+    for i in range(SNAPSHOT_DEPTH):
+        updates.append({"side": "bid", "price_level": f"{(MID - 1 - i) / 100:.2f}", "new_quantity": "5"})
+        updates.append({"side": "offer", "price_level": f"{(MID + 1 + i) / 100:.2f}", "new_quantity": "5"})
+    return updates
+
+
+def make_events(batch: int, seed: int = 1) -> list:
+    """Update events of `batch` entries clustered near the top of the book."""
+    rng = random.Random(seed)
+    events = []
+    for _ in range(EVENTS):
+        updates = []
+        for _ in range(batch):
+            side = rng.choice(["bid", "offer"])
+            offset = int(rng.expovariate(0.1))
+            cents = MID - 1 - offset if side == "bid" else MID + 1 + offset
+            updates.append({
+                "side": side,
+                "price_level": f"{cents / 100:.2f}",
+                "new_quantity": rng.choice(["0", "1", "2", "5"])
+            })
+        events.append(updates)
+    return events
+
+
+def old_load(snapshot) -> dict:
+    bids, asks = [], []
+    for update in snapshot:
+        price = float(update["price_level"])
+        size = float(update["new_quantity"])
+        (bids if update["side"] == "bid" else asks).append((price, size))
+    return {
+        "bids": sorted(bids, key=lambda x: x[0], reverse=True)[:20],
+        "asks": sorted(asks, key=lambda x: x[0])[:20]
+    }
+
+
+def old_apply(book: dict, updates) -> None:
+    for update in updates:
+        price = float(update["price_level"])
+        size = float(update["new_quantity"])
+        if update["side"] == "bid":
+            bids_dict = {p: s for p, s in book["bids"]}
+            if size == 0:
+                bids_dict.pop(price, None)
+            else:
+                bids_dict[price] = size
+            book["bids"] = sorted(bids_dict.items(), key=lambda x: x[0], reverse=True)[:20]
+        else:
+            asks_dict = {p: s for p, s in book["asks"]}
+            if size == 0:
+                asks_dict.pop(price, None)
+            else:
+                asks_dict[price] = size
+            book["asks"] = sorted(asks_dict.items(), key=lambda x: x[0])[:20]
+
+
+def new_load(snapshot) -> OrderBook:
+    book = OrderBook()
+    bids, asks = [], []
+    for update in snapshot:
+        level = (Decimal(update["price_level"]), Decimal(update["new_quantity"]))
+        (bids if update["side"] == "bid" else asks).append(level)
+    book.bids.load(bids)
+    book.asks.load(asks)
+    return book
+
+
+def new_apply(book: OrderBook, updates) -> None:
+    book.apply(
+        (u["side"] == "bid", Decimal(u["price_level"]), Decimal(u["new_quantity"]))
+        for u in updates
+    )
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    print("=" * 60)
+    print("Coinbase Level2 Book Benchmark")
+    print("=" * 60)
+
+    snapshot = make_snapshot()
+    old_book, old_secs = timed(old_load, snapshot)
+    new_book, new_secs = timed(new_load, snapshot)
+    print(f"Snapshot ({SNAPSHOT_DEPTH} levels/side): old {old_secs * 1e3:.1f}ms (keeps 20), "
+          f"new {new_secs * 1e3:.1f}ms (keeps {len(new_book.bids)})\n")
+
+    print(f"{'updates/event':<15}{'old (us/event)':>16}{'new (us/event)':>16}{'speedup':>10}")
+    for batch in BATCH_SIZES:
+        events = make_events(batch)
+        old_book = old_load(snapshot)
+        new_book = new_load(snapshot)
+
+        start = time.perf_counter()
+        for updates in events:
+            old_apply(old_book, updates)
+        old_us = (time.perf_counter() - start) / EVENTS * 1e6
+
+        start = time.perf_counter()
+        for updates in events:
+            new_apply(new_book, updates)
+        new_us = (time.perf_counter() - start) / EVENTS * 1e6
+
+        print(f"{batch:<15}{old_us:>16.1f}{new_us:>16.1f}{old_us / new_us:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Benchmark: in-process event bus vs Unix socket transport.
+
+Publishes BookUpdate events and measures burst throughput (events/sec) and
+paced publish-to-handle latency percentiles (one event in flight at a time)
+for both transports. The Unix socket case runs a sender bus and a receiver
+bus on the same event loop connected through a real socket, so it includes
+encoding, the kernel round trip and decoding but not cross-core scheduling.
+
+Run from the repository root:
+    python benchmarks/bench_event_transport.py
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../backend'))
+
+from shared.events import EventBus
+from shared.transport import UnixSocketTransport
+from shared.types import BookUpdate
+
+TOTAL_EVENTS = 20000
+LATENCY_EVENTS = 5000
+BATCH_SIZE = 100  # Yield to the loop every N publishes, like a WS reader
+
+
+def make_book(sequence: int) -> BookUpdate:
+    """Create a 10-level book update."""
+    return BookUpdate(
+        venue="gemini",
+        pair="solusd",
+        timestamp=datetime.now(timezone.utc),
+        bids=[[f"{145 - i * 0.01:.2f}", "12.5"] for i in range(10)],
+        asks=[[f"{145.01 + i * 0.01:.2f}", "8.25"] for i in range(10)],
+        sequence=sequence
+    )
+
+
+async def run_case(sender: EventBus, receiver: EventBus, label: str) -> dict:
+    """Measure throughput and latency of events from `sender` to `receiver`."""
+    books = [make_book(i) for i in range(TOTAL_EVENTS)]
+    sent_ns = [0] * TOTAL_EVENTS
+    latencies_us = []
+    received = 0
+    target = 0
+    arrived = asyncio.Event()
+
+    async def handler(book):
+        nonlocal received
+        latencies_us.append((time.perf_counter_ns() - sent_ns[book.sequence]) / 1000)
+        received += 1
+        if received >= target:
+            arrived.set()
+
+    receiver.subscribe("cex.bookUpdate", handler)
+
+    # Burst throughput
+    target = TOTAL_EVENTS
+    start = time.perf_counter()
+    for i, book in enumerate(books):
+        sent_ns[i] = time.perf_counter_ns()
+        await sender.publish("cex.bookUpdate", book)
+        if i % BATCH_SIZE == 0:
+            await asyncio.sleep(0)
+    await asyncio.wait_for(arrived.wait(), timeout=60)
+    elapsed = time.perf_counter() - start
+
+    # Paced latency: one event in flight
+    latencies_us.clear()
+    received = 0
+    for i in range(LATENCY_EVENTS):
+        target = i + 1
+        arrived.clear()
+        sent_ns[i] = time.perf_counter_ns()
+        await sender.publish("cex.bookUpdate", books[i])
+        await asyncio.wait_for(arrived.wait(), timeout=5)
+
+    latencies_us.sort()
+    return {
+        "label": label,
+        "events_per_sec": TOTAL_EVENTS / elapsed,
+        "p50_us": statistics.median(latencies_us),
+        "p99_us": latencies_us[int(len(latencies_us) * 0.99) - 1],
+        "max_us": latencies_us[-1],
+    }
+
+
+async def bench_inprocess() -> dict:
+    bus = EventBus()
+    return await run_case(bus, bus, "in-process")
+
+
+async def bench_unix_socket() -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.sock")
+        sender, receiver = EventBus(), EventBus()
+
+        receiver_transport = UnixSocketTransport(listen_path=path)
+        await receiver_transport.start(receiver)
+
+        sender_transport = UnixSocketTransport(peers=[path], max_buffer_bytes=256 * 1024 * 1024)
+        sender.set_transport(sender_transport, ["cex.bookUpdate"])
+        await sender_transport.start(sender)
+        await sender_transport.wait_connected()
+
+        try:
+            return await run_case(sender, receiver, "unix socket")
+        finally:
+            await sender_transport.stop()
+            await receiver_transport.stop()
+
+
+async def main():
+    print("=" * 60)
+    print("Event Bus Transport Benchmark")
+    print("=" * 60)
+    print(f"Throughput: {TOTAL_EVENTS} BookUpdates (10 levels/side), burst")
+    print(f"Latency: {LATENCY_EVENTS} BookUpdates, one in flight\n")
+
+    results = [await bench_inprocess(), await bench_unix_socket()]
+
+    print(f"{'transport':<14}{'events/sec':>14}{'p50 (us)':>12}{'p99 (us)':>12}{'max (us)':>12}")
+    for r in results:
+        print(
+            f"{r['label']:<14}{r['events_per_sec']:>14,.0f}"
+            f"{r['p50_us']:>12.1f}{r['p99_us']:>12.1f}{r['max_us']:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
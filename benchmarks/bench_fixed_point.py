@@ -0,0 +1,96 @@
+"""Benchmark: end-to-end tick cost in Decimal vs fixed-point mode.
+
+Each tick is a Gemini-style ``l2_updates`` message: parse the changed
+levels into a deep OrderBook, publish its top-10 view, and run
+SignalEngine spread detection on it against the current DEX price, all on
+a private inline event bus.
+
+SignalEngine loads backend settings, so run with the backend environment
+available (backend/.env or exported variables), e.g. from backend/:
+    python ../benchmarks/bench_fixed_point.py
+"""
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../backend'))
+
+from shared.events import EventBus
+from shared.fixedpoint import scale_for
+from shared.orderbook import OrderBook
+from shared.pools import pool_registry
+from shared.types import PoolUpdate
+from engines.signal_engine import SignalEngine
+
+DEPTH = 2000
+TICKS = 20000
+CHANGES_PER_TICK = 3
+ROUNDS = 3  # Best of N, alternating modes
+MID = 1450000  # 1e-4 USD
+
+
+def make_ticks(seed: int = 1):
+    """Snapshot changes and l2_updates change lists as venue strings."""
+    rng = random.Random(seed)
+    snapshot = [["buy", f"{(MID - 100 - i * 100) / 10000:.4f}", "5.0"] for i in range(DEPTH)]
+    snapshot += [["sell", f"{(MID + 100 + i * 100) / 10000:.4f}", "5.0"] for i in range(DEPTH)]
+    ticks = []
+    for _ in range(TICKS):
+        changes = []
+        for _ in range(CHANGES_PER_TICK):
+            side = rng.choice(["buy", "sell"])
+            offset = 100 + int(rng.expovariate(0.2)) * 100
+            price = MID - offset if side == "buy" else MID + offset
+            changes.append([side, f"{price / 10000:.4f}", rng.choice(["0", "1.25", "2.5", "5.0"])])
+        ticks.append(changes)
+    return snapshot, ticks
+
+
+async def run_mode(fixed: bool, snapshot, ticks) -> float:
+    """Process all ticks and return seconds elapsed."""
+    bus = EventBus()
+    engine = SignalEngine(bus=bus, fixed_point=fixed)
+    engine.threshold_pct = Decimal("100")  # Measure detection, not opportunity emission
+
+    await bus.publish("dex.poolUpdate", PoolUpdate(
+        program="whirlpool", pool=pool_registry.for_asset("SOL-USD")[0].address, timestamp=datetime.now(timezone.utc),
+        reserves={}, price_mid=Decimal("145.2345"), fee_bps=30
+    ))
+
+    book = OrderBook("gemini", "solusd", scale_for("solusd", fixed))
+    price, size = book.scale.price, book.scale.size
+    for side_str, price_str, size_str in snapshot:
+        book.side(side_str == "buy").update(price(price_str), size(size_str))
+
+    start = time.perf_counter()
+    for changes in ticks:
+        for side_str, price_str, size_str in changes:
+            book.side(side_str == "buy").update(price(price_str), size(size_str))
+        await bus.publish("cex.bookUpdate", book.view(10))
+    return time.perf_counter() - start
+
+
+async def main():
+    print("=" * 60)
+    print("Fixed-Point vs Decimal Tick Benchmark")
+    print("=" * 60)
+    print(f"{TICKS} ticks x {CHANGES_PER_TICK} level changes, {DEPTH} levels/side, best of {ROUNDS}\n")
+
+    snapshot, ticks = make_ticks()
+    results = {False: float("inf"), True: float("inf")}
+    for _ in range(ROUNDS):
+        for fixed in (False, True):
+            results[fixed] = min(results[fixed], await run_mode(fixed, snapshot, ticks))
+
+    print(f"{'mode':<14}{'us/tick':>12}{'ticks/sec':>14}")
+    for fixed, label in ((False, "decimal"), (True, "fixed-point")):
+        secs = results[fixed]
+        print(f"{label:<14}{secs / TICKS * 1e6:>12.2f}{TICKS / secs:>14,.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
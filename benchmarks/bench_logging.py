@@ -0,0 +1,104 @@
+"""Benchmark: per-tick SignalEngine cost under different logging setups.
+
+Each tick applies one near-top change to a Gemini book and publishes its
+view; every tick produces an opportunity, so the engine logs on every path.
+The root logger writes to a temporary file, flushed per record:
+
+- off:                 root at WARNING, nothing emitted
+- sync DEBUG:          StreamHandler on the event loop thread, all hot-path logs
+- queue DEBUG:         formatting and writing on the listener thread
+- queue DEBUG+limit:   same, with the default per-call-site rate limit
+- queue INFO+limit:    the production default (LOG_* settings)
+
+Run from the repository root:
+    python benchmarks/bench_logging.py
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../backend'))
+
+from shared.events import EventBus
+from shared.orderbook import OrderBook
+from shared.pools import pool_registry
+from shared.types import PoolUpdate
+from engines.signal_engine import SignalEngine
+from observability.logging_setup import configure_logging, shutdown_logging
+
+TICKS = 20000
+MID = 14500  # cents
+
+
+def make_changes(seed: int = 1):
+    rng = random.Random(seed)
+    changes = []
+    for _ in range(TICKS):
+        is_bid = rng.random() < 0.5
+        offset = int(rng.expovariate(0.2))
+        cents = MID - 1 - offset if is_bid else MID + 1 + offset
+        changes.append((is_bid, Decimal(cents) / 100, Decimal(rng.choice([0, 20, 50, 100]))))
+    return changes
+
+
+async def us_per_tick(changes) -> float:
+    bus = EventBus()
+    engine = SignalEngine(bus=bus, fixed_point=False)
+    await engine.handle_dex_update(PoolUpdate(
+        program="whirlpool", pool=pool_registry.for_asset("SOL-USD")[0].address, timestamp=datetime.now(timezone.utc),
+        reserves={}, price_mid=Decimal("150"), fee_bps=30
+    ))
+    book = OrderBook("gemini", "solusd")
+    book.load(
+        [(Decimal(MID - 1 - i) / 100, Decimal("100")) for i in range(100)],
+        [(Decimal(MID + 1 + i) / 100, Decimal("100")) for i in range(100)]
+    )
+    start = time.perf_counter()
+    for is_bid, price, size in changes:
+        book.side(is_bid).update(price, size)
+        await engine.handle_cex_update(book.view(10))
+    return (time.perf_counter() - start) / len(changes) * 1e6
+
+
+def run_variant(changes, stream, level, use_queue, rate) -> float:
+    configure_logging(level, "text", use_queue=use_queue, rate=rate, stream=stream)
+    try:
+        return asyncio.run(us_per_tick(changes))
+    finally:
+        # Count the listener's backlog as part of the run's cost
+        start = time.perf_counter()
+        shutdown_logging()
+        drain = time.perf_counter() - start
+        if drain > 0.01:
+            print(f"    (listener drained backlog in {drain:.2f}s)")
+
+
+def main():
+    print("=" * 60)
+    print("Hot-Path Logging Benchmark")
+    print("=" * 60)
+    print(f"{TICKS} book updates through SignalEngine\n")
+
+    changes = make_changes()
+    variants = (
+        ("off", "WARNING", False, 0),
+        ("sync DEBUG", "DEBUG", False, 0),
+        ("queue DEBUG", "DEBUG", True, 0),
+        ("queue DEBUG+limit", "DEBUG", True, 10.0),
+        ("queue INFO+limit", "INFO", True, 10.0),
+    )
+
+    print(f"{'variant':<22}{'us/tick':>10}")
+    with tempfile.TemporaryFile("w") as stream:
+        for label, level, use_queue, rate in variants:
+            cost = run_variant(changes, stream, level, use_queue, rate)
+            print(f"{label:<22}{cost:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Benchmark: sorted incremental order book vs dict + full sort.
+
+Loads a deep snapshot, then applies single-level updates clustered near the
+top of the book (like an ``l2_updates`` stream), extracting the top 10
+levels per side after each update and reading best bid/ask, as the Gemini
+connector does per message.
+
+Run from the repository root:
+    python benchmarks/bench_orderbook.py
+"""
+import os
+import random
+import sys
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../backend'))
+
+from shared.orderbook import OrderBook
+
+DEPTHS = [100, 1000, 5000]
+UPDATES = 5000
+MID = 14500  # cents
+
+
+def make_stream(depth: int, seed: int = 1):
+    """Snapshot levels and a stream of near-top updates as Decimals."""
+    rng = random.Random(seed)
+    snapshot = [("buy", Decimal(MID - 1 - i) / 100, Decimal("5")) for i in range(depth)]
+    snapshot += [("sell", Decimal(MID + 1 + i) / 100, Decimal("5")) for i in range(depth)]
+    updates = []
+    for _ in range(UPDATES):
+        side = rng.choice(["buy", "sell"])
+        offset = int(rng.expovariate(0.1))
+        cents = MID - 1 - offset if side == "buy" else MID + 1 + offset
+        size = Decimal(rng.choice([0, 1, 2, 5, 10]))
+        updates.append((side, Decimal(cents) / 100, size))
+    return snapshot, updates
+
+
+def run_dict(snapshot, updates) -> float:
+    """Previous implementation: dict per side, sort on every message."""
+    book = {"bids": {}, "asks": {}}
+
+    def apply(side_str, price, size):
+        side_book = book["bids"] if side_str == "buy" else book["asks"]
+        if size == 0:
+            side_book.pop(price, None)
+        else:
+            side_book[price] = size
+
+    for change in snapshot:
+        apply(*change)
+
+    start = time.perf_counter()
+    for change in updates:
+        apply(*change)
+        bids = [[str(p), str(s)] for p, s in sorted(book["bids"].items(), reverse=True)[:10]]
+        asks = [[str(p), str(s)] for p, s in sorted(book["asks"].items())[:10]]
+        best = (max(book["bids"].keys()), min(book["asks"].keys()))
+    return time.perf_counter() - start
+
+
+def run_sorted(snapshot, updates) -> float:
+    """OrderBook with bisect-maintained sides."""
+    book = OrderBook()
+    for side_str, price, size in snapshot:
+        book.side(side_str == "buy").update(price, size)
+
+    start = time.perf_counter()
+    for side_str, price, size in updates:
+        book.side(side_str == "buy").update(price, size)
+        bids = [[str(p), str(s)] for p, s in book.bids.top(10)]
+        asks = [[str(p), str(s)] for p, s in book.asks.top(10)]
+        best = book.best_bid_ask()
+    return time.perf_counter() - start
+
+
+def main():
+    print("=" * 60)
+    print("Order Book Update Benchmark")
+    print("=" * 60)
+    print(f"{UPDATES} near-top updates per run; top-10 + best bid/ask per update\n")
+
+    print(f"{'depth/side':<12}{'dict (us/upd)':>16}{'sorted (us/upd)':>18}{'speedup':>10}")
+    for depth in DEPTHS:
+        snapshot, updates = make_stream(depth)
+        old = run_dict(snapshot, updates) / UPDATES * 1e6
+        new = run_sorted(snapshot, updates) / UPDATES * 1e6
+        print(f"{depth:<12}{old:>16.2f}{new:>18.2f}{old / new:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
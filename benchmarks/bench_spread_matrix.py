@@ -0,0 +1,88 @@
+"""Benchmark: SpreadMatrix recompute cost as venues and pools grow.
+
+Each update writes one random CEX or DEX price, then recomputes the full
+asset x venue x pool spread and net PnL cubes (what SignalEngine does per
+event with SPREAD_MATRIX_ENABLED). `best` adds the per-asset arg-max, which
+the API runs on demand. Compared against a scalar loop over the same cells
+for reference.
+
+Run from the repository root:
+    python benchmarks/bench_spread_matrix.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../backend'))
+
+from engines.spread_matrix import SpreadMatrix
+
+ASSETS = ["SOL-USD", "BTC-USD", "ETH-USD", "JUP-USD", "BONK-USD"]
+UPDATES = 5000
+BUDGET_US = 100.0
+
+
+def make_matrix(venues: int, pools: int, rng: random.Random) -> SpreadMatrix:
+    fees = {f"cex{i}": rng.uniform(0.1, 0.6) for i in range(venues)}
+    matrix = SpreadMatrix(ASSETS, fees, haircut_pct=0.75)
+    for asset in ASSETS:
+        for venue in fees:
+            matrix.update_cex(asset, venue, 99.0 + rng.random(), 100.0 + rng.random())
+        for p in range(pools):
+            matrix.update_dex(asset, f"pool{p}", 99.0 + 2 * rng.random(), 100.0 + 2 * rng.random(), 30)
+    return matrix
+
+
+def scalar_pass(matrix: SpreadMatrix) -> float:
+    """Same math in plain Python loops, returning the best net spread."""
+    best = float("-inf")
+    for a in range(len(matrix.assets)):
+        for v in range(len(matrix.venues)):
+            bid, ask = float(matrix.cex_bid[a, v]), float(matrix.cex_ask[a, v])
+            for p in range(len(matrix.pools)):
+                sell, buy = float(matrix.dex_sell[a, p]), float(matrix.dex_buy[a, p])
+                costs = float(matrix.venue_fee_pct[v]) + float(matrix.pool_fee_pct[p]) + matrix.haircut_pct
+                best = max(best, (sell - ask) / ask * 100 - costs, (bid - buy) / buy * 100 - costs)
+    return best
+
+
+def us_per_update(matrix: SpreadMatrix, rng: random.Random, step) -> float:
+    updates = []
+    for _ in range(UPDATES):
+        asset = rng.choice(ASSETS)
+        if rng.random() < 0.5:
+            updates.append((True, asset, rng.choice(matrix.venues), 99.0 + rng.random(), 100.0 + rng.random()))
+        else:
+            updates.append((False, asset, rng.choice(matrix.pools), 99.0 + 2 * rng.random(), 100.0 + 2 * rng.random()))
+
+    start = time.perf_counter()
+    for is_cex, asset, key, low, high in updates:
+        if is_cex:
+            matrix.update_cex(asset, key, low, high)
+        else:
+            matrix.update_dex(asset, key, low, high, 30)
+        step(matrix)
+    return (time.perf_counter() - start) / UPDATES * 1e6
+
+
+def main():
+    print("=" * 60)
+    print("Spread Matrix Benchmark")
+    print("=" * 60)
+    print(f"{len(ASSETS)} assets, {UPDATES} updates per configuration, budget {BUDGET_US:.0f} us\n")
+
+    print(f"{'venues':>7}{'pools':>7}{'cells':>8}{'compute us':>12}{'+best us':>10}{'scalar us':>11}")
+    rng = random.Random(1)
+    for venues, pools in ((2, 1), (2, 8), (4, 16), (4, 32), (8, 64), (8, 128)):
+        matrix = make_matrix(venues, pools, rng)
+        compute = us_per_update(matrix, rng, SpreadMatrix.compute)
+        with_best = us_per_update(matrix, rng, SpreadMatrix.best)
+        scalar = us_per_update(matrix, rng, scalar_pass) if venues * pools <= 128 else float("nan")
+        flag = "" if compute <= BUDGET_US else "  over budget"
+        cells = len(ASSETS) * venues * pools
+        print(f"{venues:>7}{pools:>7}{cells:>8}{compute:>12.1f}{with_best:>10.1f}{scalar:>11.1f}{flag}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Benchmark: WebSocket frame decoding per JSON decoder.
+
+Frames are synthesized in the venues' documented wire formats (Coinbase
+Advanced Trade level2, Gemini v2 market data), compact like the live feeds:
+
+- coinbase snapshot: one l2_data snapshot, 10000 levels per side (~2 MB)
+- coinbase update:   l2_data update with 5 entries
+- gemini l2_updates: 3 level changes
+- gemini mixed:      l2_updates interleaved with trade and heartbeat frames,
+                     decoded in full vs with trade/heartbeat frames dropped
+                     by raw prefix (as GeminiConnector does)
+
+Run from the repository root:
+    python benchmarks/bench_ws_decode.py
+"""
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../backend'))
+
+from shared.wsjson import DECODERS, prefix_filter
+
+SNAPSHOT_DEPTH = 10000
+SMALL_FRAMES = 20000
+MID = 1450000  # 1e-4 USD
+EVENT_TIME = "2025-01-14T12:00:00.123456Z"
+
+
+def coinbase_frame(kind: str, updates: list, sequence: int) -> str:
+    return json.dumps({
+        "channel": "l2_data",
+        "client_id": "",
+        "timestamp": "2025-01-14T12:00:00.123456789Z",
+        "sequence_num": sequence,
+        "events": [{"type": kind, "product_id": "SOL-USD", "updates": updates}]
+    }, separators=(",", ":"))
+
+
+def coinbase_level(side: str, price: int, size: str) -> dict:
+    return {"side": side, "event_time": EVENT_TIME, "price_level": f"{price / 10000:.4f}", "new_quantity": size}
+
+
+def make_frames(seed: int = 1) -> dict:
+    rng = random.Random(seed)
+    snapshot = [coinbase_level("bid", MID - 100 * (i + 1), "5.0") for i in range(SNAPSHOT_DEPTH)]
+    snapshot += [coinbase_level("offer", MID + 100 * (i + 1), "5.0") for i in range(SNAPSHOT_DEPTH)]
+
+    def near_top(side: str) -> int:
+        offset = 100 * (1 + int(rng.expovariate(0.2)))
+        return MID - offset if side in ("bid", "buy") else MID + offset
+
+    updates = []
+    for i in range(SMALL_FRAMES):
+        entries = [coinbase_level(s, near_top(s), rng.choice(["0", "1.25", "5.0"]))
+                   for s in (rng.choice(["bid", "offer"]) for _ in range(5))]
+        updates.append(coinbase_frame("update", entries, i + 2))
+
+    gemini = []
+    mixed = []
+    for i in range(SMALL_FRAMES):
+        changes = [[s, f"{near_top(s) / 10000:.4f}", rng.choice(["0", "1.25", "5.0"])]
+                   for s in (rng.choice(["buy", "sell"]) for _ in range(3))]
+        frame = json.dumps({"type": "l2_updates", "symbol": "SOLUSD", "changes": changes}, separators=(",", ":"))
+        gemini.append(frame)
+        mixed.append(frame)
+        if i % 2 == 0:
+            mixed.append(json.dumps({
+                "type": "trade", "symbol": "SOLUSD", "event_id": 1000 + i,
+                "timestamp": 1736856000000 + i, "price": f"{MID / 10000:.4f}",
+                "quantity": "0.5", "side": "buy"
+            }, separators=(",", ":")))
+        if i % 50 == 0:
+            mixed.append(json.dumps({"type": "heartbeat", "timestamp": 1736856000000 + i}, separators=(",", ":")))
+
+    return {
+        "coinbase snapshot": [coinbase_frame("snapshot", snapshot, 1)],
+        "coinbase update": updates,
+        "gemini l2_updates": gemini,
+        "gemini mixed": mixed,
+    }
+
+
+def time_decode(decode, frames, skip=None, min_seconds: float = 0.5):
+    """Return (frames/sec, MB/sec) decoding `frames` repeatedly."""
+    total_bytes = sum(len(f) for f in frames)
+    rounds = 0
+    start = time.perf_counter()
+    while True:
+        for frame in frames:
+            if skip is not None and skip(frame):
+                continue
+            decode(frame)
+        rounds += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            break
+    return rounds * len(frames) / elapsed, rounds * total_bytes / elapsed / 1e6
+
+
+def main():
+    print("=" * 60)
+    print("WebSocket JSON Decode Benchmark")
+    print("=" * 60)
+    print(f"Decoders available: {', '.join(DECODERS)}\n")
+
+    frames = make_frames()
+    gemini_skip = prefix_filter(('{"type":"heartbeat"', '{"type":"trade"'))
+
+    print(f"{'frames':<22}{'decoder':<18}{'frames/sec':>14}{'MB/sec':>10}")
+    for label, batch in frames.items():
+        for name, decode in DECODERS.items():
+            fps, mbps = time_decode(decode, batch)
+            print(f"{label:<22}{name:<18}{fps:>14,.0f}{mbps:>10.1f}")
+            if label == "gemini mixed":
+                fps, mbps = time_decode(decode, batch, skip=gemini_skip)
+                print(f"{label:<22}{name + ' +prefix':<18}{fps:>14,.0f}{mbps:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
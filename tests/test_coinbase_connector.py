@@ -0,0 +1,145 @@
+"""Tests for Coinbase WebSocket supervision against a local fake server."""
+import asyncio
+import json
+import pytest
+import sys
+import os
+from decimal import Decimal
+
+# Add backend directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../backend'))
+
+import websockets
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+import connectors.coinbase_connector as coinbase_module
+from connectors.coinbase_connector import CoinbaseConnector
+from shared.events import EventBus
+
+
+def make_connector(ws_url: str) -> CoinbaseConnector:
+    """Coinbase connector with a throwaway signing key and fast reconnects."""
+    key = ec.generate_private_key(ec.SECP256R1())
+    pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    ).decode()
+    return CoinbaseConnector("test-key", pem, ws_url=ws_url, reconnect_base_delay=0.01)
+
+
+def l2_frame(kind: str, product_id: str, sequence: int, bids, asks) -> str:
+    updates = [{"side": "bid", "price_level": p, "new_quantity": q} for p, q in bids]
+    updates += [{"side": "offer", "price_level": p, "new_quantity": q} for p, q in asks]
+    return json.dumps({
+        "channel": "l2_data",
+        "sequence_num": sequence,
+        "events": [{"type": kind, "product_id": product_id, "updates": updates}]
+    })
+
+
+class FakeCoinbaseServer:
+    """Serves level2 snapshots; drops the first `drops` connections after one update."""
+
+    def __init__(self, drops: int = 1):
+        self.drops = drops
+        self.subscriptions = []
+        self.server = None
+
+    async def handler(self, ws):
+        subscribe = json.loads(await ws.recv())
+        self.subscriptions.append(subscribe)
+        connection = len(self.subscriptions)
+        bid = f"{100 + connection}.00"
+        for sequence, product_id in enumerate(subscribe["product_ids"]):
+            await ws.send(l2_frame("snapshot", product_id, sequence, [(bid, "5")], [("110.00", "5")]))
+
+        if connection <= self.drops:
+            await ws.send(l2_frame("update", "SOL-USD", len(subscribe["product_ids"]), [("99.00", "1")], []))
+            ws.transport.abort()  # Drop without a close handshake
+            return
+        await ws.wait_closed()
+
+    async def __aenter__(self):
+        self.server = await websockets.serve(self.handler, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        self.url = f"ws://127.0.0.1:{port}"
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+        await self.server.wait_closed()
+
+
+async def wait_for(condition, timeout: float = 5.0):
+    """Poll until `condition()` is true."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not met before timeout")
+        await asyncio.sleep(0.01)
+
+
+class TestCoinbaseReconnect:
+    """Test suite for the supervised Coinbase WebSocket."""
+
+    @pytest.mark.asyncio
+    async def test_reconnects_and_rebuilds_books(self, monkeypatch):
+        """A dropped connection is re-established and books come from the new snapshot."""
+        monkeypatch.setattr(coinbase_module, "event_bus", EventBus())
+
+        async with FakeCoinbaseServer(drops=2) as server:
+            connector = make_connector(server.url)
+            task = asyncio.create_task(connector.run(["SOL-USD", "BTC-USD"]))
+            try:
+                await wait_for(lambda: connector.get_best_bid_ask("BTC-USD")[0] == 103.0)
+                # Levels from the dropped connections' updates are gone
+                assert connector.books["SOL-USD"].bids.top(10) == [(Decimal("103.00"), Decimal("5"))]
+                assert connector.get_best_bid_ask("BTC-USD") == (103.0, 5.0, 110.0, 5.0)
+                assert connector._disconnected_at is None  # Time-to-first-update recorded
+            finally:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                await connector.close()
+
+        # One subscribe message per connection, covering every product
+        assert [s["product_ids"] for s in server.subscriptions] == [["SOL-USD", "BTC-USD"]] * 3
+        assert connector.reconnects == 2
+
+    @pytest.mark.asyncio
+    async def test_backoff_grows_while_server_is_down(self, monkeypatch):
+        """Failed connects retry with growing backoff, even after an earlier healthy connection."""
+        monkeypatch.setattr(coinbase_module, "event_bus", EventBus())
+        connector = make_connector("ws://127.0.0.1:9")  # Nothing listens on the discard port
+        connector.updates_since_connect = 7  # Left over from a previous healthy connection
+        attempts = []
+        backoff = connector._backoff_delay
+
+        def record(attempt):
+            attempts.append(attempt)
+            return backoff(attempt)
+
+        connector._backoff_delay = record
+        task = asyncio.create_task(connector.run(["SOL-USD"]))
+        try:
+            await wait_for(lambda: len(attempts) >= 3)
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            await connector.close()
+
+        assert attempts[:3] == [0, 1, 2]
+        assert connector.reconnects == 0  # Never connected, so nothing to reconnect
+        assert not connector.connected
+
+    def test_backoff_is_jittered_and_capped(self):
+        """Delays are drawn below an exponentially growing, capped ceiling."""
+        connector = make_connector("ws://unused")
+        connector.reconnect_base_delay = 0.5
+        connector.reconnect_max_delay = 4.0
+        for attempt, ceiling in [(0, 0.5), (1, 1.0), (3, 4.0), (10, 4.0)]:
+            delays = [connector._backoff_delay(attempt) for _ in range(50)]
+            assert all(0 <= d <= ceiling for d in delays)
+            assert len(set(delays)) > 1
+        asyncio.run(connector.http_client.aclose())
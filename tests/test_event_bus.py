@@ -0,0 +1,356 @@
+"""Unit tests for event bus dispatch modes."""
+import pytest
+import asyncio
+import sys
+import os
+from datetime import datetime, timezone
+from decimal import Decimal
+
+# Add backend directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../backend'))
+
+from shared.events import EventBus, BackpressurePolicy, TopicPriority
+from shared.types import Opportunity
+from observability.metrics import registry
+
+
+class TestQueuedDispatch:
+    """Test suite for per-subscriber queues and backpressure policies."""
+
+    @pytest.fixture
+    def bus(self):
+        """Create a fresh event bus for each test."""
+        return EventBus()
+
+    @pytest.mark.asyncio
+    async def test_publisher_does_not_wait_on_slow_handler(self, bus):
+        """A queued slow handler must not stall the publisher."""
+        release = asyncio.Event()
+        handled = []
+
+        async def slow_handler(data):
+            await release.wait()
+            handled.append(data)
+
+        bus.configure_topic("cex.bookUpdate", BackpressurePolicy.DROP_OLDEST, maxsize=10)
+        bus.subscribe("cex.bookUpdate", slow_handler)
+
+        await asyncio.wait_for(bus.publish("cex.bookUpdate", 1), timeout=0.1)
+        assert handled == []
+
+        release.set()
+        await bus.join()
+        assert handled == [1]
+        await bus.stop()
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_keeps_newest_events(self, bus):
+        """DROP_OLDEST evicts queued events and counts the drops."""
+        release = asyncio.Event()
+        handled = []
+
+        async def handler(data):
+            await release.wait()
+            handled.append(data)
+
+        bus.configure_topic("topic", BackpressurePolicy.DROP_OLDEST, maxsize=2)
+        bus.subscribe("topic", handler)
+
+        await bus.publish("topic", 0)
+        await asyncio.sleep(0)  # Worker takes event 0 and blocks
+        for i in range(1, 6):
+            await bus.publish("topic", i)
+
+        release.set()
+        await bus.join()
+
+        assert handled == [0, 4, 5]
+        stats = bus.get_queue_stats()["topic"]
+        assert stats[handler.__qualname__]["dropped"] == 3
+        await bus.stop()
+
+    @pytest.mark.asyncio
+    async def test_drop_newest_keeps_queued_events(self, bus):
+        """DROP_NEWEST discards incoming events when the queue is full."""
+        release = asyncio.Event()
+        handled = []
+
+        async def handler(data):
+            await release.wait()
+            handled.append(data)
+
+        bus.configure_topic("topic", BackpressurePolicy.DROP_NEWEST, maxsize=2)
+        bus.subscribe("topic", handler)
+
+        await bus.publish("topic", 0)
+        await asyncio.sleep(0)
+        for i in range(1, 6):
+            await bus.publish("topic", i)
+
+        release.set()
+        await bus.join()
+
+        assert handled == [0, 1, 2]
+        await bus.stop()
+
+    @pytest.mark.asyncio
+    async def test_block_policy_applies_backpressure(self, bus):
+        """BLOCK makes the publisher wait once the queue is full."""
+        release = asyncio.Event()
+
+        async def handler(data):
+            await release.wait()
+
+        bus.configure_topic("trade.completed", BackpressurePolicy.BLOCK, maxsize=1)
+        bus.subscribe("trade.completed", handler)
+
+        await bus.publish("trade.completed", 0)
+        await asyncio.sleep(0)
+        await bus.publish("trade.completed", 1)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(bus.publish("trade.completed", 2), timeout=0.05)
+
+        release.set()
+        await bus.join()
+        await bus.stop()
+
+    @pytest.mark.asyncio
+    async def test_inline_and_queued_subscribers_coexist(self, bus):
+        """Unconfigured topics keep inline dispatch."""
+        handled = []
+
+        async def handler(data):
+            handled.append(data)
+
+        bus.subscribe("risk.paused", handler)
+        await bus.publish("risk.paused", "x")
+
+        assert handled == ["x"]
+        assert bus.get_queue_stats() == {}
+        assert bus.get_stats() == {"risk.paused": 1}
+
+    @pytest.mark.asyncio
+    async def test_handler_error_does_not_kill_worker(self, bus):
+        """A failing handler must not stop later events from being delivered."""
+        handled = []
+
+        async def handler(data):
+            if data == "bad":
+                raise ValueError("boom")
+            handled.append(data)
+
+        bus.configure_topic("topic", BackpressurePolicy.DROP_OLDEST, maxsize=10)
+        bus.subscribe("topic", handler)
+
+        await bus.publish("topic", "bad")
+        await bus.publish("topic", "good")
+        await bus.join()
+
+        assert handled == ["good"]
+        await bus.stop()
+
+
+class TestConflation:
+    """Test suite for latest-value conflating topics."""
+
+    @pytest.fixture
+    def bus(self):
+        """Create a fresh event bus for each test."""
+        return EventBus()
+
+    @pytest.mark.asyncio
+    async def test_slow_consumer_sees_newest_value_per_key(self, bus):
+        """A burst for one key collapses to the newest event."""
+        release = asyncio.Event()
+        handled = []
+
+        async def handler(data):
+            await release.wait()
+            handled.append(data)
+
+        bus.configure_topic("cex.bookUpdate", BackpressurePolicy.CONFLATE, key=lambda d: d[0])
+        bus.subscribe("cex.bookUpdate", handler)
+
+        await bus.publish("cex.bookUpdate", ("solusd", 0))
+        await asyncio.sleep(0)  # Worker takes the first update and blocks
+        for i in range(1, 11):
+            await bus.publish("cex.bookUpdate", ("solusd", i))
+            await bus.publish("cex.bookUpdate", ("btcusd", i))
+
+        release.set()
+        await bus.join()
+
+        assert handled == [("solusd", 0), ("solusd", 10), ("btcusd", 10)]
+        stats = bus.get_queue_stats()["cex.bookUpdate"][handler.__qualname__]
+        assert stats["conflated"] == 18
+        assert stats["policy"] == "conflate"
+        await bus.stop()
+
+    @pytest.mark.asyncio
+    async def test_fast_consumer_sees_every_update(self, bus):
+        """Nothing is conflated when the consumer keeps up."""
+        handled = []
+
+        async def handler(data):
+            handled.append(data)
+
+        bus.configure_topic("dex.poolUpdate", BackpressurePolicy.CONFLATE, key=lambda d: d[0])
+        bus.subscribe("dex.poolUpdate", handler)
+
+        for i in range(5):
+            await bus.publish("dex.poolUpdate", ("pool", i))
+            await bus.join()
+
+        assert handled == [("pool", i) for i in range(5)]
+        await bus.stop()
+
+    def test_conflation_requires_key(self, bus):
+        """Configuring a conflating topic without a key is rejected."""
+        with pytest.raises(ValueError):
+            bus.configure_topic("cex.bookUpdate", BackpressurePolicy.CONFLATE)
+
+
+class TestHandlerInstrumentation:
+    """Test suite for per-handler latency and error metrics."""
+
+    @pytest.fixture
+    def bus(self):
+        """Create a fresh event bus for each test."""
+        return EventBus()
+
+    @pytest.mark.asyncio
+    async def test_handler_errors_are_counted(self, bus):
+        """Exceptions in inline handlers are counted per exception type."""
+        async def failing_handler(data):
+            raise KeyError("missing")
+
+        bus.subscribe("trade.completed", failing_handler)
+        await bus.publish("trade.completed", None)
+        await bus.publish("trade.completed", None)
+
+        count = registry.get_sample_value(
+            "arb_event_handler_errors_total",
+            {"topic": "trade.completed", "handler": failing_handler.__qualname__, "exception": "KeyError"}
+        )
+        assert count == 2
+
+    @pytest.mark.asyncio
+    async def test_handler_duration_is_sampled(self, bus):
+        """Only one in `sample_every` calls lands in the histogram."""
+        async def handler(data):
+            pass
+
+        bus.configure_instrumentation(slow_threshold_ms=1000, sample_every=4)
+        bus.subscribe("cex.bookUpdate", handler)
+        for _ in range(8):
+            await bus.publish("cex.bookUpdate", None)
+
+        count = registry.get_sample_value(
+            "arb_event_handler_duration_seconds_count",
+            {"topic": "cex.bookUpdate", "handler": handler.__qualname__}
+        )
+        assert count == 2
+
+    @pytest.mark.asyncio
+    async def test_slow_handlers_are_flagged(self, bus):
+        """Calls over the threshold increment the slow-handler counter."""
+        async def slow_handler(data):
+            await asyncio.sleep(0.02)
+
+        bus.configure_instrumentation(slow_threshold_ms=5)
+        bus.configure_topic("signal.opportunity", BackpressurePolicy.DROP_OLDEST, maxsize=10)
+        bus.subscribe("signal.opportunity", slow_handler)
+        await bus.publish("signal.opportunity", None)
+        await bus.join()
+
+        count = registry.get_sample_value(
+            "arb_event_handler_slow_total",
+            {"topic": "signal.opportunity", "handler": slow_handler.__qualname__}
+        )
+        assert count == 1
+        await bus.stop()
+
+
+class TestPriorityLanes:
+    """Test suite for control-plane topic priority."""
+
+    @pytest.fixture
+    def bus(self):
+        """Create a fresh event bus for each test."""
+        return EventBus()
+
+    @pytest.mark.asyncio
+    async def test_control_event_overtakes_queued_data(self, bus):
+        """A control event is handled before data queued ahead of it."""
+        order = []
+
+        async def data_handler(data):
+            order.append(data)
+
+        async def control_handler(data):
+            await asyncio.sleep(0.01)
+            order.append(data)
+
+        bus.configure_topic("signal.opportunity", BackpressurePolicy.DROP_OLDEST, maxsize=10)
+        bus.set_priority("risk.paused", TopicPriority.CONTROL)
+        bus.subscribe("signal.opportunity", data_handler)
+        bus.subscribe("risk.paused", control_handler)
+
+        for i in range(3):
+            await bus.publish("signal.opportunity", i)
+        await bus.publish("risk.paused", "pause")
+        await bus.join()
+
+        assert order == ["pause", 0, 1, 2]
+        await bus.stop()
+
+    def test_control_topics_cannot_be_queued(self, bus):
+        """Queueing a control topic, or prioritizing a queued one, is rejected."""
+        bus.set_priority("risk.paused", TopicPriority.CONTROL)
+        with pytest.raises(ValueError):
+            bus.configure_topic("risk.paused")
+
+        bus.configure_topic("signal.opportunity")
+        with pytest.raises(ValueError):
+            bus.set_priority("signal.opportunity", TopicPriority.CONTROL)
+
+    @pytest.mark.asyncio
+    async def test_execution_skips_opportunities_after_pause(self, bus):
+        """Opportunities queued before a pause are not executed."""
+        from engines.execution_engine import ExecutionEngine
+        from services.risk_service import RiskService
+        from shared.clock import VirtualClock
+
+        clock = VirtualClock(datetime(2025, 1, 14, tzinfo=timezone.utc))
+        bus.configure_topic("signal.opportunity", BackpressurePolicy.DROP_OLDEST, maxsize=10)
+        execution = ExecutionEngine(bus=bus, clock=clock, observe_only=True)
+        risk = RiskService(bus=bus, clock=clock)
+        before = registry.get_sample_value("arb_pause_propagation_seconds_count") or 0
+
+        opportunity = Opportunity(
+            id="opp-1",
+            asset="SOL-USD",
+            direction="cex_to_dex",
+            cex_price=Decimal("145"),
+            dex_price=Decimal("147"),
+            spread_pct=Decimal("1.38"),
+            predicted_pnl_pct=Decimal("0.1"),
+            size=Decimal("1"),
+            timestamp=clock.now()
+        )
+        await bus.publish("signal.opportunity", opportunity)
+        await risk.trigger_pause("test")
+        await bus.join()
+
+        assert execution.paused
+        assert execution.skipped_while_paused == 1
+        assert execution.trade_history == []
+        assert registry.get_sample_value("arb_pause_propagation_seconds_count") == before + 1
+
+        await risk.resume()
+        await bus.publish("signal.opportunity", opportunity)
+        await bus.join()
+
+        assert len(execution.trade_history) == 1
+        await bus.stop()
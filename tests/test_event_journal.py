@@ -0,0 +1,98 @@
+"""Unit tests for the append-only event journal."""
+import pytest
+import os
+import sys
+from decimal import Decimal
+from datetime import datetime, timezone
+
+# Add backend directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../backend'))
+
+from shared.events import EventBus
+from shared.journal import EventJournal, read_journal
+from shared.types import BookUpdate, PoolUpdate
+
+
+def make_book(sequence: int) -> BookUpdate:
+    """Create a small book update."""
+    return BookUpdate(
+        venue="gemini",
+        pair="solusd",
+        timestamp=datetime(2025, 1, 14, tzinfo=timezone.utc),
+        bids=[["145.23", "10"]],
+        asks=[["145.25", "4"]],
+        sequence=sequence
+    )
+
+
+class TestEventJournal:
+    """Test suite for journal recording, rotation and reading."""
+
+    def test_records_read_back_in_order(self, tmp_path):
+        """Recorded events are read back in order with their topics."""
+        journal = EventJournal(str(tmp_path))
+        journal.start()
+        for i in range(10):
+            journal.record("cex.bookUpdate", make_book(i))
+        journal.record("risk.paused", {"reason": "test"})
+        journal.close()
+
+        records = list(read_journal(str(tmp_path)))
+        assert [r.event_type for r in records] == ["cex.bookUpdate"] * 10 + ["risk.paused"]
+        assert [r.data.sequence for r in records[:10]] == list(range(10))
+        assert records[-1].data == {"reason": "test"}
+
+    def test_monotonic_timestamps(self, tmp_path):
+        """Every record carries a non-decreasing monotonic timestamp."""
+        journal = EventJournal(str(tmp_path))
+        journal.start()
+        for i in range(50):
+            journal.record("cex.bookUpdate", make_book(i))
+        journal.close()
+
+        stamps = [r.mono_ns for r in read_journal(str(tmp_path))]
+        assert stamps == sorted(stamps)
+        assert all(r.wall_ns > 0 for r in read_journal(str(tmp_path)))
+
+    def test_segments_rotate_by_size(self, tmp_path):
+        """Small segments rotate and reading spans all of them."""
+        journal = EventJournal(str(tmp_path), segment_bytes=512)
+        journal.start()
+        for i in range(100):
+            journal.record("cex.bookUpdate", make_book(i))
+        journal.close()
+
+        segments = sorted(os.listdir(tmp_path))
+        assert len(segments) > 5
+        assert all(os.path.getsize(tmp_path / s) <= 512 for s in segments)
+        assert [r.data.sequence for r in read_journal(str(tmp_path))] == list(range(100))
+
+    def test_restart_appends_new_segments(self, tmp_path):
+        """A second journal in the same directory continues after existing segments."""
+        for batch in range(2):
+            journal = EventJournal(str(tmp_path))
+            journal.start()
+            journal.record("cex.bookUpdate", make_book(batch))
+            journal.close()
+
+        assert [r.data.sequence for r in read_journal(str(tmp_path))] == [0, 1]
+
+    @pytest.mark.asyncio
+    async def test_bus_tap_records_published_events(self, tmp_path):
+        """Attached as a bus tap, the journal sees every published event."""
+        bus = EventBus()
+        journal = EventJournal(str(tmp_path))
+        journal.start()
+        bus.add_tap(journal.record)
+
+        pool = PoolUpdate(
+            program="whirlpool", pool="pool", timestamp=datetime(2025, 1, 14, tzinfo=timezone.utc),
+            reserves={"usdc": "1", "wsol": "2"}, price_mid=Decimal("145.1"), fee_bps=30
+        )
+        await bus.publish("cex.bookUpdate", make_book(1))
+        await bus.publish("dex.poolUpdate", pool)
+        journal.close()
+
+        records = list(read_journal(str(tmp_path)))
+        assert [r.event_type for r in records] == ["cex.bookUpdate", "dex.poolUpdate"]
+        assert records[1].data == pool
@@ -0,0 +1,148 @@
+"""Unit tests for the binary event codec and Unix socket transport."""
+import pytest
+import asyncio
+import os
+import sys
+from decimal import Decimal
+from datetime import datetime, timezone
+
+# Add backend directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../backend'))
+
+from shared.codec import encode_event, decode_event, CodecError
+from shared.events import EventBus
+from shared.transport import UnixSocketTransport, encode_frame, decode_frame
+from shared.types import BookUpdate, PoolUpdate, Opportunity, Trade, OrderStatus
+
+
+def make_events():
+    """One instance of every model carried on the bus."""
+    ts = datetime(2025, 1, 14, 12, 30, 45, 123456, tzinfo=timezone.utc)
+    return [
+        BookUpdate(
+            venue="gemini", pair="solusd", timestamp=ts,
+            bids=[["145.23", "10.5"], ["145.22", "3"]], asks=[["145.25", "7.125"]],
+            sequence=42
+        ),
+        PoolUpdate(
+            program="whirlpool", pool="HJPjoWUrhoZzkNfRpHuieeFk9WcZWjwy6PBjZ81ngndJ", timestamp=ts,
+            reserves={"usdc": "500000", "wsol": "3441.2"}, price_mid=Decimal("145.2987654321"), fee_bps=30
+        ),
+        Opportunity(
+            id="opp-1", asset="SOL-USD", direction="cex_to_dex",
+            cex_price=Decimal("145.25"), dex_price=Decimal("146.10"),
+            spread_pct=Decimal("0.585"), predicted_pnl_pct=Decimal("-0.815"),
+            size=Decimal("50"), timestamp=ts
+        ),
+        Trade(
+            trade_id="t-1", opportunity_id="opp-1", asset="SOL-USD", direction="cex_to_dex",
+            size_asset=Decimal("50"), cex_price=Decimal("145.25"), dex_price=Decimal("146.10"),
+            fees_total=Decimal("43.6"), pnl_abs=Decimal("-1.1"), pnl_pct=Decimal("-0.02"),
+            latency_ms=312, timestamp=ts, window_id="w-1", status=OrderStatus.FILLED
+        ),
+    ]
+
+
+class TestEventCodec:
+    """Test suite for binary event encoding."""
+
+    @pytest.mark.parametrize("event", make_events(), ids=lambda e: type(e).__name__)
+    def test_models_round_trip(self, event):
+        """Every bus model decodes to an equal model."""
+        decoded = decode_event(encode_event(event))
+        assert type(decoded) is type(event)
+        assert decoded == event
+
+    def test_encoding_is_compact(self):
+        """Binary encoding is smaller than the JSON representation."""
+        book = make_events()[0]
+        assert len(encode_event(book)) < len(book.model_dump_json()) / 2
+
+    def test_dict_events_fall_back_to_json(self):
+        """Risk events (plain dicts) survive the JSON fallback."""
+        decoded = decode_event(encode_event({"reason": "manual", "count": 3}))
+        assert decoded == {"reason": "manual", "count": 3}
+
+    def test_malformed_buffer_raises(self):
+        """Truncated buffers raise CodecError."""
+        buf = encode_event(make_events()[3])
+        with pytest.raises(CodecError):
+            decode_event(buf[:20])
+
+    def test_malformed_json_raises(self):
+        """A corrupt JSON fallback payload raises CodecError, not JSONDecodeError."""
+        buf = encode_event({"reason": "manual"})
+        with pytest.raises(CodecError):
+            decode_event(buf[:-1])
+
+    def test_frame_round_trip(self):
+        """Frames carry the topic alongside the event."""
+        frame = encode_frame("cex.bookUpdate", make_events()[0])
+        event_type, data = decode_frame(frame[4:])
+        assert event_type == "cex.bookUpdate"
+        assert data == make_events()[0]
+
+
+class TestUnixSocketTransport:
+    """Test suite for forwarding events between buses over a Unix socket."""
+
+    @pytest.mark.asyncio
+    async def test_exported_topics_reach_peer(self, tmp_path):
+        """Exported topics are delivered remotely; others stay local."""
+        path = str(tmp_path / "bus.sock")
+        sender, receiver = EventBus(), EventBus()
+        received = []
+        arrived = asyncio.Event()
+
+        async def handler(data):
+            received.append(data)
+            arrived.set()
+
+        receiver.subscribe("cex.bookUpdate", handler)
+        receiver.subscribe("risk.paused", handler)
+
+        receiver_transport = UnixSocketTransport(listen_path=path)
+        await receiver_transport.start(receiver)
+        sender_transport = UnixSocketTransport(peers=[path])
+        sender.set_transport(sender_transport, ["cex.bookUpdate"])
+        await sender_transport.start(sender)
+        await sender_transport.wait_connected()
+
+        try:
+            await sender.publish("risk.paused", {"reason": "local only"})
+            await sender.publish("cex.bookUpdate", make_events()[0])
+            await asyncio.wait_for(arrived.wait(), timeout=2)
+
+            assert received == [make_events()[0]]
+            assert sender_transport.get_stats()["sent"] == 1
+            assert receiver_transport.get_stats()["received"] == 1
+        finally:
+            await sender_transport.stop()
+            await receiver_transport.stop()
+
+    @pytest.mark.asyncio
+    async def test_received_events_are_not_reforwarded(self, tmp_path):
+        """Events dispatched from the transport are not sent back out."""
+        path = str(tmp_path / "bus.sock")
+        receiver = EventBus()
+        receiver_transport = UnixSocketTransport(listen_path=path, peers=[])
+        receiver.set_transport(receiver_transport, ["cex.bookUpdate"])
+        await receiver_transport.start(receiver)
+
+        sender = EventBus()
+        sender_transport = UnixSocketTransport(peers=[path])
+        sender.set_transport(sender_transport, ["cex.bookUpdate"])
+        await sender_transport.start(sender)
+        await sender_transport.wait_connected()
+
+        try:
+            await sender.publish("cex.bookUpdate", make_events()[0])
+            for _ in range(100):
+                if receiver.get_stats():
+                    break
+                await asyncio.sleep(0.01)
+            assert receiver.get_stats() == {"cex.bookUpdate": 1}
+            assert receiver_transport.get_stats()["sent"] == 0
+        finally:
+            await sender_transport.stop()
+            await receiver_transport.stop()
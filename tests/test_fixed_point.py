@@ -0,0 +1,164 @@
+"""Unit tests for fixed-point price/size mode."""
+import pytest
+import random
+import sys
+import os
+from decimal import Decimal
+from datetime import datetime, timezone
+
+# Add backend directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../backend'))
+
+from shared.clock import VirtualClock
+from shared.events import EventBus
+from shared.fixedpoint import parse_fixed, format_fixed, scale_for, DECIMAL
+from shared.orderbook import OrderBook
+from shared.types import BookUpdate, PoolUpdate
+from engines.signal_engine import SignalEngine
+from connectors.solana_connector import PoolMath
+from shared.pools import pool_registry
+
+SOL_POOL = pool_registry.for_asset("SOL-USD")[0].address
+
+
+class TestFixedPointParsing:
+    """Test suite for decimal string <-> scaled integer conversion."""
+
+    @pytest.mark.parametrize("text,decimals,expected", [
+        ("145.23", 4, 1452300),
+        ("145", 2, 14500),
+        ("0.00000001", 8, 1),
+        ("-0.5", 4, -5000),
+        ("145.230000", 4, 1452300),
+        (".5", 2, 50),
+    ])
+    def test_parse(self, text, decimals, expected):
+        """Strings parse to integer counts of the scale unit."""
+        assert parse_fixed(text, decimals) == expected
+
+    def test_parse_rejects_excess_precision(self):
+        """Non-zero digits beyond the scale are an error, not silently dropped."""
+        with pytest.raises(ValueError):
+            parse_fixed("145.23456", 4)
+
+    @pytest.mark.parametrize("value,decimals,expected", [
+        (1452300, 4, "145.2300"),
+        (1, 8, "0.00000001"),
+        (-5000, 4, "-0.5000"),
+        (14500, 0, "14500"),
+    ])
+    def test_format(self, value, decimals, expected):
+        """Integers format back to decimal strings at the scale."""
+        assert format_fixed(value, decimals) == expected
+
+    def test_scale_lookup_normalizes_symbols(self):
+        """Venue symbol spellings share one instrument scale."""
+        assert scale_for("solusd", True) is scale_for("SOL-USD", True)
+        assert scale_for("SOL-USD", False) is DECIMAL
+
+
+class TestFixedPointBook:
+    """Test suite for order books holding scaled integers."""
+
+    def test_book_update_values_match_decimal_mode(self):
+        """Both modes publish the same level values."""
+        levels = [("145.23", "1.5"), ("145.22", "0.25"), ("145.2", "10")]
+        books = {}
+        for fixed in (False, True):
+            scale = scale_for("SOL-USD", fixed)
+            book = books[fixed] = OrderBook("coinbase", "SOL-USD", scale)
+            book.apply((True, scale.price(p), scale.size(s)) for p, s in levels)
+
+        decimal_update = books[False].to_book_update(10)
+        fixed_update = books[True].to_book_update(10)
+        assert [[Decimal(p), Decimal(s)] for p, s in fixed_update.bids] == \
+            [[Decimal(p), Decimal(s)] for p, s in decimal_update.bids]
+        assert isinstance(books[True].bids.best()[0], int)
+
+
+class TestFixedPointSpreads:
+    """Test suite for identical signal output in both modes."""
+
+    async def run_engine(self, fixed: bool, ticks) -> list:
+        """Feed ticks to a signal engine and collect its opportunities."""
+        bus = EventBus()
+        clock = VirtualClock(datetime(2025, 1, 14, tzinfo=timezone.utc))
+        engine = SignalEngine(bus=bus, clock=clock, id_factory=lambda: "id", fixed_point=fixed)
+        opportunities = []
+
+        async def collect(opp):
+            opportunities.append(opp)
+
+        bus.subscribe("signal.opportunity", collect)
+        for book, pool in ticks:
+            await bus.publish("dex.poolUpdate", pool)
+            await bus.publish("cex.bookUpdate", book)
+        return opportunities
+
+    @pytest.mark.asyncio
+    async def test_identical_spreads(self):
+        """Fixed-point and Decimal modes emit identical opportunities."""
+        rng = random.Random(3)
+        ticks = []
+        for i in range(200):
+            bid = Decimal(rng.randint(1440000, 1460000)) / 10000
+            ask = bid + Decimal(rng.randint(1, 50)) / 10000
+            dex = Decimal(rng.randint(1400000, 1500000)) / 10000
+            book = BookUpdate(
+                venue="gemini", pair="solusd", timestamp=datetime.now(timezone.utc),
+                bids=[[str(bid), "100"]], asks=[[str(ask), "100"]], sequence=i
+            )
+            pool = PoolUpdate(
+                program="whirlpool", pool=SOL_POOL, timestamp=datetime.now(timezone.utc),
+                reserves={}, price_mid=dex, fee_bps=30
+            )
+            ticks.append((book, pool))
+
+        decimal_opps = await self.run_engine(False, ticks)
+        fixed_opps = await self.run_engine(True, ticks)
+
+        assert len(decimal_opps) > 100
+        assert len(fixed_opps) == len(decimal_opps)
+        for d, f in zip(decimal_opps, fixed_opps):
+            assert f.direction == d.direction
+            assert f.spread_pct == d.spread_pct
+            assert f.predicted_pnl_pct == d.predicted_pnl_pct
+            assert f.cex_price == d.cex_price
+            assert f.dex_price == d.dex_price
+
+
+class TestConstantProductQuoteFixed:
+    """Test suite for the integer constant product quote."""
+
+    def test_matches_decimal_quote(self):
+        """Integer quote agrees with the Decimal quote to within one base unit."""
+        reserve_usdc = Decimal("500000")
+        reserve_sol = Decimal("3448.275862069")
+        size_in = Decimal("1000")
+
+        amount_out, _, impact_pct = PoolMath.constant_product_quote(reserve_usdc, reserve_sol, size_in, 30)
+        raw_out, raw_price, raw_impact = PoolMath.constant_product_quote_fixed(
+            int(reserve_usdc.scaleb(6)), int(reserve_sol.scaleb(9)), int(size_in.scaleb(6)), 30
+        )
+
+        assert abs(Decimal(raw_out).scaleb(-9) - amount_out) <= Decimal("1e-9")
+        assert abs(Decimal(raw_impact).scaleb(-9) - impact_pct) <= Decimal("1e-8")
+        assert raw_price == raw_out * 10 ** 9 // int(size_in.scaleb(6))
+
+    def test_rounds_down(self):
+        """Output amounts round down, never overpaying."""
+        amount_out, _, _ = PoolMath.constant_product_quote_fixed(1000, 1000, 10, fee_bps=0)
+        assert amount_out == 9  # 9.90... rounded down
+
+    def test_exact_out_covers_output(self):
+        """The integer input for an exact output rounds up and buys at least that output."""
+        reserve_usdc, reserve_sol = 500000 * 10 ** 6, 3448275862069
+        amount_out = 50 * 10 ** 9
+
+        amount_in, exec_price = PoolMath.constant_product_quote_exact_out_fixed(
+            reserve_usdc, reserve_sol, amount_out, 30
+        )
+        forward_out, _, _ = PoolMath.constant_product_quote_fixed(reserve_usdc, reserve_sol, amount_in, 30)
+
+        assert forward_out >= amount_out
+        assert exec_price * amount_out >= amount_in * 10 ** 9
@@ -0,0 +1,107 @@
+"""Unit tests for tick-to-trade stage timestamps."""
+import pytest
+import sys
+import os
+from decimal import Decimal
+from datetime import datetime, timezone
+
+# Add backend directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../backend'))
+
+from shared.clock import VirtualClock
+from shared.events import EventBus
+from shared.orderbook import OrderBook
+from shared.types import PoolUpdate
+from engines.execution_engine import ExecutionEngine
+from engines.signal_engine import SignalEngine
+from observability.latency import STAGES, breakdown
+from observability.metrics import registry
+from shared.pools import pool_registry
+
+SOL_POOL = pool_registry.for_asset("SOL-USD")[0].address
+
+
+def sample(name: str, **labels) -> float:
+    return registry.get_sample_value(name, labels) or 0
+
+
+class TestBreakdown:
+    """Test suite for per-stage durations."""
+
+    def test_stages_in_time_order(self):
+        """Each stage is measured from the one stamped before it."""
+        stamps = {"dex_sent": 9_000_000, "frame_received": 1_000_000, "decoded": 1_500_000, "cex_sent": 4_000_000}
+        result = breakdown(stamps)
+
+        assert list(result) == ["frame_received", "decoded", "cex_sent", "dex_sent", "total"]
+        assert result["frame_received"] == 0.0
+        assert result["decoded"] == 0.5
+        assert result["cex_sent"] == 2.5
+        assert result["dex_sent"] == 5.0
+        assert result["total"] == 8.0
+
+    def test_ties_follow_pipeline_order(self):
+        """Stages stamped at the same instant keep pipeline order."""
+        stamps = {stage: 0 for stage in reversed(STAGES)}
+        assert list(breakdown(stamps))[:-1] == list(STAGES)
+
+    def test_no_stamps(self):
+        assert breakdown({}) == {}
+
+
+class TestPipelineStamps:
+    """Test suite for stamps carried from a book frame to the trade."""
+
+    @pytest.mark.asyncio
+    async def test_gemini_book_event_is_stamped(self, monkeypatch):
+        """The connector adds book_applied and bus_published to the frame's stamps."""
+        import connectors.gemini_connector as module
+
+        bus = EventBus()
+        updates = []
+
+        async def collect(update):
+            updates.append(update)
+
+        bus.subscribe("cex.bookUpdate", collect)
+        monkeypatch.setattr(module, "event_bus", bus)
+        connector = module.GeminiConnector()
+        await connector._handle_public_message(
+            {"type": "l2_updates", "symbol": "solusd", "changes": [["buy", "100.00", "1"], ["sell", "100.10", "1"]]},
+            {"frame_received": 1, "decoded": 2}
+        )
+
+        stamps = updates[0].stamps
+        assert list(stamps) == ["frame_received", "decoded", "book_applied", "bus_published"]
+        assert 2 < stamps["book_applied"] <= stamps["bus_published"]
+
+    @pytest.mark.asyncio
+    async def test_trade_carries_breakdown(self):
+        """A simulated trade stores every stage from frame to leg acks and observes the histograms."""
+        clock = VirtualClock(datetime(2025, 1, 14, tzinfo=timezone.utc))
+        bus = EventBus()
+        SignalEngine(bus=bus, clock=clock)
+        execution = ExecutionEngine(bus=bus, clock=clock, observe_only=True)
+        before = sample("arb_trade_latency_seconds_count", asset="SOL-USD")
+        acked_before = sample("arb_pipeline_stage_seconds_count", stage="cex_acked")
+
+        await bus.publish("dex.poolUpdate", PoolUpdate(
+            program="whirlpool", pool=SOL_POOL, timestamp=clock.now(),
+            reserves={}, price_mid=Decimal("150"), fee_bps=30
+        ))
+        clock.advance(0.001)  # Engine stamps land 1ms after the frame
+        book = OrderBook("gemini", "solusd")
+        book.load([(Decimal("140"), Decimal("100"))], [(Decimal("145"), Decimal("100"))])
+        frame = {"frame_received": 0, "decoded": 20_000, "book_applied": 50_000, "bus_published": 60_000}
+        await bus.publish("cex.bookUpdate", book.view(10, stamps=frame))
+
+        [trade] = execution.trade_history
+        result = trade.latency_breakdown
+        assert set(result) == set(STAGES) | {"total"}
+        assert list(result)[:7] == list(STAGES[:7])  # Legs are simulated in flight together
+        assert result["decoded"] == 0.02
+        assert result["signal_evaluated"] == 0.94  # 1ms after the frame
+        assert result["total"] == pytest.approx(clock.monotonic() * 1000)  # Frame to last ack
+        assert "stamps" not in trade.model_dump()
+        assert sample("arb_trade_latency_seconds_count", asset="SOL-USD") == before + 1
+        assert sample("arb_pipeline_stage_seconds_count", stage="cex_acked") == acked_before + 1
@@ -0,0 +1,122 @@
+"""Unit tests for the queue-backed, rate-limited logging setup."""
+import io
+import json
+import logging
+import pytest
+import sys
+import os
+
+# Add backend directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../backend'))
+
+from observability.logging_setup import (
+    RateLimitFilter, JsonFormatter, build_formatter, configure_logging, shutdown_logging
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_record(msg="tick %s", args=(1,), level=logging.INFO, name="engines.signal_engine", lineno=1):
+    return logging.LogRecord(name, level, __file__, lineno, msg, args, None)
+
+
+@pytest.fixture
+def restore_root():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield
+    shutdown_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+class TestRateLimitFilter:
+    """Test suite for per-call-site rate limiting."""
+
+    def test_burst_then_suppress_then_report(self):
+        """A call site emits its burst, drops the rest and reports the drop count."""
+        clock = FakeClock()
+        limit = RateLimitFilter(rate=1.0, burst=3, clock=clock)
+
+        passed = [limit.filter(make_record(args=(i,))) for i in range(10)]
+        assert passed == [True] * 3 + [False] * 7
+
+        clock.now = 1.0
+        record = make_record()
+        assert limit.filter(record)
+        assert record.suppressed == 7
+
+    def test_keys_are_independent(self):
+        """Throttling one call site leaves others alone."""
+        limit = RateLimitFilter(rate=1.0, burst=1, clock=FakeClock())
+        assert limit.filter(make_record("a %s", lineno=10))
+        assert not limit.filter(make_record("a %s", lineno=10))
+        assert limit.filter(make_record("a %s", lineno=11))
+
+    def test_formatted_messages_share_their_call_site(self):
+        """Pre-formatted (f-string) messages from one line share one bucket."""
+        limit = RateLimitFilter(rate=1.0, burst=2, clock=FakeClock())
+        passed = [limit.filter(make_record(f"price={i}", args=())) for i in range(100)]
+        assert passed == [True] * 2 + [False] * 98
+        assert len(limit._buckets) == 1
+
+    def test_warnings_are_never_dropped(self):
+        """WARNING and above bypass the limit."""
+        limit = RateLimitFilter(rate=1.0, burst=1, clock=FakeClock())
+        results = [limit.filter(make_record(level=logging.WARNING)) for _ in range(5)]
+        assert all(results)
+
+
+class TestFormatters:
+    """Test suite for text and JSON output."""
+
+    def test_json_line(self):
+        """JSON output is one object per record with the formatted message."""
+        record = make_record("spread=%.2f%%", (1.234,))
+        record.suppressed = 4
+        entry = json.loads(JsonFormatter().format(record))
+
+        assert entry["msg"] == "spread=1.23%"
+        assert entry["level"] == "INFO"
+        assert entry["logger"] == "engines.signal_engine"
+        assert entry["suppressed"] == 4
+
+    def test_unknown_format_rejected(self):
+        with pytest.raises(ValueError):
+            build_formatter("xml")
+
+
+class TestConfigureLogging:
+    """Test suite for the queue-backed root handler."""
+
+    def test_queue_mode_writes_on_listener(self, restore_root):
+        """Records reach the stream via the listener, flushed on shutdown."""
+        stream = io.StringIO()
+        listener = configure_logging("INFO", "json", use_queue=True, rate=0, stream=stream)
+        assert listener is not None
+
+        log = logging.getLogger("test.logging")
+        for i in range(100):
+            log.info("tick %d", i)
+        log.debug("not shown")
+        shutdown_logging()
+
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert [entry["msg"] for entry in lines] == [f"tick {i}" for i in range(100)]
+
+    def test_rate_limit_applies_before_queue(self, restore_root):
+        """Over-limit records are dropped on the calling thread."""
+        stream = io.StringIO()
+        configure_logging("INFO", "text", use_queue=False, rate=0.001, burst=2, stream=stream)
+
+        log = logging.getLogger("test.logging")
+        for i in range(10):
+            log.info("tick %d", i)
+
+        assert stream.getvalue().count("tick") == 2
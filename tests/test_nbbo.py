@@ -0,0 +1,63 @@
+"""Unit tests for the consolidated best bid/offer index."""
+import sys
+import os
+from decimal import Decimal
+
+# Add backend directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../backend'))
+
+from engines.nbbo import NBBOIndex, SymbolTable
+
+
+class TestSymbolTable:
+    """Test suite for venue symbol resolution."""
+
+    def test_venue_symbols_resolve_to_one_asset(self):
+        symbols = SymbolTable(["SOL-USD", "BTC-USD"])
+        assert symbols.canonical("gemini", "solusd") == "SOL-USD"
+        assert symbols.canonical("gemini", "SOLUSD") == "SOL-USD"
+        assert symbols.canonical("coinbase", "SOL-USD") == "SOL-USD"
+        assert symbols.canonical("coinbase", "BTC-USD") == "BTC-USD"
+        assert symbols.canonical("coinbase", "DOGE-USD") is None
+
+    def test_venue_symbol_for_routing(self):
+        symbols = SymbolTable(["SOL-USD"])
+        assert symbols.venue_symbol("SOL-USD", "gemini") == "solusd"
+        assert symbols.venue_symbol("SOL-USD", "coinbase") == "SOL-USD"
+
+
+class TestNBBOIndex:
+    """Test suite for incremental best bid/offer across venues."""
+
+    def test_best_side_per_venue(self):
+        """Bid and ask can come from different venues."""
+        index = NBBOIndex()
+        index.update("SOL-USD", "gemini", Decimal("144"), Decimal("146"))
+        nbbo = index.update("SOL-USD", "coinbase", Decimal("145"), Decimal("147"))
+
+        assert (nbbo.bid, nbbo.bid_venue) == (Decimal("145"), "coinbase")
+        assert (nbbo.ask, nbbo.ask_venue) == (Decimal("146"), "gemini")
+
+    def test_holder_worsening_rescans(self):
+        """When the venue holding a side backs off, the next best takes over."""
+        index = NBBOIndex()
+        index.update("SOL-USD", "gemini", Decimal("144"), Decimal("146"))
+        index.update("SOL-USD", "coinbase", Decimal("145"), Decimal("147"))
+        nbbo = index.update("SOL-USD", "coinbase", Decimal("143"), Decimal("145.5"))
+
+        assert (nbbo.bid, nbbo.bid_venue) == (Decimal("144"), "gemini")
+        assert (nbbo.ask, nbbo.ask_venue) == (Decimal("145.5"), "coinbase")
+
+    def test_unfillable_side_and_removal(self):
+        """A venue without depth for a side, or removed, does not hold it."""
+        index = NBBOIndex()
+        index.update("SOL-USD", "gemini", Decimal("144"), Decimal("146"))
+        nbbo = index.update("SOL-USD", "gemini", None, Decimal("146"))
+        assert nbbo.bid is None and nbbo.bid_venue is None
+
+        index.update("SOL-USD", "coinbase", Decimal("145"), Decimal("145.8"))
+        index.remove("SOL-USD", "coinbase")
+        assert (nbbo.bid, nbbo.ask, nbbo.ask_venue) == (None, Decimal("146"), "gemini")
+
+        index.remove("SOL-USD", "gemini")
+        assert nbbo.ask is None and nbbo.quotes == {}
@@ -0,0 +1,477 @@
+"""Unit tests for the incremental order book."""
+import json
+import pytest
+import random
+import sys
+import os
+from datetime import datetime, timezone
+from decimal import Decimal
+
+# Add backend directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../backend'))
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from shared.events import EventBus
+from shared.fixedpoint import scale_for
+from shared.orderbook import BookSide, DepthCurve, OrderBook
+from shared.types import BookUpdate, OpportunityState, PoolUpdate
+from shared.pools import pool_registry
+
+SOL_POOL = pool_registry.for_asset("SOL-USD")[0].address
+
+
+class TestBookSide:
+    """Test suite for sorted price-level maintenance."""
+
+    def test_bids_sorted_best_first(self):
+        """Bid levels come out highest price first."""
+        side = BookSide(descending=True)
+        for price in ["145.10", "145.30", "145.20"]:
+            side.update(Decimal(price), Decimal("1"))
+
+        assert [p for p, _ in side.top(10)] == [Decimal("145.30"), Decimal("145.20"), Decimal("145.10")]
+        assert side.best() == (Decimal("145.30"), Decimal("1"))
+
+    def test_asks_sorted_best_first(self):
+        """Ask levels come out lowest price first."""
+        side = BookSide(descending=False)
+        for price in ["145.30", "145.10", "145.20"]:
+            side.update(Decimal(price), Decimal("2"))
+
+        assert [p for p, _ in side.top(2)] == [Decimal("145.10"), Decimal("145.20")]
+        assert side.best_price() == Decimal("145.10")
+
+    def test_zero_size_removes_level(self):
+        """A zero-size update deletes the level; unknown levels are ignored."""
+        side = BookSide(descending=True)
+        side.update(Decimal("100"), Decimal("1"))
+        side.update(Decimal("101"), Decimal("1"))
+        side.update(Decimal("101"), Decimal("0"))
+        side.update(Decimal("99"), Decimal("0"))
+
+        assert len(side) == 1
+        assert side.best() == (Decimal("100"), Decimal("1"))
+
+    def test_empty_side(self):
+        """An empty side has no best level and an empty top."""
+        side = BookSide(descending=False)
+
+        assert side.best() is None
+        assert side.best_price() is None
+        assert side.top(10) == []
+
+    @pytest.mark.parametrize("descending", [True, False])
+    def test_matches_reference_dict(self, descending):
+        """Random updates give the same levels as a sorted dict."""
+        rng = random.Random(42)
+        side = BookSide(descending=descending)
+        reference = {}
+
+        for _ in range(2000):
+            price = Decimal(rng.randint(14000, 14100)) / 100
+            size = Decimal(rng.choice([0, 0, 1, 2, 5]))
+            side.update(price, size)
+            if size:
+                reference[price] = size
+            else:
+                reference.pop(price, None)
+
+        expected = sorted(reference.items(), reverse=descending)
+        assert side.top(len(reference) + 5) == expected
+
+    def test_load_snapshot(self):
+        """A snapshot loads sorted, dropping empty levels and keeping the last duplicate."""
+        side = BookSide(descending=False)
+        side.update(Decimal("1"), Decimal("1"))
+        side.load([
+            (Decimal("145.30"), Decimal("1")),
+            (Decimal("145.10"), Decimal("2")),
+            (Decimal("145.20"), Decimal("0")),
+            (Decimal("145.10"), Decimal("3")),
+        ])
+
+        assert side.top(10) == [(Decimal("145.10"), Decimal("3")), (Decimal("145.30"), Decimal("1"))]
+
+
+class TestOrderBook:
+    """Test suite for the two-sided book."""
+
+    def test_best_bid_ask_requires_both_sides(self):
+        """Best bid/ask is only available when both sides have levels."""
+        book = OrderBook()
+        book.side(True).update(Decimal("145.23"), Decimal("10"))
+        assert book.best_bid_ask() is None
+
+        book.side(False).update(Decimal("145.25"), Decimal("4"))
+        assert book.best_bid_ask() == (Decimal("145.23"), Decimal("145.25"))
+
+    def test_batch_matches_sequential_updates(self):
+        """Applying a batch gives the same book as one update at a time."""
+        rng = random.Random(7)
+        changes = [
+            (rng.random() < 0.5, Decimal(rng.randint(100, 200)), Decimal(rng.choice([0, 1, 3])))
+            for _ in range(500)
+        ]
+        batched, sequential = OrderBook(), OrderBook()
+        batched.apply(changes)
+        for is_bid, price, size in changes:
+            sequential.side(is_bid).update(price, size)
+
+        assert batched.bids.top(1000) == sequential.bids.top(1000)
+        assert batched.asks.top(1000) == sequential.asks.top(1000)
+
+    def test_version_counts_changes(self):
+        """Every applied change bumps the version; no-op deletes do not."""
+        book = OrderBook()
+        book.apply([(True, Decimal("100"), Decimal("1")), (False, Decimal("101"), Decimal("1"))])
+        assert book.version == 2
+
+        book.side(True).update(Decimal("99"), Decimal("0"))
+        assert book.version == 2
+
+        book.load([(Decimal("100"), Decimal("2"))], [])
+        assert book.version == 4
+
+    def test_copy_is_independent(self):
+        """A copy keeps its levels when the source book changes."""
+        book = OrderBook("gemini", "solusd")
+        book.side(True).update(Decimal("100"), Decimal("1"))
+        snapshot = book.copy()
+        book.side(True).update(Decimal("100"), Decimal("0"))
+
+        assert snapshot.bids.best() == (Decimal("100"), Decimal("1"))
+        assert snapshot.version == book.version - 1
+        assert book.bids.best() is None
+
+    def test_cumulative_depth(self):
+        """Cumulative sizes accumulate from the best level outwards."""
+        book = OrderBook()
+        book.load([], [(Decimal("101"), Decimal("2")), (Decimal("102"), Decimal("3")), (Decimal("103"), Decimal("5"))])
+
+        assert book.asks.cumulative(2) == [(Decimal("101"), Decimal("2")), (Decimal("102"), Decimal("5"))]
+        assert book.to_dict(3)["asks"][-1] == ["103", "5", "10"]
+
+    def test_to_book_update(self):
+        """The bus event carries the top levels as strings."""
+        book = OrderBook("coinbase", "SOL-USD")
+        book.load(
+            [(Decimal("145.20"), Decimal("1")), (Decimal("145.10"), Decimal("2"))],
+            [(Decimal("145.30"), Decimal("4"))]
+        )
+        update = book.to_book_update(1, sequence=42)
+
+        assert update.venue == "coinbase"
+        assert update.pair == "SOL-USD"
+        assert update.bids == [["145.20", "1"]]
+        assert update.asks == [["145.30", "4"]]
+        assert update.sequence == 42
+
+
+class TestBookView:
+    """Test suite for the lazy book event."""
+
+    def make_book(self) -> OrderBook:
+        book = OrderBook("coinbase", "SOL-USD")
+        book.load(
+            [(Decimal("145.20"), Decimal("1")), (Decimal("145.10"), Decimal("2"))],
+            [(Decimal("145.30"), Decimal("4")), (Decimal("145.40"), Decimal("1"))]
+        )
+        return book
+
+    def test_matches_book_update(self):
+        """Materialized fields equal the eagerly built BookUpdate."""
+        book = self.make_book()
+        view = book.view(10, sequence=7)
+        eager = book.to_book_update(10, timestamp=view.timestamp, sequence=7)
+
+        assert view.best_bid == Decimal("145.20")
+        assert view.best_ask == Decimal("145.30")
+        assert view.bids == eager.bids
+        assert view.asks == eager.asks
+        assert view.to_book_update() == eager
+        assert view.to_book_update() is view.to_book_update()
+
+    def test_unaffected_by_later_book_changes(self):
+        """A view keeps the levels it was created with."""
+        book = self.make_book()
+        view = book.view(1)
+        book.apply([(True, Decimal("145.20"), Decimal("0")), (False, Decimal("145.25"), Decimal("9"))])
+
+        assert view.version == book.version - 2
+        assert view.bids == [["145.20", "1"]]
+        assert view.asks == [["145.30", "4"]]
+
+    def test_empty_side(self):
+        """Missing sides have no best price and no levels."""
+        view = OrderBook("gemini", "solusd").view(10)
+        assert view.best_bid is None and view.best_ask is None
+        assert view.bids == [] and view.asks == []
+
+    def test_encodes_as_book_update(self):
+        """The codec sends a view as its BookUpdate model."""
+        from shared.codec import encode_event, decode_event
+
+        view = self.make_book().view(10)
+        decoded = decode_event(encode_event(view))
+        assert isinstance(decoded, BookUpdate)
+        assert decoded.bids == view.bids
+        assert decoded.asks == view.asks
+
+
+class TestDepthCurve:
+    """Test suite for VWAP by size."""
+
+    LEVELS = [(Decimal("100"), Decimal("1")), (Decimal("101"), Decimal("2")), (Decimal("103"), Decimal("2"))]
+
+    def test_vwap_walks_levels(self):
+        """The average price covers every level needed for the size."""
+        curve = DepthCurve(self.LEVELS, is_bid=False)
+        assert curve.vwap(Decimal("1")) == Decimal("100")
+        assert curve.vwap(Decimal("2")) == Decimal("100.5")
+        assert curve.vwap(Decimal("4")) == (Decimal("100") + Decimal("202") + Decimal("103")) / 4
+        assert curve.total_size == Decimal("5")
+
+    def test_unfillable_size(self):
+        """Sizes beyond the available depth have no executable price."""
+        assert DepthCurve(self.LEVELS, is_bid=True).vwap(Decimal("5.01")) is None
+        assert DepthCurve([], is_bid=True).vwap(Decimal("1")) is None
+
+    def test_fixed_point_rounds_against_taker(self):
+        """Integer VWAPs round up for buys and down for sells."""
+        scale = scale_for("SOL-USD", True)
+        levels = [(scale.price("100.0001"), scale.size("1")), (scale.price("100.0002"), scale.size("2"))]
+        size = scale.size("3")
+
+        assert DepthCurve(levels, is_bid=False, scale=scale).vwap(size) == scale.price("100.0002")
+        assert DepthCurve(levels, is_bid=True, scale=scale).vwap(size) == scale.price("100.0001")
+
+
+def make_coinbase_connector():
+    """Create a Coinbase connector with a throwaway signing key."""
+    from connectors.coinbase_connector import CoinbaseConnector
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    ).decode()
+    return CoinbaseConnector("test-key", pem)
+
+
+def l2_levels(side: str, levels) -> list:
+    """Coinbase l2_data update entries."""
+    return [{"side": side, "price_level": p, "new_quantity": q} for p, q in levels]
+
+
+class TestCoinbaseBook:
+    """Test suite for the Coinbase full-depth book."""
+
+    @pytest.mark.asyncio
+    async def test_deeper_levels_surface_after_top_deletes(self):
+        """Deleting top levels exposes levels beyond the top 20."""
+        connector = make_coinbase_connector()
+        bids = [(f"{100 - i}", "1") for i in range(30)]
+        asks = [(f"{101 + i}", "1") for i in range(30)]
+        await connector._handle_l2_snapshot({
+            "product_id": "SOL-USD",
+            "updates": l2_levels("bid", bids) + l2_levels("offer", asks)
+        }, 1)
+
+        # Remove the best 25 bids in one event
+        await connector._handle_l2_update({
+            "product_id": "SOL-USD",
+            "updates": l2_levels("bid", [(f"{100 - i}", "0") for i in range(25)])
+        }, 2)
+
+        book = connector.books["SOL-USD"]
+        assert len(book.bids) == 5
+        assert book.bids.best() == (Decimal("75"), Decimal("1"))
+        assert connector.get_best_bid_ask("SOL-USD") == (75.0, 1.0, 101.0, 1.0)
+        await connector.http_client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_update_batch_applies_all_entries(self):
+        """Every entry of an update event is applied."""
+        connector = make_coinbase_connector()
+        await connector._handle_l2_snapshot({
+            "product_id": "SOL-USD",
+            "updates": l2_levels("bid", [("145.00", "2")]) + l2_levels("offer", [("145.10", "2")])
+        }, 1)
+        await connector._handle_l2_update({
+            "product_id": "SOL-USD",
+            "updates": l2_levels("bid", [("145.05", "1"), ("145.00", "0")]) + l2_levels("offer", [("145.08", "4")])
+        }, 2)
+
+        book = connector.books["SOL-USD"]
+        assert book.bids.top(10) == [(Decimal("145.05"), Decimal("1"))]
+        assert book.asks.top(10) == [(Decimal("145.08"), Decimal("4")), (Decimal("145.10"), Decimal("2"))]
+        await connector.http_client.aclose()
+
+
+class FakeWebSocket:
+    """Records messages sent by a connector."""
+
+    def __init__(self):
+        self.sent = []
+        self.closed = False
+
+    async def send(self, message):
+        self.sent.append(json.loads(message))
+
+    async def close(self):
+        self.closed = True
+
+
+def collect_book_updates(monkeypatch, module) -> list:
+    """Route a connector module's events to a private bus and collect bookUpdates."""
+    bus = EventBus()
+    updates = []
+
+    async def collect(update):
+        updates.append(update)
+
+    bus.subscribe("cex.bookUpdate", collect)
+    monkeypatch.setattr(module, "event_bus", bus)
+    return updates
+
+
+def books_with_levels(updates: list) -> list:
+    """Book events excluding the empty books published on invalidation."""
+    return [u for u in updates if u.best_bid is not None and u.best_ask is not None]
+
+
+class TestBookResync:
+    """Test suite for sequence-gap and crossed-book resync."""
+
+    async def coinbase_with_book(self, monkeypatch):
+        import connectors.coinbase_connector as module
+
+        updates = collect_book_updates(monkeypatch, module)
+        connector = make_coinbase_connector()
+        connector.ws = FakeWebSocket()
+        connector.connected = True
+        await connector._handle_l2_snapshot({
+            "product_id": "SOL-USD",
+            "updates": l2_levels("bid", [("145.00", "2")]) + l2_levels("offer", [("145.10", "2")])
+        }, 1)
+        return connector, updates
+
+    @pytest.mark.asyncio
+    async def test_coinbase_gap_resubscribes_and_suppresses(self, monkeypatch):
+        """A sequence gap clears the book and mutes it until the next snapshot."""
+        connector, updates = await self.coinbase_with_book(monkeypatch)
+        assert connector._check_sequence(1)
+        assert connector._check_sequence(2)
+        assert not connector._check_sequence(5)
+
+        await connector._resync(list(connector.books), "gap")
+        assert [m["type"] for m in connector.ws.sent] == ["unsubscribe", "subscribe"]
+        assert connector.ws.sent[1]["product_ids"] == ["SOL-USD"]
+        assert connector.get_best_bid_ask("SOL-USD") == (None, None, None, None)
+        assert updates[-1].bids == [] and updates[-1].asks == []  # Invalidation published
+
+        # Updates before the snapshot are dropped
+        await connector._handle_l2_update({
+            "product_id": "SOL-USD", "updates": l2_levels("bid", [("145.05", "1")])
+        }, 6)
+        assert len(books_with_levels(updates)) == 1
+        assert len(connector.books["SOL-USD"].bids) == 0
+
+        await connector._handle_l2_snapshot({
+            "product_id": "SOL-USD",
+            "updates": l2_levels("bid", [("145.02", "3")]) + l2_levels("offer", [("145.08", "1")])
+        }, 7)
+        assert len(books_with_levels(updates)) == 2
+        assert not connector.sync.pending("SOL-USD")
+        assert connector.get_best_bid_ask("SOL-USD") == (145.02, 3.0, 145.08, 1.0)
+        await connector.http_client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_coinbase_crossed_book_is_not_published(self, monkeypatch):
+        """An update that crosses the book triggers a resync instead of an event."""
+        connector, updates = await self.coinbase_with_book(monkeypatch)
+        await connector._handle_l2_update({
+            "product_id": "SOL-USD", "updates": l2_levels("bid", [("145.20", "1")])
+        }, 2)
+
+        assert len(books_with_levels(updates)) == 1
+        assert connector.sync.pending("SOL-USD")
+        assert connector.ws.sent[-1]["type"] == "subscribe"
+        await connector.http_client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_gemini_crossed_book_reconnects(self, monkeypatch):
+        """A crossed Gemini book clears every book and closes the WS for fresh snapshots."""
+        import connectors.gemini_connector as module
+
+        updates = collect_book_updates(monkeypatch, module)
+        connector = module.GeminiConnector()
+        connector.public_ws = FakeWebSocket()
+        for symbol in ("solusd", "btcusd"):
+            await connector._handle_public_message({
+                "type": "l2_updates", "symbol": symbol,
+                "changes": [["buy", "100.00", "1"], ["sell", "100.10", "1"]]
+            })
+        assert [u.sequence for u in updates] == [2, 2]
+
+        await connector._handle_public_message({
+            "type": "l2_updates", "symbol": "solusd", "changes": [["buy", "100.20", "1"]]
+        })
+        assert connector.public_ws.closed
+        assert len(books_with_levels(updates)) == 2
+        assert connector.get_best_bid_ask("btcusd") is None
+        assert connector.sync.pending_pairs() == ["solusd", "btcusd"]
+
+        # Messages still buffered on the closing socket are ignored
+        await connector._handle_public_message({
+            "type": "l2_updates", "symbol": "btcusd", "changes": [["buy", "99.00", "1"]]
+        })
+        assert len(connector.order_books["btcusd"].bids) == 0
+
+        # The reconnect's snapshot restores the book
+        connector.reconnecting = False
+        await connector._handle_public_message({
+            "type": "l2_updates", "symbol": "solusd",
+            "changes": [["buy", "100.00", "1"], ["sell", "100.10", "1"]]
+        })
+        assert len(books_with_levels(updates)) == 3
+        assert connector.get_best_bid_ask("solusd") == (Decimal("100.00"), Decimal("100.10"))
+        assert connector.sync.pending_pairs() == ["btcusd"]
+
+    @pytest.mark.asyncio
+    async def test_invalidated_book_stops_signals(self, monkeypatch):
+        """After invalidation, DEX updates no longer pair with the last pre-gap book."""
+        import connectors.gemini_connector as module
+        from engines.signal_engine import SignalEngine
+
+        bus = EventBus()
+        monkeypatch.setattr(module, "event_bus", bus)
+        engine = SignalEngine(bus=bus, fixed_point=False)
+        opportunities = []
+
+        async def collect(opp):
+            opportunities.append(opp)
+
+        bus.subscribe("signal.opportunity", collect)
+        connector = module.GeminiConnector()
+        await connector._handle_public_message({
+            "type": "l2_updates", "symbol": "solusd",
+            "changes": [["buy", "140.00", "100"], ["sell", "145.00", "100"]]
+        })
+        pool = PoolUpdate(
+            program="whirlpool", pool=SOL_POOL, timestamp=datetime.now(timezone.utc),
+            reserves={}, price_mid=Decimal("150"), fee_bps=30
+        )
+        await bus.publish("dex.poolUpdate", pool)
+        assert len(opportunities) == 1
+
+        await connector._invalidate_books("disconnect")
+        assert ("SOL-USD", "gemini") not in engine.cex_books
+        assert engine.nbbo.get("SOL-USD").ask is None
+        assert [o.state for o in opportunities] == [OpportunityState.OPEN, OpportunityState.CLOSED]
+
+        await bus.publish("dex.poolUpdate", pool)
+        assert len(opportunities) == 2
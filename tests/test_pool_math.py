@@ -324,6 +324,32 @@ class TestPoolMathRealWorldScenarios:
         assert amount_a > Decimal("9.9")  # Lost ~1% to fees + slippage
 
 
+
+class TestConstantProductExactOut:
+    """Test suite for exact-output constant product quotes."""
+    
+    def test_inverts_forward_quote(self):
+        """Feeding the required input into the forward quote returns the requested output."""
+        reserve_in = Decimal("500000")
+        reserve_out = Decimal("3400")
+        amount_out = Decimal("50")
+        
+        amount_in, exec_price, _ = PoolMath.constant_product_quote_exact_out(
+            reserve_in, reserve_out, amount_out, fee_bps=30
+        )
+        forward_out, _, _ = PoolMath.constant_product_quote(reserve_in, reserve_out, amount_in, fee_bps=30)
+        
+        assert abs(forward_out - amount_out) < Decimal("1e-20")
+        assert exec_price == amount_in / amount_out
+        # Buying moves the price against us: more than the mid per token
+        assert exec_price > reserve_in / reserve_out
+    
+    def test_rejects_output_beyond_reserve(self):
+        """A pool cannot pay out its whole reserve."""
+        with pytest.raises(ValueError):
+            PoolMath.constant_product_quote_exact_out(Decimal("1000"), Decimal("10"), Decimal("10"))
+
+
 if __name__ == "__main__":
     # Run tests with: pytest tests/test_pool_math.py -v
     pytest.main([__file__, "-v"])
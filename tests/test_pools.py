@@ -0,0 +1,218 @@
+"""Unit tests for the DEX pool registry."""
+import json
+import pytest
+import sys
+import os
+from decimal import Decimal
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+# Add backend directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../backend'))
+
+from config import settings
+from shared.events import EventBus
+from shared.fixedpoint import scale_for
+from shared.orderbook import OrderBook
+from shared.pools import PoolInfo, PoolRegistry
+from shared.types import PoolUpdate
+
+WBTC_MINT = "3NZ9JMVBmGAqocybic2c7LQCJScmgsAZ6vQqTDzcqmJh"
+
+
+def sol_pool(address: str, fee_bps: int = 30) -> PoolInfo:
+    return PoolInfo(
+        address=address, program="whirlpool", asset="SOL-USD",
+        base_mint=settings.wsol_mint, quote_mint=settings.usdc_mint,
+        base_decimals=9, quote_decimals=6, fee_bps=fee_bps
+    )
+
+
+def btc_pool(address: str = "btc-pool") -> PoolInfo:
+    return PoolInfo(
+        address=address, program="whirlpool", asset="BTC-USD",
+        base_mint=WBTC_MINT, quote_mint=settings.usdc_mint,
+        base_decimals=8, quote_decimals=6, fee_bps=5
+    )
+
+
+def pool_update(address: str, price_mid: str, reserves: dict = None) -> PoolUpdate:
+    return PoolUpdate(
+        program="whirlpool", pool=address, timestamp=datetime.now(timezone.utc),
+        reserves=reserves or {}, price_mid=Decimal(price_mid), fee_bps=30
+    )
+
+
+class TestPoolRegistry:
+    """Test suite for registry lookups and loading."""
+
+    def test_lookups(self):
+        registry = PoolRegistry([sol_pool("a"), sol_pool("b"), btc_pool()])
+        registry.add(PoolInfo(**{**btc_pool("c").model_dump(), "program": "raydium"}))
+
+        assert registry.get("b").asset == "SOL-USD"
+        assert registry.get("missing") is None
+        assert [p.address for p in registry.for_asset("SOL-USD")] == ["a", "b"]
+        assert registry.addresses("whirlpool") == ["a", "b", "btc-pool"]
+        assert len(registry) == 4 and "c" in registry
+
+    def test_replacing_a_pool_moves_its_asset(self):
+        registry = PoolRegistry([sol_pool("a")])
+        registry.add(PoolInfo(**{**btc_pool().model_dump(), "address": "a"}))
+        assert registry.for_asset("SOL-USD") == []
+        assert registry.get("a").asset == "BTC-USD"
+
+    def test_from_file(self, tmp_path):
+        path = tmp_path / "pools.json"
+        path.write_text(json.dumps([sol_pool("a").model_dump(), btc_pool().model_dump()]))
+        registry = PoolRegistry.from_file(str(path))
+        assert registry.get("btc-pool") == btc_pool()
+
+        path.write_text(json.dumps([{**btc_pool().model_dump(), "base_decimals": -1}]))
+        with pytest.raises(ValueError):
+            PoolRegistry.from_file(str(path))
+
+    def test_from_file_rejects_unknown_assets(self, tmp_path):
+        """A pool for an asset the engine does not track fails at load."""
+        path = tmp_path / "pools.json"
+        doge = {**sol_pool("d").model_dump(), "asset": "DOGE-USD"}
+        path.write_text(json.dumps([sol_pool("a").model_dump(), doge]))
+        with pytest.raises(ValueError, match="DOGE-USD"):
+            PoolRegistry.from_file(str(path), settings.assets)
+
+        path.write_text(json.dumps([sol_pool("a").model_dump(), btc_pool().model_dump()]))
+        assert len(PoolRegistry.from_file(str(path), settings.assets)) == 2
+
+
+class TestRegistryConsumers:
+    """Test suite for components resolving pools through the registry."""
+
+    async def run(self, registry: PoolRegistry, pools: list, book: OrderBook, fixed_point: bool = False):
+        from engines.signal_engine import SignalEngine
+
+        bus = EventBus()
+        engine = SignalEngine(bus=bus, fixed_point=fixed_point, pools=registry)
+        opportunities = []
+
+        async def collect(opp):
+            opportunities.append(opp)
+
+        bus.subscribe("signal.opportunity", collect)
+        for pool in pools:
+            await bus.publish("dex.poolUpdate", pool)
+        await bus.publish("cex.bookUpdate", book.view(10))
+        return engine, opportunities
+
+    @pytest.mark.asyncio
+    async def test_best_pool_per_direction(self):
+        """Each direction trades against the pool with the better price."""
+        registry = PoolRegistry([sol_pool("low"), sol_pool("high"), sol_pool("mid")])
+        book = OrderBook("gemini", "solusd")
+        book.load([(Decimal("140"), Decimal("100"))], [(Decimal("145"), Decimal("100"))])
+        pools = [pool_update("low", "149"), pool_update("high", "152"), pool_update("mid", "150")]
+        engine, opportunities = await self.run(registry, pools, book)
+
+        assert [(o.direction, o.dex_pool, o.dex_price) for o in opportunities] == [
+            ("cex_to_dex", "high", Decimal("152"))
+        ]
+        assert engine.best_pools.get("SOL-USD").ask_venue == "low"
+
+    @pytest.mark.asyncio
+    async def test_unregistered_pool_is_ignored(self):
+        book = OrderBook("gemini", "solusd")
+        book.load([(Decimal("140"), Decimal("100"))], [(Decimal("145"), Decimal("100"))])
+        engine, opportunities = await self.run(PoolRegistry([sol_pool("a")]), [pool_update("b", "150")], book)
+        assert opportunities == []
+        assert engine.dex_pools == {}
+
+    @pytest.mark.asyncio
+    async def test_pool_maps_to_its_asset_and_decimals(self):
+        """A BTC pool prices BTC-USD with its own mints and decimals in both number modes."""
+        reserves = {WBTC_MINT: "1000", settings.usdc_mint: "100000000"}  # mid 100000
+        prices = []
+        for fixed_point in (False, True):
+            scale = scale_for("btcusd", fixed_point)
+            book = OrderBook("gemini", "btcusd", scale)
+            book.load([(scale.price("85000"), scale.size("100"))], [(scale.price("90000"), scale.size("100"))])
+            _, opportunities = await self.run(
+                PoolRegistry([btc_pool()]), [pool_update("btc-pool", "100000", reserves)], book, fixed_point
+            )
+            [opp] = opportunities
+            assert (opp.asset, opp.dex_pool, opp.direction) == ("BTC-USD", "btc-pool", "cex_to_dex")
+            prices.append(opp.dex_price)
+
+        assert Decimal("95000") < prices[0] < Decimal("100000")  # Selling 50 BTC after impact
+        assert abs(prices[0] - prices[1]) <= Decimal("0.01")
+
+    @pytest.mark.asyncio
+    async def test_fetch_pool_state_uses_registry_decimals(self):
+        """sqrtPrice is adjusted by the pool's own decimals and oriented base/quote."""
+        from connectors.solana_connector import SolanaConnector
+
+        def account(price_raw: Decimal, liquidity: int = 0) -> bytes:
+            sqrt_price = int(price_raw.sqrt() * Decimal(2 ** 64))
+            data = bytearray(144)
+            data[49:65] = liquidity.to_bytes(16, "little")
+            data[65:81] = sqrt_price.to_bytes(16, "little")
+            return bytes(data)
+
+        class FakeClient:
+            def __init__(self, data: bytes):
+                self.data = data
+
+            async def get_account_info(self, pubkey):
+                return SimpleNamespace(value=SimpleNamespace(data=self.data))
+
+        address = "HJPjoWUrhoZzkNfRpHuieeFk9WcZWjwy6PBjZ81ngndJ"  # Any valid pubkey
+        # BTC (8 decimals) as token A: raw price is 100000 * 10^(6 - 8)
+        connector = SolanaConnector(PoolRegistry([btc_pool(address)]))
+        connector.client = FakeClient(account(Decimal("1000")))
+        state = await connector.fetch_pool_state(address)
+        assert state["price_mid"] == pytest.approx(Decimal("100000"), rel=Decimal("1e-9"))
+        assert state["fee_bps"] == 5
+        assert state["token_a_reserve"] == state["token_b_reserve"] == 0  # No liquidity in range
+
+        # Virtual reserves: L / sqrtPrice BTC units and L * sqrtPrice USDC units
+        liquidity = 10 ** 12
+        connector.client = FakeClient(account(Decimal("1000"), liquidity))
+        state = await connector.fetch_pool_state(address)
+        btc = Decimal(liquidity) / Decimal(1000).sqrt() / Decimal(10) ** 8
+        assert state["token_b_reserve"] == pytest.approx(btc, rel=Decimal("1e-9"))
+        assert state["token_a_reserve"] / state["token_b_reserve"] == pytest.approx(
+            state["price_mid"], rel=Decimal("1e-9")
+        )
+
+        # Base as token B: the pool quotes base per quote
+        info = PoolInfo(**{**btc_pool(address).model_dump(), "base_is_token_a": False})
+        connector = SolanaConnector(PoolRegistry([info]))
+        connector.client = FakeClient(account(Decimal("1e-5") * Decimal("1e2"), liquidity))
+        state = await connector.fetch_pool_state(address)
+        assert state["price_mid"] == pytest.approx(Decimal("100000"), rel=Decimal("1e-9"))
+        assert state["token_a_reserve"] / state["token_b_reserve"] == pytest.approx(
+            state["price_mid"], rel=Decimal("1e-9")
+        )
+
+        connector = SolanaConnector(PoolRegistry())
+        with pytest.raises(ValueError):
+            await connector.fetch_pool_state(address)
+
+    @pytest.mark.asyncio
+    async def test_pool_without_liquidity_publishes_mid_only(self, monkeypatch):
+        import connectors.solana_connector as module
+
+        bus = EventBus()
+        updates = []
+
+        async def collect(update):
+            updates.append(update)
+
+        bus.subscribe("dex.poolUpdate", collect)
+        monkeypatch.setattr(module, "event_bus", bus)
+        connector = module.SolanaConnector(PoolRegistry([btc_pool()]))
+        await connector._emit_pool_update({
+            "address": "btc-pool", "token_a_reserve": Decimal(0), "token_b_reserve": Decimal(0),
+            "price_mid": Decimal("100000"), "fee_bps": 5
+        })
+
+        assert updates[0].reserves == {}
+        assert updates[0].price_mid == Decimal("100000")
@@ -0,0 +1,276 @@
+"""Unit tests for signal engine spread detection."""
+import pytest
+import sys
+import os
+from decimal import Decimal
+from datetime import datetime, timezone
+
+# Add backend directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../backend'))
+
+from config import settings
+from shared.events import EventBus
+from shared.fixedpoint import scale_for
+from shared.orderbook import OrderBook
+from shared.types import OpportunityState, PoolUpdate
+from engines.signal_engine import SignalEngine
+from observability.metrics import registry
+from shared.pools import pool_registry
+
+SOL_POOL = pool_registry.for_asset("SOL-USD")[0].address
+
+
+def make_pool(price_mid: str, reserves: dict = None) -> PoolUpdate:
+    return PoolUpdate(
+        program="whirlpool", pool=SOL_POOL, timestamp=datetime.now(timezone.utc),
+        reserves=reserves or {}, price_mid=Decimal(price_mid), fee_bps=30
+    )
+
+
+async def run(book: OrderBook, pool: PoolUpdate, fixed_point: bool = False, *others: OrderBook) -> list:
+    """Publish one pool update and book views; return emitted opportunities."""
+    bus = EventBus()
+    SignalEngine(bus=bus, fixed_point=fixed_point)
+    opportunities = []
+
+    async def collect(opp):
+        opportunities.append(opp)
+
+    bus.subscribe("signal.opportunity", collect)
+    await bus.publish("dex.poolUpdate", pool)
+    for other in others:
+        await bus.publish("cex.bookUpdate", other.view(10))
+    await bus.publish("cex.bookUpdate", book.view(10))
+    return opportunities
+
+
+class TestExecutablePrices:
+    """Test suite for size-aware spreads."""
+
+    @pytest.mark.asyncio
+    async def test_cex_price_is_vwap_for_size(self, monkeypatch):
+        """The opportunity's CEX price walks the book for the full size."""
+        monkeypatch.setattr(settings, "max_position_size_usd", 10000.0)  # Trade the probe size
+        book = OrderBook("gemini", "solusd")
+        book.load(
+            [(Decimal("140"), Decimal("100"))],
+            [(Decimal("145.00"), Decimal("10")), (Decimal("145.50"), Decimal("40"))]
+        )
+        opportunities = await run(book, make_pool("150"))
+
+        assert [o.direction for o in opportunities] == ["cex_to_dex"]
+        assert opportunities[0].cex_price == Decimal("145.40")  # (10*145 + 40*145.5) / 50
+        assert opportunities[0].size == Decimal("50")
+
+    @pytest.mark.asyncio
+    async def test_unsized_fallback_is_capped(self):
+        """Without reserves the probe size is capped at the position limit and re-priced."""
+        book = OrderBook("gemini", "solusd")
+        book.load(
+            [(Decimal("140"), Decimal("100"))],
+            [(Decimal("145.00"), Decimal("10")), (Decimal("145.50"), Decimal("40"))]
+        )
+        [opp] = await run(book, make_pool("150"))
+
+        assert opp.size == Decimal("6.877")  # 1000 USD / 145.40, rounded down
+        assert opp.cex_price == Decimal("145.00")  # Fits in the top level
+        assert opp.expected_pnl_usd is None
+
+    @pytest.mark.asyncio
+    async def test_thin_top_of_book_does_not_fire(self):
+        """A top-of-book spread that vanishes at size emits nothing."""
+        book = OrderBook("gemini", "solusd")
+        book.load(
+            [(Decimal("140"), Decimal("100"))],
+            [(Decimal("149.00"), Decimal("1")), (Decimal("151.00"), Decimal("100"))]
+        )
+        assert await run(book, make_pool("150")) == []
+
+    @pytest.mark.asyncio
+    async def test_unfillable_size_does_not_fire(self):
+        """No opportunity on a side without enough depth for the size."""
+        book = OrderBook("gemini", "solusd")
+        book.load([(Decimal("140"), Decimal("100"))], [(Decimal("145.00"), Decimal("49"))])
+        assert await run(book, make_pool("150")) == []
+
+    @pytest.mark.asyncio
+    async def test_dex_price_includes_impact(self):
+        """With reserves, the DEX leg is priced after impact, not at mid."""
+        reserves = {settings.usdc_mint: "15000", settings.wsol_mint: "100"}  # mid 150
+        book = OrderBook("gemini", "solusd")
+        book.load([(Decimal("140"), Decimal("100"))], [(Decimal("145.00"), Decimal("100"))])
+        opportunities = await run(book, make_pool("150", reserves))
+
+        # Selling 50 SOL into 100/15000: 15000 * 50 / 150 / 50 = 100 per SOL
+        assert opportunities == []
+
+        reserves = {settings.usdc_mint: "1500000", settings.wsol_mint: "10000"}
+        opportunities = await run(book, make_pool("150", reserves))
+        assert len(opportunities) == 1
+        assert Decimal("149") < opportunities[0].dex_price < Decimal("150")
+
+    @pytest.mark.asyncio
+    async def test_fixed_point_dex_price_matches_decimal(self):
+        """Fixed-point mode prices the DEX leg with integer pool math, within one tick."""
+        reserves = {settings.usdc_mint: "1500000", settings.wsol_mint: "10000"}
+        scale = scale_for("solusd", True)
+        tick = Decimal("0.0001")
+
+        for bid, ask, direction in (("140", "145", "cex_to_dex"), ("155", "160", "dex_to_cex")):
+            book = OrderBook("gemini", "solusd")
+            book.load([(Decimal(bid), Decimal("100"))], [(Decimal(ask), Decimal("100"))])
+            fixed_book = OrderBook("gemini", "solusd", scale)
+            fixed_book.load(
+                [(scale.price(bid), scale.size("100"))], [(scale.price(ask), scale.size("100"))]
+            )
+            expected = await run(book, make_pool("150", reserves))
+            actual = await run(fixed_book, make_pool("150", reserves), fixed_point=True)
+
+            assert [o.direction for o in actual] == [direction]
+            if direction == "cex_to_dex":
+                # Selling into the pool rounds down
+                assert expected[0].dex_price - tick <= actual[0].dex_price <= expected[0].dex_price
+            else:
+                # Buying from the pool rounds up
+                assert expected[0].dex_price <= actual[0].dex_price <= expected[0].dex_price + tick
+
+
+class TestMultiVenue:
+    """Test suite for pricing against the best CEX venue."""
+
+    @pytest.mark.asyncio
+    async def test_coinbase_book_is_evaluated(self):
+        """Coinbase symbols resolve to the same asset as Gemini's."""
+        book = OrderBook("coinbase", "SOL-USD")
+        book.load([(Decimal("140"), Decimal("100"))], [(Decimal("145"), Decimal("100"))])
+        opportunities = await run(book, make_pool("150"))
+
+        assert [(o.direction, o.cex_venue, o.cex_symbol) for o in opportunities] == [
+            ("cex_to_dex", "coinbase", "SOL-USD")
+        ]
+
+    @pytest.mark.asyncio
+    async def test_prices_against_best_venue(self):
+        """The opportunity uses the cheapest ask across venues, whichever updated last."""
+        gemini = OrderBook("gemini", "solusd")
+        gemini.load([(Decimal("140"), Decimal("100"))], [(Decimal("144"), Decimal("100"))])
+        coinbase = OrderBook("coinbase", "SOL-USD")
+        coinbase.load([(Decimal("141"), Decimal("100"))], [(Decimal("146"), Decimal("100"))])
+        opportunities = await run(coinbase, make_pool("150"), False, gemini)
+
+        assert opportunities[-1].cex_venue == "gemini"
+        assert opportunities[-1].cex_symbol == "solusd"
+        assert opportunities[-1].cex_price == Decimal("144")
+
+    @pytest.mark.asyncio
+    async def test_venues_ranked_net_of_fees(self):
+        """A lower raw ask loses to a venue whose taker fee makes it cheaper."""
+        gemini = OrderBook("gemini", "solusd")  # 145.00 * 1.0035 = 145.51
+        gemini.load([(Decimal("140"), Decimal("100"))], [(Decimal("145.00"), Decimal("100"))])
+        coinbase = OrderBook("coinbase", "SOL-USD")  # 144.80 * 1.0060 = 145.67
+        coinbase.load([(Decimal("141"), Decimal("100"))], [(Decimal("144.80"), Decimal("100"))])
+        opportunities = await run(coinbase, make_pool("150"), False, gemini)
+
+        opp = opportunities[-1]
+        assert (opp.cex_venue, opp.cex_price) == ("gemini", Decimal("145.00"))
+        assert opp.predicted_pnl_pct == opp.spread_pct - Decimal("0.35") - Decimal("1.05")
+
+    @pytest.mark.asyncio
+    async def test_costs_use_venue_fee(self):
+        book = OrderBook("coinbase", "SOL-USD")
+        book.load([(Decimal("140"), Decimal("100"))], [(Decimal("145"), Decimal("100"))])
+        [opp] = await run(book, make_pool("150"))
+        assert opp.predicted_pnl_pct == opp.spread_pct - Decimal("0.60") - Decimal("1.05")
+
+
+def evaluations(result: str) -> float:
+    count = registry.get_sample_value(
+        "arb_signal_evaluations_total", {"asset": "SOL-USD", "result": result}
+    )
+    return count or 0
+
+
+class TestChangeDrivenEvaluation:
+    """Test suite for skipping updates that leave the executable prices unchanged."""
+
+    @pytest.mark.asyncio
+    async def test_deep_book_change_is_skipped(self, monkeypatch):
+        """Only updates that move prices at size reach the direction checks."""
+        monkeypatch.setattr(settings, "max_position_size_usd", 10000.0)  # Trade the probe size
+        bus = EventBus()
+        engine = SignalEngine(bus=bus, fixed_point=False)
+        opportunities = []
+
+        async def collect(opp):
+            opportunities.append(opp)
+
+        bus.subscribe("signal.opportunity", collect)
+        base_evaluated, base_skipped = evaluations("evaluated"), evaluations("skipped")
+
+        book = OrderBook("gemini", "solusd")
+        book.load(
+            [(Decimal("140"), Decimal("100"))],
+            [(Decimal("145"), Decimal("100")), (Decimal("147"), Decimal("100"))]
+        )
+        await bus.publish("dex.poolUpdate", make_pool("150"))
+        await bus.publish("cex.bookUpdate", book.view(10))
+
+        # A level behind the 50 filled at the top: same VWAP, skipped
+        book.asks.update(Decimal("148"), Decimal("5"))
+        await bus.publish("cex.bookUpdate", book.view(10))
+        # The top moves: evaluated again
+        book.asks.update(Decimal("145"), Decimal("30"))
+        await bus.publish("cex.bookUpdate", book.view(10))
+
+        assert evaluations("evaluated") - base_evaluated == 2
+        assert evaluations("skipped") - base_skipped == 1
+        assert [o.cex_price for o in opportunities] == [Decimal("145"), Decimal("145.8")]
+
+
+class TestOpportunityLifecycle:
+    """Test suite for one Opportunity per spread episode."""
+
+    async def feed(self, dex_prices) -> list:
+        """Fixed book (ask 145), one pool update per DEX price; return emitted events."""
+        bus = EventBus()
+        engine = SignalEngine(bus=bus, fixed_point=False)
+        engine.threshold_pct = Decimal("1.0")
+        events = []
+
+        async def collect(opp):
+            events.append(opp)
+
+        bus.subscribe("signal.opportunity", collect)
+        book = OrderBook("gemini", "solusd")
+        book.load([(Decimal("100"), Decimal("100"))], [(Decimal("145"), Decimal("100"))])
+        await bus.publish("cex.bookUpdate", book.view(10))
+        for price in dex_prices:
+            await bus.publish("dex.poolUpdate", make_pool(price))
+        return events
+
+    @pytest.mark.asyncio
+    async def test_episode_open_update_close(self):
+        """Small moves update in place silently; material moves and the close are emitted."""
+        # Costs 1.4%, threshold 1.0%: 149.1 -> 1.43% net opens; 149.15 (+0.03) is
+        # immaterial; 149.4 (1.63%) is material; 148.4 (0.94%) is below the
+        # threshold but within hysteresis; 148.2 (0.81%) closes
+        events = await self.feed(["147", "149.1", "149.15", "149.4", "148.4", "148.2"])
+
+        assert [e.state for e in events] == [
+            OpportunityState.OPEN, OpportunityState.UPDATED, OpportunityState.UPDATED, OpportunityState.CLOSED
+        ]
+        assert len({e.id for e in events}) == 1
+        closed = events[-1]
+        assert closed.peak_spread_pct == (Decimal("149.4") - 145) / 145 * 100
+        assert closed.updates == 3
+        assert closed.closed_ts is not None
+        # Published events are snapshots, not the live episode
+        assert events[0].dex_price == Decimal("149.1")
+
+    @pytest.mark.asyncio
+    async def test_reopen_is_a_new_episode(self):
+        events = await self.feed(["149.1", "147", "149.1"])
+        assert [e.state for e in events] == [
+            OpportunityState.OPEN, OpportunityState.CLOSED, OpportunityState.OPEN
+        ]
+        assert events[0].id == events[1].id != events[2].id
@@ -0,0 +1,123 @@
+"""Unit tests for PnL-maximizing trade sizing."""
+import pytest
+import sys
+import os
+from decimal import Decimal
+from datetime import datetime, timezone
+
+import numpy as np
+
+# Add backend directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../backend'))
+
+from config import settings
+from shared.events import EventBus
+from shared.orderbook import OrderBook
+from shared.types import PoolUpdate
+from engines.execution_engine import ExecutionEngine
+from engines.signal_engine import SignalEngine
+from engines.sizing import evaluate, optimal_size
+from shared.pools import pool_registry
+
+SOL_POOL = pool_registry.for_asset("SOL-USD")[0].address
+
+ASKS = ([145.0, 145.5, 146.0, 147.0], [20.0, 40.0, 80.0, 200.0])
+BIDS = ([155.0, 154.5, 154.0, 153.0], [20.0, 40.0, 80.0, 200.0])
+POOL = (10000.0, 1500000.0)  # 10k SOL / 1.5M USDC, mid 150
+
+
+class TestOptimalSize:
+    """Test suite for the closed-form optimal size."""
+
+    @pytest.mark.parametrize("direction,levels", [("cex_to_dex", ASKS), ("dex_to_cex", BIDS)])
+    def test_beats_size_grid(self, direction, levels):
+        """No size on a dense grid over the book depth earns more."""
+        result = optimal_size(direction, *levels, *POOL, 30, 0.35)
+        assert result is not None
+
+        grid = np.linspace(0.01, sum(levels[1]), 20000)
+        pnl = evaluate(direction, *levels, *POOL, 30, 0.35, grid)
+        assert result.pnl >= np.nanmax(pnl) - 1e-6
+        assert 0 < result.size < sum(levels[1])
+
+    def test_optimum_inside_a_level(self):
+        """A single deep level is sized where the pool's marginal price meets it."""
+        result = optimal_size("cex_to_dex", [145.0], [1000.0], *POOL, 0, 0.0)
+        B, Q = POOL
+        assert result.size == pytest.approx((Q * B / 145.0) ** 0.5 - B)
+        assert result.cex_price == pytest.approx(145.0)
+
+    def test_notional_cap(self):
+        """Size is capped by the notional limit at the top-of-book price."""
+        result = optimal_size("cex_to_dex", *ASKS, *POOL, 30, 0.35, max_notional=1000.0)
+        assert result.size == pytest.approx(1000.0 / 145.0)
+        assert result.pnl > 0
+
+    def test_unprofitable_is_none(self):
+        """No profitable size when the book is through the pool after fees."""
+        assert optimal_size("cex_to_dex", [149.9], [100.0], *POOL, 30, 0.35) is None
+        assert optimal_size("dex_to_cex", [150.1], [100.0], *POOL, 30, 0.35) is None
+
+
+class TestEngineSizing:
+    """Test suite for sizing opportunities in the signal engine."""
+
+    @pytest.mark.asyncio
+    async def test_opportunity_is_sized(self):
+        """With reserves the opportunity carries the optimal size and its PnL."""
+        bus = EventBus()
+        engine = SignalEngine(bus=bus)
+        opportunities = []
+
+        async def collect(opp):
+            opportunities.append(opp)
+
+        bus.subscribe("signal.opportunity", collect)
+        reserves = {settings.usdc_mint: "1500000", settings.wsol_mint: "10000"}
+        await bus.publish("dex.poolUpdate", PoolUpdate(
+            program="whirlpool", pool=SOL_POOL, timestamp=datetime.now(timezone.utc),
+            reserves=reserves, price_mid=Decimal("150"), fee_bps=30
+        ))
+        book = OrderBook("gemini", "solusd")
+        book.load(
+            [(Decimal("140"), Decimal("500"))],
+            [(Decimal(str(p)), Decimal(str(s))) for p, s in zip(*ASKS)]
+        )
+        await bus.publish("cex.bookUpdate", book.view(10))
+
+        expected = optimal_size(
+            "cex_to_dex", *ASKS, *POOL, 30, float(engine.cex_fee_pct), settings.max_position_size_usd
+        )
+        assert len(opportunities) == 1
+        opp = opportunities[0]
+        assert opp.size == Decimal(expected.size).quantize(engine.size_step, rounding="ROUND_DOWN")
+        assert opp.size != engine.base_size
+        assert opp.expected_pnl_usd == Decimal(expected.pnl).quantize(Decimal("0.01"))
+        assert opp.cex_price == Decimal("145.00")  # Fits in the top level
+        assert Decimal("149") < opp.dex_price < Decimal("150")
+
+    @pytest.mark.asyncio
+    async def test_unprofitable_is_sized_zero_and_not_traded(self):
+        """A spread that passes the screen but loses to the pool's fee tier is not traded."""
+        bus = EventBus()
+        SignalEngine(bus=bus)
+        execution = ExecutionEngine(bus=bus, observe_only=True)
+        opportunities = []
+
+        async def collect(opp):
+            opportunities.append(opp)
+
+        bus.subscribe("signal.opportunity", collect)
+        reserves = {settings.usdc_mint: "1500000", settings.wsol_mint: "10000"}
+        await bus.publish("dex.poolUpdate", PoolUpdate(
+            program="whirlpool", pool=SOL_POOL, timestamp=datetime.now(timezone.utc),
+            reserves=reserves, price_mid=Decimal("150"), fee_bps=500  # 5% fee tier
+        ))
+        book = OrderBook("gemini", "solusd")
+        book.load([(Decimal("140"), Decimal("500"))], [(Decimal("145"), Decimal("500"))])
+        await bus.publish("cex.bookUpdate", book.view(10))
+
+        [opp] = opportunities
+        assert opp.size == 0
+        assert opp.expected_pnl_usd is None
+        assert execution.trade_history == []
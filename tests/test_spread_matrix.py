@@ -0,0 +1,90 @@
+"""Unit tests for the vectorized venue x pool spread matrix."""
+import math
+import pytest
+import sys
+import os
+from decimal import Decimal
+from datetime import datetime, timezone
+
+# Add backend directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../backend'))
+
+from engines.spread_matrix import SpreadMatrix
+from engines.signal_engine import SignalEngine
+from shared.events import EventBus
+from shared.orderbook import OrderBook
+from shared.types import PoolUpdate
+from shared.pools import pool_registry
+
+SOL_POOL = pool_registry.for_asset("SOL-USD")[0].address
+
+FEES = {"gemini": 0.35, "coinbase": 0.60}
+
+
+class TestSpreadMatrix:
+    """Test suite for spread and net PnL cubes."""
+
+    def test_spreads_and_net_per_venue_fee(self):
+        """Each (venue, pool) cell nets out that venue's and pool's fee."""
+        matrix = SpreadMatrix(["SOL-USD", "BTC-USD"], FEES, haircut_pct=0.1)
+        matrix.update_cex("SOL-USD", "gemini", 144.0, 145.0)
+        matrix.update_cex("SOL-USD", "coinbase", 146.0, 147.0)
+        matrix.update_dex("SOL-USD", "orca", 150.0, 151.0, fee_bps=30)
+        spreads = matrix.compute()
+
+        assert spreads.cex_to_dex.shape == (2, 2, 1)
+        assert spreads.cex_to_dex[0, 0, 0] == pytest.approx((150 - 145) / 145 * 100)
+        assert spreads.cex_to_dex_net[0, 1, 0] == pytest.approx((150 - 147) / 147 * 100 - 0.60 - 0.30 - 0.1)
+        assert spreads.dex_to_cex[0, 1, 0] == pytest.approx((146 - 151) / 151 * 100)
+        # No BTC prices: NaN, not zero
+        assert math.isnan(spreads.cex_to_dex[1, 0, 0])
+
+    def test_best_picks_venue_and_pool(self):
+        """The best cell is found across venues and pools; unpriced assets are omitted."""
+        matrix = SpreadMatrix(["SOL-USD", "BTC-USD"], FEES)
+        matrix.update_cex("SOL-USD", "gemini", 144.0, 145.0)
+        matrix.update_cex("SOL-USD", "coinbase", 143.0, 144.0)
+        matrix.update_dex("SOL-USD", "orca", 150.0, 151.0, fee_bps=30)
+        matrix.update_dex("SOL-USD", "raydium", 152.0, 153.0, fee_bps=25)
+
+        [best] = matrix.best()
+        assert (best.asset, best.direction, best.venue, best.pool) == ("SOL-USD", "cex_to_dex", "coinbase", "raydium")
+        assert best.net_pct == pytest.approx((152 - 144) / 144 * 100 - 0.60 - 0.25)
+
+    def test_pool_capacity_grows(self):
+        """Registering more pools than the initial capacity keeps earlier prices."""
+        matrix = SpreadMatrix(["SOL-USD"], FEES, pool_capacity=2)
+        for i in range(5):
+            matrix.update_dex("SOL-USD", f"pool{i}", 150.0 + i, 151.0 + i, fee_bps=30)
+        matrix.update_cex("SOL-USD", "gemini", 144.0, 145.0)
+
+        spreads = matrix.compute()
+        assert spreads.cex_to_dex.shape == (1, 2, 5)
+        assert matrix.best()[0].pool == "pool4"
+
+    def test_removed_venue_is_nan(self):
+        matrix = SpreadMatrix(["SOL-USD"], FEES)
+        matrix.update_cex("SOL-USD", "gemini", 144.0, 145.0)
+        matrix.update_dex("SOL-USD", "orca", 150.0, 151.0, fee_bps=30)
+        matrix.remove_cex("SOL-USD", "gemini")
+        assert matrix.best() == []
+
+
+class TestSignalEngineMatrix:
+    """Test suite for feeding the matrix from market data."""
+
+    @pytest.mark.asyncio
+    async def test_engine_keeps_matrix_current(self):
+        bus = EventBus()
+        engine = SignalEngine(bus=bus, fixed_point=False, spread_matrix=True)
+        book = OrderBook("coinbase", "SOL-USD")
+        book.load([(Decimal("140"), Decimal("100"))], [(Decimal("145"), Decimal("100"))])
+        await bus.publish("cex.bookUpdate", book.view(10))
+        await bus.publish("dex.poolUpdate", PoolUpdate(
+            program="whirlpool", pool=SOL_POOL, timestamp=datetime.now(timezone.utc),
+            reserves={}, price_mid=Decimal("150"), fee_bps=30
+        ))
+
+        [best] = engine.spread_matrix.best(engine.spreads)
+        assert (best.venue, best.pool, best.direction) == ("coinbase", SOL_POOL, "cex_to_dex")
+        assert best.spread_pct == pytest.approx((150 - 145) / 145 * 100)
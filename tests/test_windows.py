@@ -0,0 +1,160 @@
+"""Unit tests for timer-driven trading windows."""
+import asyncio
+import pytest
+import sys
+import os
+from decimal import Decimal
+from datetime import datetime, timezone
+
+# Add backend directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../backend'))
+
+from shared.clock import VirtualClock
+from shared.types import Opportunity, OpportunityState, OrderStatus, Trade
+from engines.signal_engine import WindowManager
+
+START = datetime(2025, 1, 14, 12, 0, tzinfo=timezone.utc)
+
+
+class FakeWindowRepo:
+    """In-memory stand-in for WindowRepository.upsert_many."""
+
+    def __init__(self):
+        self.docs = {}
+        self.batches = 0
+
+    async def upsert_many(self, windows):
+        self.batches += 1
+        for window in windows:
+            self.docs[window.id] = window.model_copy()
+
+
+def make_manager():
+    counter = iter(range(1000))
+    return WindowManager(VirtualClock(START), id_factory=lambda: f"w{next(counter)}")
+
+
+def opened(window, direction: str, pnl: str, state=OpportunityState.OPEN) -> Opportunity:
+    return Opportunity(
+        id="o", asset=window.asset, direction=direction, cex_price=Decimal("145"),
+        dex_price=Decimal("150"), spread_pct=Decimal("3"), predicted_pnl_pct=Decimal(pnl),
+        size=Decimal("50"), timestamp=START, window_id=window.id, state=state
+    )
+
+
+def completed(window) -> Trade:
+    return Trade(
+        trade_id="t", opportunity_id="o", asset=window.asset, direction="cex_to_dex",
+        size_asset=Decimal("50"), cex_price=Decimal("145"), dex_price=Decimal("150"),
+        fees_total=Decimal("0"), pnl_abs=Decimal("1"), pnl_pct=Decimal("1"), latency_ms=1,
+        timestamp=START, window_id=window.id, status=OrderStatus.FILLED
+    )
+
+
+class TestWindowStats:
+    """Test suite for running window statistics."""
+
+    @pytest.mark.asyncio
+    async def test_running_stats(self):
+        """Signals, trades, max, mean and dominant direction update incrementally."""
+        manager = make_manager()
+        window = manager.get_or_create_window("SOL-USD")
+
+        manager.record_opportunity(opened(window, "cex_to_dex", "-0.5"))
+        assert window.max_net_pnl_pct == Decimal("-0.5")
+        manager.record_opportunity(opened(window, "dex_to_cex", "1.0"))
+        manager.record_opportunity(opened(window, "dex_to_cex", "2.0"))
+        manager.record_opportunity(opened(window, "dex_to_cex", "3.5", OpportunityState.UPDATED))
+        await manager.handle_trade(completed(window))
+
+        assert window.signals == 3
+        assert window.trades == 1
+        assert window.mean_net_pnl_pct == Decimal("2.5") / 3
+        assert window.max_net_pnl_pct == Decimal("3.5")
+        assert window.dominant_dir == "dex_to_cex"
+
+
+class TestWindowScheduling:
+    """Test suite for timed closing, batched persistence and eviction."""
+
+    @pytest.mark.asyncio
+    async def test_closes_on_time_without_signals(self):
+        manager = make_manager()
+        window = manager.get_or_create_window("SOL-USD")
+        manager.clock.advance(manager.window_grace_sec * 2 + 1)
+
+        assert manager.close_expired() == 1
+        assert window.end_ts is not None
+        assert "SOL-USD" not in manager.current_window
+
+    @pytest.mark.asyncio
+    async def test_flush_batches_and_evicts_closed(self):
+        """One batch per flush; closed windows leave memory once persisted."""
+        manager = make_manager()
+        repo = FakeWindowRepo()
+        sol = manager.get_or_create_window("SOL-USD")
+        manager.get_or_create_window("BTC-USD")
+        await manager.flush(repo)
+        assert repo.batches == 1 and len(repo.docs) == 2
+
+        # Nothing changed: no write
+        await manager.flush(repo)
+        assert repo.batches == 1
+
+        manager.clock.advance(manager.window_grace_sec * 2 + 1)
+        manager.close_expired()
+        await manager.flush(repo)
+
+        assert repo.batches == 2
+        assert repo.docs[sol.id].end_ts is not None
+        assert manager.windows == {}
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_is_retried(self):
+        """A batch the repository rejects is written on the next flush."""
+        manager = make_manager()
+        repo = FakeWindowRepo()
+        window = manager.get_or_create_window("SOL-USD")
+        manager.clock.advance(manager.window_grace_sec * 2 + 1)
+        manager.close_expired()
+
+        async def fail(windows):
+            raise ConnectionError("mongo down")
+
+        repo.upsert_many, upsert_many = fail, repo.upsert_many
+        with pytest.raises(ConnectionError):
+            await manager.flush(repo)
+        assert manager.windows == {window.id: window}
+
+        repo.upsert_many = upsert_many
+        await manager.flush(repo)
+        assert repo.docs[window.id].end_ts is not None
+        assert manager.windows == {}
+
+    @pytest.mark.asyncio
+    async def test_unpersisted_closed_windows_are_bounded(self):
+        manager = make_manager()
+        manager.max_closed = 3
+        for _ in range(10):
+            manager.get_or_create_window("SOL-USD")
+            manager.clock.advance(manager.window_grace_sec * 2 + 1)
+            manager.close_expired()
+        await manager.flush()
+
+        assert list(manager.windows) == ["w7", "w8", "w9"]
+
+    @pytest.mark.asyncio
+    async def test_run_loop(self):
+        """The background task closes and persists windows on its own."""
+        manager = make_manager()
+        repo = FakeWindowRepo()
+        window = manager.get_or_create_window("SOL-USD")
+        manager.flush_interval_sec = manager.window_grace_sec * 2 + 1
+
+        task = asyncio.create_task(manager.run(repo))
+        for _ in range(5):
+            await asyncio.sleep(0)
+        task.cancel()
+
+        assert repo.docs[window.id].end_ts is not None
+        assert window.id not in manager.windows
@@ -0,0 +1,46 @@
+"""Unit tests for WebSocket JSON decoder selection."""
+import json
+import pytest
+import sys
+import os
+
+# Add backend directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../backend'))
+
+from shared.wsjson import DECODERS, get_decoder, decoder_name, prefix_filter
+
+
+class TestDecoders:
+    """Test suite for pluggable JSON decoders."""
+
+    FRAME = '{"channel":"l2_data","sequence_num":3,"events":[{"updates":[{"price_level":"145.2300"}]}]}'
+
+    @pytest.mark.parametrize("name", list(DECODERS))
+    def test_decoders_agree(self, name):
+        """Every available decoder produces the stdlib result, prices stay strings."""
+        decoded = get_decoder(name)(self.FRAME)
+        assert decoded == json.loads(self.FRAME)
+        assert decoded["events"][0]["updates"][0]["price_level"] == "145.2300"
+
+    @pytest.mark.parametrize("name", list(DECODERS))
+    def test_decode_errors_are_json_errors(self, name):
+        """Malformed frames raise json.JSONDecodeError for every decoder."""
+        with pytest.raises(json.JSONDecodeError):
+            get_decoder(name)('{"channel":')
+
+    def test_auto_prefers_orjson(self):
+        """Auto selects orjson when installed, else stdlib."""
+        expected = "orjson" if "orjson" in DECODERS else "stdlib"
+        assert decoder_name(get_decoder("auto")) == expected
+
+    def test_unknown_decoder(self):
+        """Unknown decoder names are rejected."""
+        with pytest.raises(ValueError):
+            get_decoder("simdjson")
+
+    def test_prefix_filter_text_and_bytes(self):
+        """Prefix filters match text and binary frames."""
+        ignored = prefix_filter(('{"type":"trade"', '{"type":"heartbeat"'))
+        assert ignored('{"type":"trade","symbol":"SOLUSD"}')
+        assert ignored(b'{"type":"heartbeat","timestamp":1}')
+        assert not ignored('{"type":"l2_updates","symbol":"SOLUSD"}')